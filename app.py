@@ -3,9 +3,12 @@ import os
 import json
 import re
 import requests
-import base64
 from typing import Optional, Dict, Any
 import uuid
+import time
+
+from root_agent.services.memory_profile import begin_stage, deep_sizeof, end_stage, profile_stage
+from root_agent.services.video_source import VideoSource
 
 
 def strip_urls(text: str) -> str:
@@ -27,6 +30,13 @@ except ImportError:
 # --- Constants ---
 # ADK Web Server uses SSE streaming at /run_sse
 ADK_BASE_URL = "http://localhost:8000"
+# Job queue mode (requires `uv run uvicorn server:app`): enqueue and poll instead of holding an SSE connection
+USE_JOB_QUEUE = os.getenv("USE_JOB_QUEUE", "false").lower() in ("1", "true", "yes")
+# Compact stream mode (requires `uv run uvicorn server:app`): /stream sends only author + text per event
+USE_COMPACT_STREAM = os.getenv("USE_COMPACT_STREAM", "false").lower() in ("1", "true", "yes")
+COMPACT_STREAM_GZIP = os.getenv("COMPACT_STREAM_GZIP", "true").lower() in ("1", "true", "yes")
+JOB_POLL_INTERVAL = 2
+JOB_POLL_TIMEOUT = 900
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -65,6 +75,9 @@ st.markdown("""
 
 # --- Sidebar: Configuration & Tools ---
 with st.sidebar:
+    # Replay mode loads a finished run from its event log (served by `server.py` at /runs)
+    view_mode = st.radio("Mode", ["Live", "Replay"], horizontal=True, help="Replay: scrub through a finished run without re-executing it.")
+    
     # st.markdown("## ⚙️ Configuration")
     
     # # API Configuration
@@ -92,7 +105,7 @@ st.markdown("### Transform your video into viral content with Multi-Agent AI.")
 
 # File Uploader (Visual only for now, unless we send path/content)
 # File Uploader
-uploaded_file = st.file_uploader("Upload Video Content", type=['mp4', 'mov'])
+uploaded_file = st.file_uploader("Upload Video Content", type=['mp4', 'mov']) if view_mode == "Live" else None
 
 if uploaded_file:
     # Story: File Details
@@ -113,9 +126,11 @@ if uploaded_file:
 def process_sse_stream(response):
     """
     Parses the SSE stream from /run_sse endpoint.
-    Collects all text parts from all events and returns the combined output.
+    Collects all text parts from all events and applies their state deltas.
+    Returns (text entries, session state).
     """
     all_texts = []
+    state = {}
     last_author = ""
     
     for line in response.iter_lines(decode_unicode=True):
@@ -135,6 +150,10 @@ def process_sse_stream(response):
         author = event.get("author", "")
         if author:
             last_author = author
+        
+        # State deltas (ADK serializes by alias: actions.stateDelta)
+        actions = event.get("actions") or {}
+        state.update(actions.get("stateDelta") or actions.get("state_delta") or {})
             
         # Extract text from content.parts
         content = event.get("content", {})
@@ -146,7 +165,32 @@ def process_sse_stream(response):
             if text:
                 all_texts.append({"author": last_author, "text": text})
     
-    return all_texts
+    return all_texts, state
+
+
+def process_compact_stream(response):
+    """
+    Parses the compact stream from the /stream endpoint (gzip is decoded by requests).
+    Each event line is {"author", "text": [...]}, the last one {"state": {...}};
+    returns (text entries, session state) like process_sse_stream.
+    """
+    all_texts = []
+    state = {}
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data: "):
+            continue
+        data_str = line[6:]
+        if data_str == "[DONE]":
+            break
+        event = json.loads(data_str)
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        if "state" in event:
+            state = event["state"]
+            continue
+        for text in event.get("text", []):
+            all_texts.append({"author": event["author"], "text": text})
+    return all_texts, state
 
 
 def build_structured_result(text_entries):
@@ -184,9 +228,100 @@ def build_structured_result(text_entries):
     
     return result
 
+def store_agent_result(text_entries, status, state=None):
+    """
+    Groups the text entries by agent, stores them (and the run's final session state, which holds
+    the final drafts) in the Streamlit session state and updates the status box.
+    """
+    if text_entries:
+        status.write(f"✅ Received {len(text_entries)} responses from agents!")
+        result = build_structured_result(text_entries)
+        
+        # Also store raw entries for debug
+        st.session_state.agent_result = result
+        st.session_state.agent_state = state or {}
+        st.session_state.agent_raw = text_entries
+        # Keep the run in the URL so a page refresh restores it from the event log
+        if st.session_state.get("session_id"):
+            st.query_params["run"] = st.session_state.session_id
+        
+        status.update(label="Analysis Complete!", state="complete", expanded=False)
+        st.toast("Analysis Complete!", icon="✅")
+    else:
+        status.update(label="No Response", state="error", expanded=True)
+        st.error("The agent pipeline returned no text output.")
+
+
+def wait_for_job(job_id, status):
+    """
+    Polls the job queue until the job is finished.
+    Returns the job result ({session_id, events, state}), or None if the job failed or timed out.
+    """
+    last_state = None
+    deadline = time.time() + JOB_POLL_TIMEOUT
+    while time.time() < deadline:
+        job = requests.get(f"{ADK_BASE_URL}/jobs/{job_id}", timeout=10).json()
+        state = job.get("status")
+        
+        if state == "succeeded":
+            st.session_state.job_id = None
+            result = requests.get(f"{ADK_BASE_URL}/jobs/{job_id}/result", timeout=30).json()
+            st.session_state.session_id = result.get("session_id")
+            return result
+        if state == "failed":
+            st.session_state.job_id = None
+            status.update(label="Job Failed", state="error", expanded=True)
+            st.error(f"The agent pipeline failed after {job.get('attempts')} attempt(s): {job.get('error')}")
+            return None
+        
+        if state == "queued" and (last_state != "queued" or job.get("queue_position")):
+            status.update(label=f"🕒 Queued (position {job.get('queue_position', 0) + 1})...")
+        elif state == "running" and last_state != "running":
+            status.update(label="⏳ Agent pipeline is running (this may take 1-2 minutes)...")
+            if job.get("attempts", 1) > 1:
+                status.write(f"🔁 Retry attempt {job['attempts']} after: {job.get('error')}")
+        last_state = state
+        time.sleep(JOB_POLL_INTERVAL)
+    
+    status.update(label="Still Running", state="running", expanded=True)
+    st.info("The job is still running. Reload the page to keep polling.")
+    return None
+
+
+def fetch_run_log(session_id):
+    """Loads the event log records of a run from the server."""
+    response = requests.get(f"{ADK_BASE_URL}/runs/{session_id}", timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def replay_state(records):
+    """Session state after the given event log records (all state deltas applied in order)."""
+    state = {}
+    for record in records:
+        state.update(record.get("state_delta") or {})
+    return state
+
+
+def replay_text_entries(records):
+    """Rebuilds the SSE-style text entries ({author, text}) from event log records."""
+    return [
+        {"author": record.get("author", ""), "text": text}
+        for record in records if record.get("type") == "event"
+        for text in record.get("text_parts", [])
+    ]
+
+
 # State Management
 if "agent_result" not in st.session_state:
     st.session_state.agent_result = None
+if "agent_state" not in st.session_state:
+    st.session_state.agent_state = {}
+if "job_id" not in st.session_state:
+    st.session_state.job_id = None
+
+# Opt-in memory profiling (MEMORY_PROFILE=true): upload / stream / render phases of one analysis
+frontend_stage = None
 
 if uploaded_file:
     # Button to trigger agents
@@ -203,24 +338,28 @@ if uploaded_file:
                 settings_app_name = "root_agent" 
                 settings_user_id = "user"
                 
-                # --- Create Session ---
-                create_session_url = f"{ADK_BASE_URL}/apps/{settings_app_name}/users/{settings_user_id}/sessions"
-                
-                # Use a new session for each analysis
-                session_id = str(uuid.uuid4())
-                st.session_state.session_id = session_id
-                
-                status.write(f"🔧 Creating session...")
-                creation_payload = {"session_id": session_id}
-                creation_response = requests.post(create_session_url, json=creation_payload, timeout=10)
-                
-                if creation_response.status_code not in [200, 201]:
-                     status.warning(f"Session creation warning: {creation_response.status_code} - {creation_response.text}")
-                else:
-                     status.write("✅ Session registered.")
+                # --- Create Session (job queue workers and /stream create their own) ---
+                if USE_COMPACT_STREAM and not USE_JOB_QUEUE:
+                    session_id = str(uuid.uuid4())
+                    st.session_state.session_id = session_id
+                elif not USE_JOB_QUEUE:
+                    create_session_url = f"{ADK_BASE_URL}/apps/{settings_app_name}/users/{settings_user_id}/sessions"
+                    
+                    # Use a new session for each analysis
+                    session_id = str(uuid.uuid4())
+                    st.session_state.session_id = session_id
+                    
+                    status.write(f"🔧 Creating session...")
+                    creation_payload = {"session_id": session_id}
+                    creation_response = requests.post(create_session_url, json=creation_payload, timeout=10)
+                    
+                    if creation_response.status_code not in [200, 201]:
+                         status.warning(f"Session creation warning: {creation_response.status_code} - {creation_response.text}")
+                    else:
+                         status.write("✅ Session registered.")
 
                 # --- Build message parts ---
-                status.write(f"📡 Sending to {settings_app_name} via SSE streaming...")
+                status.write(f"📡 Sending to {settings_app_name} via {'job queue' if USE_JOB_QUEUE else 'compact stream' if USE_COMPACT_STREAM else 'SSE streaming'}...")
                 
                 user_text = (
                     f"Analyze the video content of the uploaded file: {uploaded_file.name}. "
@@ -229,54 +368,79 @@ if uploaded_file:
                 )
                 
                 message_parts = [{"text": user_text}]
+                frontend_stage = begin_stage(st.session_state.session_id, "frontend")
+                upload_stage = begin_stage(st.session_state.session_id, "upload")
                 
                 # Upload actual video bytes as inline_data
                 uploaded_file.seek(0)
                 video_bytes = uploaded_file.read()
-                video_b64 = base64.b64encode(video_bytes).decode("utf-8")
-                message_parts.append({
-                    "inline_data": {
-                        "mime_type": uploaded_file.type or "video/mp4",
-                        "data": video_b64
-                    }
-                })
+                # Encoded in place, chunk by chunk: handing the bytes to a worker process would pickle
+                # them, which costs about as much as the encoding itself
+                message_parts.append(
+                    VideoSource.from_bytes(video_bytes, mime_type=uploaded_file.type or "video/mp4").inline_data()
+                )
+                end_stage(upload_stage)
+                stream_stage = begin_stage(st.session_state.session_id, "stream")
 
-                # --- Use /run_sse endpoint (SSE streaming) ---
-                adk_run_url = f"{ADK_BASE_URL}/run_sse"
+                # --- Job queue mode: enqueue and poll ---
+                if USE_JOB_QUEUE:
+                    job_response = requests.post(
+                        f"{ADK_BASE_URL}/jobs",
+                        json={"user_id": settings_user_id, "parts": message_parts},
+                        timeout=30,
+                    )
+                    if job_response.status_code != 200:
+                        status.update(label="API Error", state="error", expanded=True)
+                        st.error(f"API Error: {job_response.status_code} - {job_response.text}")
+                    else:
+                        st.session_state.job_id = job_response.json()["job_id"]
+                        status.write(f"📥 Job queued: `{st.session_state.job_id}`")
+                        job_result = wait_for_job(st.session_state.job_id, status)
+                        if job_result is not None:
+                            store_agent_result(job_result.get("events", []), status, job_result.get("state"))
                 
-                payload = {
-                    "app_name": settings_app_name, 
-                    "user_id": settings_user_id,
-                    "session_id": session_id,
-                    "new_message": {
-                        "role": "user",
-                        "parts": message_parts
+                # --- Compact stream mode: only author + text per event ---
+                elif USE_COMPACT_STREAM:
+                    status.write("⏳ Agent pipeline is running (this may take 1-2 minutes)...")
+                    response = requests.post(
+                        f"{ADK_BASE_URL}/stream",
+                        json={"user_id": settings_user_id, "session_id": session_id, "parts": message_parts},
+                        headers={"Accept-Encoding": "gzip" if COMPACT_STREAM_GZIP else "identity"},
+                        stream=True,
+                        timeout=300,
+                    )
+                    if response.status_code == 200:
+                        text_entries, state = process_compact_stream(response)
+                        store_agent_result(text_entries, status, state)
+                    else:
+                        status.update(label="API Error", state="error", expanded=True)
+                        st.error(f"API Error: {response.status_code} - {response.text}")
+
+                # --- Use /run_sse endpoint (SSE streaming) ---
+                else:
+                    adk_run_url = f"{ADK_BASE_URL}/run_sse"
+                    
+                    payload = {
+                        "app_name": settings_app_name, 
+                        "user_id": settings_user_id,
+                        "session_id": session_id,
+                        "new_message": {
+                            "role": "user",
+                            "parts": message_parts
+                        }
                     }
-                }
-                
-                status.write("⏳ Agent pipeline is running (this may take 1-2 minutes)...")
-                response = requests.post(adk_run_url, json=payload, stream=True, timeout=300)
-                
-                if response.status_code == 200:
-                    # Parse SSE stream
-                    text_entries = process_sse_stream(response)
                     
-                    if text_entries:
-                        status.write(f"✅ Received {len(text_entries)} responses from agents!")
-                        result = build_structured_result(text_entries)
-                        
-                        # Also store raw entries for debug
-                        st.session_state.agent_result = result
-                        st.session_state.agent_raw = text_entries
-                        
-                        status.update(label="Analysis Complete!", state="complete", expanded=False)
-                        st.toast("Analysis Complete!", icon="✅")
+                    status.write("⏳ Agent pipeline is running (this may take 1-2 minutes)...")
+                    response = requests.post(adk_run_url, json=payload, stream=True, timeout=300)
+                    
+                    if response.status_code == 200:
+                        # Parse SSE stream
+                        text_entries, state = process_sse_stream(response)
+                        store_agent_result(text_entries, status, state)
                     else:
-                        status.update(label="No Response", state="error", expanded=True)
-                        st.error("The agent pipeline returned no text output.")
-                else:
-                    status.update(label="API Error", state="error", expanded=True)
-                    st.error(f"API Error: {response.status_code} - {response.text}")
+                        status.update(label="API Error", state="error", expanded=True)
+                        st.error(f"API Error: {response.status_code} - {response.text}")
+                end_stage(stream_stage)
                 
             except requests.exceptions.ConnectionError:
                 status.update(label="Connection Failed", state="error", expanded=True)
@@ -285,12 +449,134 @@ if uploaded_file:
                 status.update(label="Error", state="error", expanded=True)
                 st.error(f"An error occurred: {str(e)}")
 
+# Resume polling a queued job after a page refresh
+if USE_JOB_QUEUE and st.session_state.job_id and not st.session_state.agent_result:
+    with st.status("⏳ Resuming queued analysis...", expanded=True) as status:
+        try:
+            job_result = wait_for_job(st.session_state.job_id, status)
+            if job_result is not None:
+                store_agent_result(job_result.get("events", []), status, job_result.get("state"))
+        except requests.exceptions.ConnectionError:
+            status.update(label="Connection Failed", state="error", expanded=True)
+            st.error(f"Could not connect to ADK Server at `{ADK_BASE_URL}`.")
+
+# Restore the last run of this URL after a page refresh
+if view_mode == "Live" and not st.session_state.agent_result and not st.session_state.job_id and st.query_params.get("run"):
+    try:
+        records = fetch_run_log(st.query_params["run"])
+        text_entries = replay_text_entries(records)
+        if text_entries:
+            st.session_state.session_id = st.query_params["run"]
+            st.session_state.agent_result = build_structured_result(text_entries)
+            st.session_state.agent_state = replay_state(records)
+            st.session_state.agent_raw = text_entries
+    except requests.exceptions.RequestException:
+        pass
+
 # --- UI Display Logic ---
-def display_agent_result(result: Any):
+def parse_evaluation(evaluator_text: str):
+    """Returns (is_approved, rating) parsed from the Evaluator's markdown output."""
+    is_approved = "APPROVED" in evaluator_text.upper()
+    rating_match = re.search(r"Rating:\s*(\d+)/10", evaluator_text)
+    eval_rating = rating_match.group(1) if rating_match else "?"
+    return is_approved, eval_rating
+
+
+def render_creator_output(creator_text: str):
+    """Renders the Creator's markdown output (caption, hashtags, trends, justification)."""
+    if not creator_text:
+        st.warning("Kein Creator Agent Output vorhanden.")
+        return
+
+    st.subheader("� Creator Agent – Empfehlung")
+    
+    # Parse caption from Creator's markdown output
+    caption = ""
+    hashtags_section = ""
+    strategy_section = ""
+    trend_section = ""
+    
+    sections = creator_text.split("##")
+    for section in sections:
+        section_lower = section.strip().lower()
+        if section_lower.startswith("caption"):
+            caption = section.split("\n", 1)[-1].strip() if "\n" in section else ""
+        elif section_lower.startswith("strategic hashtag"):
+            hashtags_section = section.split("\n", 1)[-1].strip() if "\n" in section else ""
+        elif section_lower.startswith("strategic justification"):
+            strategy_section = section.split("\n", 1)[-1].strip() if "\n" in section else ""
+        elif section_lower.startswith("trend"):
+            trend_section = section.split("\n", 1)[-1].strip() if "\n" in section else ""
+    
+    # Display Caption prominently
+    if caption:
+        st.markdown("### 💬 Caption")
+        st.info(strip_urls(caption))
+    
+    col1, col2 = st.columns(2)
+    
+    # Display Hashtags
+    with col1:
+        if hashtags_section:
+            st.markdown("### 🏷️ Hashtags & Strategie")
+            st.markdown(strip_urls(hashtags_section))
+    
+    # Display Trend Research
+    with col2:
+        if trend_section:
+            st.markdown("### 📈 Trend Research")
+            st.markdown(strip_urls(trend_section))
+    
+    # Display Strategic Justification
+    if strategy_section:
+        st.markdown("### 🧠 Strategische Begründung")
+        st.markdown(strip_urls(strategy_section))
+    
+    # Fallback: show full text if parsing didn't find sections
+    if not caption and not hashtags_section:
+        st.markdown(strip_urls(creator_text))
+
+
+def render_evaluation(evaluator_text: str):
+    """Renders the Evaluator's markdown output with its approval status."""
+    if not evaluator_text:
+        st.warning("Kein Evaluator Output vorhanden.")
+        return
+
+    is_approved, eval_rating = parse_evaluation(evaluator_text)
+    st.subheader("📋 Evaluator Agent – Bewertung")
+    
+    if is_approved:
+        st.success(f"**STATUS: APPROVED** — Rating: {eval_rating}/10")
+    else:
+        st.error(f"**STATUS: NEEDS REVISION** — Rating: {eval_rating}/10")
+    
+    st.markdown(strip_urls(evaluator_text))
+
+
+def platform_drafts(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Final draft + evaluation per platform of a multi-platform run ({} for a single-platform run).
+    Taken from the session state: `platform_results`, or while the fan-out is still running the
+    `<platform>_creative_output` / `<platform>_evaluation_result` keys.
+    """
+    if state.get("platform_results"):
+        return dict(sorted(state["platform_results"].items()))
+    keys = sorted(key[:-len("_creative_output")] for key in state if key.endswith("_creative_output"))
+    return {
+        key: {"creative_output": state.get(f"{key}_creative_output"), "evaluation_result": state.get(f"{key}_evaluation_result")}
+        for key in keys
+    }
+
+
+def display_agent_result(result: Any, state: Optional[Dict[str, Any]] = None):
     """
     Renders the multi-agent pipeline result.
     result is a dict: { agent_name: { full_text, structured }, ... }
+    state is the run's session state; the final drafts come from there (with speculative drafts the
+    final draft may be one the Creator never posted as its own event).
     """
+    state = state or {}
     st.markdown("---")
 
     # --- Handle the grouped-by-agent dict ---
@@ -302,102 +588,55 @@ def display_agent_result(result: Any):
         creator_data = result.get("creator_agent", {})
         evaluator_data = result.get("evaluator_agent", {})
         
-        creator_text = creator_data.get("full_text", "")
-        evaluator_text = evaluator_data.get("full_text", "")
+        creator_text = state.get("creative_output") or creator_data.get("full_text", "")
+        evaluator_text = state.get("evaluation_result") or evaluator_data.get("full_text", "")
         video_json = video_data.get("structured")
         insight_json = insight_data.get("structured")
         
         # --- Check if Evaluator approved ---
-        is_approved = False
-        eval_rating = "?"
-        if "APPROVED" in evaluator_text.upper():
-            is_approved = True
-        # Try to extract rating
-        import re
-        rating_match = re.search(r"Rating:\s*(\d+)/10", evaluator_text)
-        if rating_match:
-            eval_rating = rating_match.group(1)
+        is_approved, eval_rating = parse_evaluation(evaluator_text)
+        
+        # --- Multi-platform mode: one Creator/Evaluator pair per platform ---
+        drafts = platform_drafts(state)
+        platform_keys = list(drafts)
         
         # ========== HEADER: Approval Status ==========
-        if is_approved:
+        if platform_keys:
+            for key in platform_keys:
+                approved, rating = parse_evaluation(drafts[key].get("evaluation_result") or "")
+                if approved:
+                    st.success(f"✅ {key}: Content APPROVED by Evaluator Agent — Rating: {rating}/10")
+                else:
+                    st.warning(f"⚠️ {key}: Content NEEDS REVISION — Rating: {rating}/10")
+        elif is_approved:
             st.success(f"✅ Content APPROVED by Evaluator Agent — Rating: {eval_rating}/10")
         else:
             st.warning(f"⚠️ Content NEEDS REVISION — Rating: {eval_rating}/10")
         
         # ========== TABS ==========
-        tab_post, tab_eval, tab_analysis, tab_raw = st.tabs([
-            "🎨 Empfehlung (Creator)", 
-            "📋 Evaluation", 
-            "🔬 Video-Analyse",
-            "🔍 Debug"
-        ])
-        
-        # --- TAB 1: Creator Output (Empfehlungsschreiben) ---
-        with tab_post:
-            if creator_text:
-                st.subheader("� Creator Agent – Empfehlung")
-                
-                # Parse caption from Creator's markdown output
-                caption = ""
-                hashtags_section = ""
-                strategy_section = ""
-                trend_section = ""
-                
-                sections = creator_text.split("##")
-                for section in sections:
-                    section_lower = section.strip().lower()
-                    if section_lower.startswith("caption"):
-                        caption = section.split("\n", 1)[-1].strip() if "\n" in section else ""
-                    elif section_lower.startswith("strategic hashtag"):
-                        hashtags_section = section.split("\n", 1)[-1].strip() if "\n" in section else ""
-                    elif section_lower.startswith("strategic justification"):
-                        strategy_section = section.split("\n", 1)[-1].strip() if "\n" in section else ""
-                    elif section_lower.startswith("trend"):
-                        trend_section = section.split("\n", 1)[-1].strip() if "\n" in section else ""
-                
-                # Display Caption prominently
-                if caption:
-                    st.markdown("### 💬 Caption")
-                    st.info(strip_urls(caption))
-                
-                col1, col2 = st.columns(2)
-                
-                # Display Hashtags
-                with col1:
-                    if hashtags_section:
-                        st.markdown("### 🏷️ Hashtags & Strategie")
-                        st.markdown(strip_urls(hashtags_section))
-                
-                # Display Trend Research
-                with col2:
-                    if trend_section:
-                        st.markdown("### 📈 Trend Research")
-                        st.markdown(strip_urls(trend_section))
-                
-                # Display Strategic Justification
-                if strategy_section:
-                    st.markdown("### 🧠 Strategische Begründung")
-                    st.markdown(strip_urls(strategy_section))
-                
-                # Fallback: show full text if parsing didn't find sections
-                if not caption and not hashtags_section:
-                    st.markdown(strip_urls(creator_text))
-            else:
-                st.warning("Kein Creator Agent Output vorhanden.")
-        
-        # --- TAB 2: Evaluator Output ---
-        with tab_eval:
-            if evaluator_text:
-                st.subheader("📋 Evaluator Agent – Bewertung")
-                
-                if is_approved:
-                    st.success(f"**STATUS: APPROVED** — Rating: {eval_rating}/10")
-                else:
-                    st.error(f"**STATUS: NEEDS REVISION** — Rating: {eval_rating}/10")
-                
-                st.markdown(strip_urls(evaluator_text))
-            else:
-                st.warning("Kein Evaluator Output vorhanden.")
+        if platform_keys:
+            tabs = st.tabs([f"🎨 {key}" for key in platform_keys] + ["🔬 Video-Analyse", "🔍 Debug"])
+            for key, tab in zip(platform_keys, tabs):
+                with tab:
+                    render_creator_output(drafts[key].get("creative_output") or "")
+                    with st.expander("📋 Evaluation"):
+                        render_evaluation(drafts[key].get("evaluation_result") or "")
+            tab_analysis, tab_raw = tabs[-2], tabs[-1]
+        else:
+            tab_post, tab_eval, tab_analysis, tab_raw = st.tabs([
+                "🎨 Empfehlung (Creator)", 
+                "📋 Evaluation", 
+                "🔬 Video-Analyse",
+                "🔍 Debug"
+            ])
+            
+            # --- TAB 1: Creator Output (Empfehlungsschreiben) ---
+            with tab_post:
+                render_creator_output(creator_text)
+            
+            # --- TAB 2: Evaluator Output ---
+            with tab_eval:
+                render_evaluation(evaluator_text)
         
         # --- TAB 3: Video Analysis + Insights ---
         with tab_analysis:
@@ -453,9 +692,78 @@ def display_agent_result(result: Any):
     else:
         st.json(result)
 
+def display_run_replay():
+    """Replay mode: pick a logged run and scrub through its events without re-executing it."""
+    st.subheader("🎞️ Run Replay")
+    try:
+        runs = requests.get(f"{ADK_BASE_URL}/runs", timeout=10).json()
+    except requests.exceptions.RequestException:
+        st.error(f"Could not load run logs from `{ADK_BASE_URL}/runs`. \n\nMake sure you are running: `uv run uvicorn server:app --port 8000`")
+        return
+    if not runs:
+        st.info("No logged runs yet.")
+        return
+    
+    labels = {run["session_id"]: f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['modified_at']))} – {run['session_id']}" for run in runs}
+    run_ids = list(labels)
+    default_run = st.query_params.get("run")
+    session_id = st.selectbox("Run", run_ids, index=run_ids.index(default_run) if default_run in run_ids else 0, format_func=labels.get)
+    records = fetch_run_log(session_id)
+    if not records:
+        st.warning("The run log is empty.")
+        return
+    
+    # --- Timing overview ---
+    started = records[0]["ts"]
+    run_end = next((r for r in records if r["type"] == "run_end"), None)
+    model_calls = [r for r in records if r["type"] == "model_response"]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Duration", f"{run_end['duration_ms'] / 1000:.1f}s" if run_end and run_end.get("duration_ms") else "running")
+    col2.metric("Model Calls", len(model_calls))
+    col3.metric("Output Tokens", sum(r.get("output_tokens") or 0 for r in model_calls))
+    with st.expander("⏱️ Agent & Model Timings"):
+        st.dataframe([
+            {"t+ (s)": round(r["ts"] - started, 2), "type": r["type"], "agent": r.get("agent"), "duration (ms)": r.get("duration_ms"),
+             "prompt tokens": r.get("prompt_tokens"), "cached tokens": r.get("cached_tokens"), "output tokens": r.get("output_tokens")}
+            for r in records if r["type"] in ("agent_end", "model_response", "model_error", "tool_result", "tool_error")
+        ], use_container_width=True)
+    
+    # --- Scrubbing ---
+    event_indexes = [i for i, r in enumerate(records) if r["type"] == "event"]
+    if not event_indexes:
+        st.info("The run has no events yet.")
+        return
+    step = st.slider("Event", 1, len(event_indexes), len(event_indexes)) if len(event_indexes) > 1 else 1
+    current = records[event_indexes[step - 1]]
+    visible = records[:event_indexes[step - 1] + 1]
+    
+    state = replay_state(visible)
+    
+    st.caption(f"t+{current['ts'] - started:.2f}s · {current.get('author')} · branch {current.get('branch') or '-'}")
+    col_event, col_state = st.columns(2)
+    with col_event:
+        st.markdown("**Event**")
+        st.json(current)
+    with col_state:
+        st.markdown("**Session State (at this event)**")
+        st.json(state, expanded=False)
+    
+    text_entries = replay_text_entries(visible)
+    if text_entries:
+        display_agent_result(build_structured_result(text_entries), state)
+
+
 # Display Results
-if st.session_state.agent_result:
-    display_agent_result(st.session_state.agent_result)
+if view_mode == "Replay":
+    display_run_replay()
+
+elif st.session_state.agent_result:
+    with profile_stage(st.session_state.get("session_id"), "render"):
+        display_agent_result(st.session_state.agent_result, st.session_state.agent_state)
     
 elif not uploaded_file:
     st.info("👆 Please upload a video file to begin.")
+
+# Retained after a full GC, with the size of every st.session_state entry (video payloads, raw transcripts, ...)
+if frontend_stage is not None:
+    end_stage(frontend_stage, collect=True, session_state_bytes={key: deep_sizeof(value) for key, value in st.session_state.items()})
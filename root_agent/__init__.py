@@ -1 +1,4 @@
-from . import agent
+from .lazy import install_lazy_exports
+
+# `adk web` / `adk api_server` look up `app` on the package; the pipeline is only built on first access.
+install_lazy_exports(__name__, {"agent": ".agent", "app": ".agent", "root_agent": ".agent"})
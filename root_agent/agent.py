@@ -6,21 +6,38 @@ A multi-agent pipeline for Social Media Analytics based on the InsightBench fram
 Pipeline:
   1. Video Analyst Agent      (gemini-2.0-flash)  – Schema extraction & Root Questions
   2. Insight Extractor Agent  (gemini-2.0-flash)  – Multi-step drill-down analysis
+                                                     (3 Root Question drill-downs in parallel + merge step)
   3. Creator Agent            (gemini-2.5-pro)    – Prescriptive creative synthesis
   4. Evaluator Agent          (gemini-2.0-flash)  – Quality assurance (LLaMA-3-Eval protocol)
 
 The Creator + Evaluator are wrapped in a LoopAgent to retry if the score < 7.
 The overall pipeline is orchestrated by a SequentialAgent.
+
+Multi-platform mode: set TARGET_PLATFORMS (e.g. "tiktok,reels,shorts") to run one
+Creator + Evaluator loop per platform in parallel on the shared video_analysis / insights.
+All variants are collected in the session state under `platform_results`.
+
+`app` wraps the pipeline with the runner plugins (event log); `adk web` / `adk api_server`
+and `services.runner.create_runner` pick it up instead of the bare `root_agent`.
 """
 
+import os
+
 from google.adk.agents import SequentialAgent
+from google.adk.apps import App
+from root_agent.platforms import parse_platforms
+from root_agent.services.event_log import default_plugins
 from root_agent.subagents import (
     video_analyst_agent,
-    insight_extractor_agent,
+    insight_extraction_stage,
     creation_evaluation_loop,
+    build_platform_fan_out,
 )
 
 
+TARGET_PLATFORMS = parse_platforms(os.getenv("TARGET_PLATFORMS", ""))
+
+
 # ============================================================================
 # Root Agent: SequentialAgent orchestrates the full pipeline
 # ============================================================================
@@ -29,7 +46,10 @@ root_agent = SequentialAgent(
     description="InsightBench Multi-Agent Pipeline: Video Analysis → Insight Extraction → Creative Synthesis (with evaluation loop).",
     sub_agents=[
         video_analyst_agent,
-        insight_extractor_agent,
-        creation_evaluation_loop,
+        insight_extraction_stage,
+        build_platform_fan_out(TARGET_PLATFORMS) if TARGET_PLATFORMS else creation_evaluation_loop,
     ],
 )
+
+
+app = App(name="root_agent", root_agent=root_agent, plugins=default_plugins())
@@ -0,0 +1,51 @@
+"""
+Callbacks package for the InsightBench Multi-Agent System.
+Exports are resolved lazily – a submodule is only imported when one of its names is used.
+"""
+
+from root_agent.lazy import install_lazy_exports
+
+
+__all__ = [
+    "measure_audio_features",
+    "creator_model_router",
+    "as_static_instruction",
+    "prompt_cache",
+    "use_prompt_cache",
+    "speculative_brief_writer",
+    "engagement_predictor",
+    "hashtag_outcome_recorder",
+    "hashtag_verification_lookup",
+    "hashtag_verification_recorder",
+    "vetted_hashtag_suggester",
+    "repair_structured_output",
+    "approved_example_recorder",
+    "similar_examples_retriever",
+    "store_drill_down_projection",
+    "store_insights_projection",
+    "store_video_analysis_projection",
+    "remember_video_analysis",
+    "reuse_prior_analysis",
+]
+
+install_lazy_exports(__name__, {
+    "measure_audio_features": ".audio_features",
+    "creator_model_router": ".model_router",
+    "as_static_instruction": ".context_cache",
+    "prompt_cache": ".context_cache",
+    "use_prompt_cache": ".context_cache",
+    "speculative_brief_writer": ".draft_precheck",
+    "engagement_predictor": ".engagement_prediction",
+    "hashtag_outcome_recorder": ".hashtag_knowledge",
+    "hashtag_verification_lookup": ".hashtag_knowledge",
+    "hashtag_verification_recorder": ".hashtag_knowledge",
+    "vetted_hashtag_suggester": ".hashtag_knowledge",
+    "repair_structured_output": ".schema_repair",
+    "approved_example_recorder": ".similar_examples",
+    "similar_examples_retriever": ".similar_examples",
+    "store_drill_down_projection": ".state_projection",
+    "store_insights_projection": ".state_projection",
+    "store_video_analysis_projection": ".state_projection",
+    "remember_video_analysis": ".video_dedup",
+    "reuse_prior_analysis": ".video_dedup",
+})
@@ -0,0 +1,47 @@
+"""
+Callback: Audio Features
+Measures the audio track of the uploaded video locally before the Video Analyst runs.
+
+- before_agent_callback: analyzes the audio in the offload pool and writes the raw features to
+  `audio_analysis` and the <audio_features> prompt block to `audio_features`.
+- store_video_analysis_projection attaches `audio_analysis` to `video_analysis` – also when the
+  Video Analyst is skipped because the analysis of a near-duplicate video is reused.
+"""
+
+from typing import Any, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from root_agent.callbacks.video_dedup import user_video
+from root_agent.services.audio_analysis import AUDIO_ANALYSIS_ENABLED, ENVELOPE_STEP, HOOK_SECONDS, analyze_audio, summarize_audio
+from root_agent.services.offload import get_offloader
+
+
+# Envelope points shown to the model (the full envelope stays in the state).
+PROMPT_ENVELOPE_SECONDS = 10
+
+
+def render_audio_features(features: Dict[str, Any]) -> str:
+    """The <audio_features> block for the Video Analyst."""
+    lines = [f"Measured locally from the audio track (hook = first {HOOK_SECONDS:g} s): {summarize_audio(features)}"]
+    if features.get("content_type") and features.get("content_type") != "silence":
+        lines.append(f"speech score {features.get('speech_score')}, music score {features.get('music_score')} (0–1, heuristic)")
+    envelope = features.get("loudness_envelope_db") or []
+    if envelope:
+        shown = envelope[:int(PROMPT_ENVELOPE_SECONDS / ENVELOPE_STEP)]
+        lines.append(f"loudness envelope in dBFS, every {ENVELOPE_STEP:g} s: {', '.join(f'{value:g}' for value in shown)}")
+    return "<audio_features>\n" + "\n".join(lines) + "\n</audio_features>"
+
+
+async def measure_audio_features(callback_context: CallbackContext) -> Optional[types.Content]:
+    """before_agent_callback for the Video Analyst."""
+    video = user_video(callback_context) if AUDIO_ANALYSIS_ENABLED else None
+    if video is None:
+        return None
+    # Decoding and spectral analysis are CPU bound – run them in the offload pool.
+    features = await get_offloader().run(analyze_audio, video)
+    if features is None:
+        return None
+    callback_context.state["audio_analysis"] = features.model_dump()
+    callback_context.state["audio_features"] = render_audio_features(callback_context.state["audio_analysis"])
+    return None
@@ -0,0 +1,247 @@
+"""
+Callback: Static Prompt Prefix Cache
+Serves the static instruction block (plus tool declarations) of every agent from a Gemini context cache.
+
+Each agent splits its prompt into a `static_instruction` (no placeholders, sent as system instruction)
+and a dynamic `instruction` suffix (state placeholders, sent as user content). The static part is
+identical for every call, so it is uploaded once per (agent, model) and referenced via `cached_content`.
+
+Lifecycle:
+  - size:       the prefix (system instruction + tool declarations) is counted once with count_tokens;
+                prefixes below CONTEXT_CACHE_MIN_TOKENS are sent uncached
+  - refresh:    the TTL is extended in the background once less than 20% of it is left
+  - invalidate: a changed prompt or tool set deletes the old cache and creates a new one
+  - failure:    a prefix the API refuses to cache is not retried for FAILURE_BACKOFF_SECONDS (logged)
+
+Which agents qualify at the default of 1024 tokens (prefix sizes at 4 characters per token):
+  - Evaluator        ~1490  cached
+  - Creator          ~990   decided by count_tokens (German text runs above 4 characters per token)
+  - Video Analyst    ~530   not cached
+  - Insight Extractor, Drill-Downs  ~260-280  not cached, skipped without a count_tokens call
+
+ADK's built-in `context_cache_config` is scoped to a single session and skips the first request
+of each agent, so one-shot agents (Video Analyst, Insight Extractor) would never hit it.
+This registry is process-wide and shared by all sessions.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import BaseModel
+
+
+CONTEXT_CACHE_ENABLED = os.getenv("CONTEXT_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("CONTEXT_CACHE_TTL_SECONDS", "1800"))
+CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("CONTEXT_CACHE_MIN_TOKENS", "1024"))
+
+# Refresh the TTL once less than this share of it is left.
+REFRESH_FRACTION = 0.2
+# A prefix the API refused to cache is not retried before this many seconds.
+FAILURE_BACKOFF_SECONDS = 3600
+# Prefixes whose estimate is below this share of min_tokens are skipped without counting them.
+ESTIMATE_SKIP_FRACTION = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def as_static_instruction(text: str) -> types.Content:
+    """Wraps a static prompt block for `Agent(static_instruction=...)`."""
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+class CachedPrefix(BaseModel):
+    """A Gemini context cache holding one agent's static prompt prefix."""
+    cache_name: str
+    model: str
+    prompt_hash: str
+    expire_time: float
+
+
+class PromptCacheRegistry:
+    """Process-wide registry of static prefix caches, keyed by (agent name, model)."""
+
+    def __init__(self, ttl_seconds: int = CONTEXT_CACHE_TTL_SECONDS, min_tokens: int = CONTEXT_CACHE_MIN_TOKENS):
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self._entries: Dict[Tuple[str, str], CachedPrefix] = {}
+        self._failures: Dict[Tuple[str, str], float] = {}
+        self._token_counts: Dict[Tuple[str, str], int] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client()
+        return self._client
+
+    @staticmethod
+    def prefix_hash(llm_request: LlmRequest) -> str:
+        """Hashes everything that ends up in the cache: system instruction, tools and tool config."""
+        config = llm_request.config
+        payload = {
+            "system_instruction": str(config.system_instruction),
+            "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in (config.tools or []) if isinstance(tool, types.Tool)],
+            "tool_config": config.tool_config.model_dump(mode="json", exclude_none=True) if config.tool_config else None,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def prefix_contents(llm_request: LlmRequest) -> List[types.Content]:
+        """The cacheable prefix as plain contents: system instruction text plus the tool declarations."""
+        config = llm_request.config
+        instruction = config.system_instruction
+        if isinstance(instruction, types.Content):
+            texts = [part.text for part in instruction.parts or [] if part.text]
+        elif isinstance(instruction, list):
+            texts = [item if isinstance(item, str) else item.text or "" for item in instruction]
+        else:
+            texts = [str(instruction or "")]
+        texts += [json.dumps(tool.model_dump(mode="json", exclude_none=True))
+                  for tool in config.tools or [] if isinstance(tool, types.Tool)]
+        return [types.Content(role="user", parts=[types.Part(text=text) for text in texts if text])]
+
+    @classmethod
+    def estimate_tokens(cls, llm_request: LlmRequest) -> int:
+        """Rough token estimate of the cacheable prefix (4 characters per token)."""
+        return sum(len(part.text) for part in cls.prefix_contents(llm_request)[0].parts) // 4
+
+    async def count_tokens(self, llm_request: LlmRequest, prompt_hash: str) -> int:
+        """Token count of the cacheable prefix, counted once per (model, prefix); falls back to the estimate."""
+        key = (llm_request.model, prompt_hash)
+        if key not in self._token_counts:
+            try:
+                response = await self.client.aio.models.count_tokens(
+                    model=llm_request.model, contents=self.prefix_contents(llm_request)
+                )
+                self._token_counts[key] = response.total_tokens
+            except Exception as e:
+                logger.warning("Counting the prompt prefix tokens failed, using the estimate: %s", e)
+                self._token_counts[key] = self.estimate_tokens(llm_request)
+        return self._token_counts[key]
+
+    async def acquire(self, agent_name: str, llm_request: LlmRequest) -> Optional[str]:
+        """
+        Returns the cache name for the request's static prefix, creating or refreshing it if needed.
+
+        Returns:
+            The cached content name, or None if the prefix is not cacheable.
+        """
+        key = (agent_name, llm_request.model)
+        prompt_hash = self.prefix_hash(llm_request)
+
+        if self._failures.get((llm_request.model, prompt_hash), 0) > time.time():
+            return None
+        if self.estimate_tokens(llm_request) < self.min_tokens * ESTIMATE_SKIP_FRACTION:
+            return None
+        if await self.count_tokens(llm_request, prompt_hash) < self.min_tokens:
+            return None
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+
+            if entry and entry.prompt_hash != prompt_hash:
+                # Prompt or tools changed – the old cache is stale.
+                self._entries.pop(key, None)
+                self._spawn(self._delete(entry.cache_name))
+                entry = None
+
+            if entry and entry.expire_time <= time.time():
+                self._entries.pop(key, None)
+                entry = None
+
+            if entry is None:
+                entry = await self._create(llm_request, prompt_hash)
+                if entry is None:
+                    self._failures[(llm_request.model, prompt_hash)] = time.time() + FAILURE_BACKOFF_SECONDS
+                    return None
+                self._entries[key] = entry
+            elif entry.expire_time - time.time() < self.ttl_seconds * REFRESH_FRACTION:
+                self._spawn(self._refresh(key, entry))
+
+            return entry.cache_name
+
+    async def invalidate(self, agent_name: Optional[str] = None) -> None:
+        """Deletes the caches of one agent (or of all agents)."""
+        for key in [k for k in self._entries if agent_name is None or k[0] == agent_name]:
+            entry = self._entries.pop(key)
+            await self._delete(entry.cache_name)
+
+    async def _create(self, llm_request: LlmRequest, prompt_hash: str) -> Optional[CachedPrefix]:
+        config = llm_request.config
+        try:
+            cached = await self.client.aio.caches.create(
+                model=llm_request.model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=config.system_instruction,
+                    tools=config.tools,
+                    tool_config=config.tool_config,
+                    ttl=f"{self.ttl_seconds}s",
+                    display_name=f"prefix-{prompt_hash}",
+                ),
+            )
+        except Exception as e:
+            logger.warning("Creating the context cache for %s failed, retrying in %ss: %s",
+                           llm_request.model, FAILURE_BACKOFF_SECONDS, e)
+            return None
+        return CachedPrefix(
+            cache_name=cached.name,
+            model=llm_request.model,
+            prompt_hash=prompt_hash,
+            expire_time=time.time() + self.ttl_seconds,
+        )
+
+    async def _refresh(self, key: Tuple[str, str], entry: CachedPrefix) -> None:
+        try:
+            await self.client.aio.caches.update(
+                name=entry.cache_name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+            )
+        except Exception as e:
+            logger.warning("Refreshing the context cache %s failed: %s", entry.cache_name, e)
+            return
+        if self._entries.get(key) is entry:
+            self._entries[key] = entry.model_copy(update={"expire_time": time.time() + self.ttl_seconds})
+
+    async def _delete(self, cache_name: str) -> None:
+        try:
+            await self.client.aio.caches.delete(name=cache_name)
+        except Exception as e:
+            logger.warning("Deleting the context cache %s failed: %s", cache_name, e)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+prompt_cache = PromptCacheRegistry()
+
+
+async def use_prompt_cache(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """
+    before_model_callback: swaps the static prefix of the request for a cached content reference.
+    Must run after any callback that changes `llm_request.model` (caches are model-specific).
+    """
+    config = llm_request.config
+    if not CONTEXT_CACHE_ENABLED or config is None or not config.system_instruction or config.cached_content:
+        return None
+
+    cache_name = await prompt_cache.acquire(callback_context.agent_name, llm_request)
+    if cache_name:
+        config.cached_content = cache_name
+        config.system_instruction = None
+        config.tools = None
+        config.tool_config = None
+    return None
@@ -0,0 +1,86 @@
+"""
+Callback: Draft Pre-Check
+Local, model-free checks of a Creator draft against the Evaluator's red flags that need no
+google_search (length, hashtag count, generic hashtags, corporate tone, URLs).
+
+The findings feed the speculative next draft (`speculative_brief`), which the Creator writes
+while the Evaluator is still verifying the current one.
+"""
+
+import re
+from typing import List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from root_agent.callbacks.hashtag_knowledge import draft_hashtags
+from root_agent.platforms import PlatformProfile
+
+
+DEFAULT_CAPTION_MAX_LENGTH = 280
+DEFAULT_HASHTAG_COUNT = 5
+
+GENERIC_HASHTAGS = {"#fyp", "#foryou", "#foryoupage", "#viral", "#trending", "#explore", "#reels", "#shorts", "#xyzbca"}
+CORPORATE_PHRASES = ("unlock", "elevate", "journey", "empower", "leverage", "game-changer", "next level", "synergy")
+
+_URL_PATTERN = re.compile(r"https?://|www\.", re.IGNORECASE)
+
+
+def draft_section(creative_output: str, heading: str) -> Optional[str]:
+    """Body of a `## <heading>` section of a Creator draft (None if missing)."""
+    for section in (creative_output or "").split("##"):
+        title, _, body = section.strip().partition("\n")
+        if title.strip().lower().startswith(heading.lower()):
+            return body.strip()
+    return None
+
+
+def precheck_draft(creative_output: str, platform: Optional[PlatformProfile] = None) -> List[str]:
+    """Red flags found in the draft, phrased like the Evaluator's revision notes."""
+    max_length = platform.caption_max_length if platform else DEFAULT_CAPTION_MAX_LENGTH
+    hashtag_count = platform.hashtag_count if platform else DEFAULT_HASHTAG_COUNT
+    findings = []
+
+    caption = draft_section(creative_output, "caption")
+    if not caption:
+        findings.append("INCOMPLETE – the draft has no `## Caption` section.")
+    elif len(caption) > max_length:
+        findings.append(f"FORMAT VIOLATION – the caption has {len(caption)} characters (max {max_length}).")
+
+    hashtags = draft_hashtags(creative_output)
+    if len(hashtags) < hashtag_count:
+        findings.append(f"INCOMPLETE – {len(hashtags)} strategic hashtags (required: {hashtag_count}).")
+    generic = [tag for tag in hashtags if tag.lower() in GENERIC_HASHTAGS]
+    if hashtags and len(generic) * 2 >= len(hashtags):
+        findings.append(f"LAZY – mostly generic hashtags ({', '.join(generic)}); use niche-specific ones.")
+
+    phrases = [phrase for phrase in CORPORATE_PHRASES if phrase in (caption or "").lower()]
+    if phrases:
+        findings.append(f"TONE VIOLATION – corporate language in the caption: {', '.join(phrases)}.")
+    if _URL_PATTERN.search(creative_output or ""):
+        findings.append("FORMAT VIOLATION – the draft contains a URL.")
+    return findings
+
+
+def render_speculative_brief(creative_output: str, findings: List[str]) -> str:
+    """The <draft_review> block for the speculative Creator."""
+    notes = "\n".join(f"- {finding}" for finding in findings) or "- No formal issues found locally."
+    return (
+        "<draft_review>\n"
+        "Your previous draft is being evaluated right now. Most first drafts are rejected as too generic,\n"
+        "so write an improved version: more specific to the video, a stronger hook, more niche hashtags.\n"
+        f"Local pre-check findings:\n{notes}\n\n"
+        f"Previous draft:\n{creative_output}\n"
+        "</draft_review>"
+    )
+
+
+def speculative_brief_writer(platform: Optional[PlatformProfile] = None):
+    """Builds the speculative Creator's before_agent_callback that reviews the current draft locally."""
+    prefix = f"{platform.key}_" if platform else ""
+
+    def write_speculative_brief(callback_context: CallbackContext) -> Optional[types.Content]:
+        draft = str(callback_context.state.get(f"{prefix}creative_output") or "")
+        callback_context.state[f"{prefix}speculative_brief"] = render_speculative_brief(draft, precheck_draft(draft, platform))
+        return None
+
+    return write_speculative_brief
@@ -0,0 +1,53 @@
+"""
+Callback: Engagement Prediction
+Scores every Creator draft with the local engagement model before the Evaluator sees it.
+
+- before_agent_callback (Evaluator): builds the draft's PostFeatures from the video analysis
+  and the draft and writes the prediction to `predicted_engagement` (state only – the
+  Evaluator's prompt is unchanged).
+
+`post_features` is also used to ingest real outcomes of a finished run (services/engagement_api.py).
+"""
+
+from typing import Any, Mapping, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from root_agent.callbacks.draft_precheck import draft_section
+from root_agent.callbacks.hashtag_knowledge import draft_hashtags
+from root_agent.services.engagement_model import ENGAGEMENT_MODEL_ENABLED, PostFeatures, get_engagement_model
+
+
+def post_features(state: Mapping[str, Any], platform_key: Optional[str] = None) -> Optional[PostFeatures]:
+    """Model features of the current (or final) draft in a session state; None without a draft."""
+    prefix = f"{platform_key}_" if platform_key else ""
+    creative_output = str(state.get(f"{prefix}creative_output") or "")
+    if not creative_output:
+        return None
+    video_analysis = state.get("video_analysis")
+    video_analysis = video_analysis if isinstance(video_analysis, dict) else {}
+    schema = video_analysis.get("schema_extraction") or {}
+    audio = video_analysis.get("audio_analysis") or {}
+    return PostFeatures(
+        hook_type=str(schema.get("hook_type") or ""),
+        scene_length=str(schema.get("scene_length") or ""),
+        visual_frequency=str(schema.get("visual_frequency") or ""),
+        onset_density=audio.get("onset_density"),
+        hashtags=draft_hashtags(creative_output),
+        caption=draft_section(creative_output, "caption") or "",
+        platform=platform_key,
+    )
+
+
+def engagement_predictor(platform_key: Optional[str] = None):
+    """Builds the Evaluator's before_agent_callback that predicts the draft's engagement rate."""
+    prefix = f"{platform_key}_" if platform_key else ""
+
+    def predict_engagement(callback_context: CallbackContext) -> Optional[types.Content]:
+        features = post_features(callback_context.state, platform_key) if ENGAGEMENT_MODEL_ENABLED else None
+        if features is None:
+            return None
+        callback_context.state[f"{prefix}predicted_engagement"] = get_engagement_model().predict(features).model_dump()
+        return None
+
+    return predict_engagement
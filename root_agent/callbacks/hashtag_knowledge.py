@@ -0,0 +1,138 @@
+"""
+Callback: Hashtag Knowledge
+Connects Creator, Evaluator and Creation-Evaluation Loop to the hashtag knowledge base.
+
+  Creator   before_agent – `vetted_hashtags`: approved, recently verified hashtags for the niche (once per run)
+  Evaluator before_agent – `hashtag_verifications`: fresh verifications of the draft's hashtags;
+                           the Evaluator cites them instead of searching again
+  Evaluator after_model  – records the hashtags the Evaluator verified via google_search (only turns
+                           whose response carries web search grounding)
+  Loop      after_agent  – records the final draft's hashtags with rating / approval per niche keyword
+
+Niche keywords are the most frequent content words of the video analysis brief.
+"""
+
+import re
+import time
+from collections import Counter
+from typing import List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from google.genai import types
+from root_agent.callbacks.similar_examples import parse_evaluation
+from root_agent.services.hashtag_store import HASHTAG_STORE_ENABLED, get_hashtag_store
+
+
+NICHE_KEYWORD_COUNT = 12
+KNOWLEDGE_BASE_MARKER = "(knowledge base)"
+
+_NUMBERED_HASHTAG_PATTERN = re.compile(r"^\s*\d+\.\s*\**\s*(#[\wÀ-ɏ]+)", re.MULTILINE)
+_VERIFICATION_PATTERN = re.compile(
+    r"Hashtag checked:\W*(#[\wÀ-ɏ]+)\W*(?:→|->)?\s*Result:\W*(TRENDING|OUTDATED|NOT FOUND)(.*)$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_WORD_PATTERN = re.compile(r"[a-zà-ɏ]{4,}")
+_STOPWORDS = {
+    "this", "that", "with", "from", "what", "when", "which", "their", "there", "about", "into", "than", "then",
+    "they", "them", "have", "does", "will", "would", "should", "could", "every", "each", "more", "most", "very",
+    "first", "seconds", "second", "video", "content", "viewer", "viewers", "hook", "root", "question", "questions",
+    "scene", "length", "visual", "frequency", "unique", "elements", "type", "fast", "cuts", "long", "takes",
+}
+
+
+def draft_hashtags(creative_output: str) -> List[str]:
+    """The numbered strategic hashtags of a Creator draft."""
+    for section in (creative_output or "").split("##"):
+        heading, _, body = section.strip().partition("\n")
+        if heading.strip().lower().startswith("strategic hashtag"):
+            return _NUMBERED_HASHTAG_PATTERN.findall(body)
+    return []
+
+
+def niche_keywords(callback_context: CallbackContext, count: int = NICHE_KEYWORD_COUNT) -> List[str]:
+    """Most frequent content words of the video analysis brief."""
+    words = _WORD_PATTERN.findall(str(callback_context.state.get("video_analysis_brief") or "").lower())
+    return [word for word, _ in Counter(w for w in words if w not in _STOPWORDS).most_common(count)]
+
+
+def vetted_hashtag_suggester(platform_key: Optional[str] = None):
+    """Builds the Creator's before_agent_callback that renders pre-vetted hashtags for the niche."""
+    state_key = f"{platform_key}_vetted_hashtags" if platform_key else "vetted_hashtags"
+
+    def suggest_vetted_hashtags(callback_context: CallbackContext) -> Optional[types.Content]:
+        if callback_context.state.get(state_key) is not None:
+            return None
+        suggestions = get_hashtag_store().suggest(niche_keywords(callback_context)) if HASHTAG_STORE_ENABLED else []
+        callback_context.state[state_key] = (
+            "<vetted_hashtags>\nApproved before for this niche and verified as trending recently:\n"
+            + "\n".join(
+                f"- {s.hashtag} (approved {s.approvals}/{s.uses}{f', avg rating {s.avg_rating}' if s.avg_rating else ''})"
+                for s in suggestions
+            )
+            + "\n</vetted_hashtags>"
+        ) if suggestions else ""
+        return None
+
+    return suggest_vetted_hashtags
+
+
+def hashtag_verification_lookup(platform_key: Optional[str] = None):
+    """Builds the Evaluator's before_agent_callback that serves fresh verifications from the store."""
+    prefix = f"{platform_key}_" if platform_key else ""
+
+    def lookup_hashtag_verifications(callback_context: CallbackContext) -> Optional[types.Content]:
+        hashtags = draft_hashtags(str(callback_context.state.get(f"{prefix}creative_output") or ""))
+        verifications = get_hashtag_store().fresh_verifications(hashtags) if HASHTAG_STORE_ENABLED else {}
+        now = time.time()
+        callback_context.state[f"{prefix}hashtag_verifications"] = (
+            "<hashtag_verifications>\n"
+            + "\n".join(
+                f"- {v.hashtag}: {v.status} (verified {max(1, round((now - v.verified_at) / 3600))}h ago)"
+                for v in verifications.values()
+            )
+            + "\n</hashtag_verifications>"
+        ) if verifications else ""
+        return None
+
+    return lookup_hashtag_verifications
+
+
+def hashtag_verification_recorder():
+    """Builds the Evaluator's after_model_callback that stores its google_search verifications."""
+
+    def record_hashtag_verifications(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        content = llm_response.content
+        if not HASHTAG_STORE_ENABLED or llm_response.partial or content is None or not content.parts:
+            return None
+        # Only verifications backed by a search in this turn – a TRENDING the model merely wrote down
+        # would otherwise be cached and tell the next Evaluator to skip the real search.
+        grounding = llm_response.grounding_metadata
+        if grounding is None or not grounding.web_search_queries:
+            return None
+        text = "".join(part.text for part in content.parts if part.text and not part.thought)
+        verifications = [(hashtag, status) for hashtag, status, rest in _VERIFICATION_PATTERN.findall(text)
+                         if KNOWLEDGE_BASE_MARKER not in rest.lower()]
+        if verifications:
+            niche = " ".join(niche_keywords(callback_context))
+            store = get_hashtag_store()
+            for hashtag, status in verifications:
+                store.record_verification(hashtag, status, niche)
+        return None
+
+    return record_hashtag_verifications
+
+
+def hashtag_outcome_recorder(platform_key: Optional[str] = None):
+    """Builds the Creation-Evaluation Loop's after_agent_callback that records the final hashtags."""
+    prefix = f"{platform_key}_" if platform_key else ""
+
+    def record_hashtag_outcome(callback_context: CallbackContext) -> Optional[types.Content]:
+        hashtags = draft_hashtags(str(callback_context.state.get(f"{prefix}creative_output") or ""))
+        if not (HASHTAG_STORE_ENABLED and hashtags):
+            return None
+        rating, approved = parse_evaluation(str(callback_context.state.get(f"{prefix}evaluation_result") or ""))
+        get_hashtag_store().record_outcome(hashtags, niche_keywords(callback_context), approved, rating)
+        return None
+
+    return record_hashtag_outcome
@@ -0,0 +1,111 @@
+"""
+Callback: Creator Model Router
+Picks the model for each Creator iteration based on the severity of the Evaluator's feedback.
+
+- First draft or major rewrite (hallucination, off-topic, weak strategy) → full model
+- Targeted edit (hashtags, tone, length, outdated trend)                 → fast model
+
+Every decision is appended to the session state under `model_routing`.
+"""
+
+import os
+import re
+from typing import Any, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+
+CREATOR_FULL_MODEL = os.getenv("CREATOR_FULL_MODEL", "gemini-2.5-pro")
+CREATOR_FAST_MODEL = os.getenv("CREATOR_FAST_MODEL", "gemini-2.5-flash")
+
+# Ratings at or below this value mean the draft has to be rethought, not edited.
+MAJOR_RATING_THRESHOLD = 4
+
+# Red flag markers from the Evaluator prompt (upper case, as the Evaluator writes them).
+MAJOR_ISSUES = ("HALLUCINATION", "NOT SPECIFIC ENOUGH", "OFF-TOPIC", "MISINFORMATION")
+MINOR_ISSUES = ("LAZY", "FORMAT VIOLATION", "INCOMPLETE", "TONE VIOLATION", "OUTDATED")
+
+# Criteria whose low score means the content itself is wrong (not just its packaging).
+CORE_CRITERIA = ("Factual Accuracy", "Strategic Depth", "Anti-Hallucination")
+
+_RATING_PATTERN = re.compile(r"Rating:\s*(\d+)\s*/\s*10")
+_CRITERION_PATTERN = re.compile(r"\*\*(?P<name>[^*:]+?)(?:\s*\([^)]*\))?:\*\*\s*(?P<score>\d+)\s*/\s*10")
+
+
+def classify_feedback(feedback: Optional[str]) -> Dict[str, Any]:
+    """
+    Classifies Evaluator feedback into a routing severity.
+
+    Args:
+        feedback: The Evaluator's text output of the previous iteration (None for the first draft).
+
+    Returns:
+        dict: 'severity' ("initial", "major" or "minor"), the parsed 'rating' and the matched 'issues'.
+    """
+    if not feedback or not str(feedback).strip():
+        return {"severity": "initial", "rating": None, "issues": []}
+
+    feedback = str(feedback)
+    rating_match = _RATING_PATTERN.search(feedback)
+    rating = int(rating_match.group(1)) if rating_match else None
+
+    # Only the revision notes count for red flags – the criteria headings mention them too.
+    status_index = feedback.find("STATUS:")
+    revision_notes = feedback[status_index:] if status_index != -1 else feedback
+    major = [issue for issue in MAJOR_ISSUES if issue in revision_notes]
+    minor = [issue for issue in MINOR_ISSUES if issue in revision_notes]
+
+    weak_core = [
+        match.group("name").strip()
+        for match in _CRITERION_PATTERN.finditer(feedback)
+        if match.group("name").strip() in CORE_CRITERIA
+        and int(match.group("score")) <= MAJOR_RATING_THRESHOLD
+    ]
+
+    if major or weak_core or (rating is not None and rating <= MAJOR_RATING_THRESHOLD):
+        severity = "major"
+    else:
+        severity = "minor"
+
+    return {"severity": severity, "rating": rating, "issues": major + weak_core + minor}
+
+
+def creator_model_router(
+    feedback_key: str = "evaluation_result",
+    routing_key: str = "model_routing",
+    full_model: str = CREATOR_FULL_MODEL,
+    fast_model: str = CREATOR_FAST_MODEL,
+):
+    """
+    Builds a before_model_callback that routes the Creator to a model tier.
+
+    Args:
+        feedback_key: State key holding the Evaluator's output of the previous iteration.
+        routing_key: State key the routing decisions are appended to.
+        full_model: Model for first drafts and major rewrites.
+        fast_model: Model for targeted edits.
+
+    Returns:
+        A callback for `Agent(before_model_callback=...)`.
+    """
+
+    def route_model(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        decisions = list(callback_context.state.get(routing_key) or [])
+        feedback = callback_context.state.get(feedback_key)
+
+        classification = classify_feedback(feedback)
+        model = fast_model if classification["severity"] == "minor" else full_model
+        llm_request.model = model
+
+        decisions.append({
+            "iteration": len(decisions) + 1,
+            "severity": classification["severity"],
+            "rating": classification["rating"],
+            "issues": classification["issues"],
+            "model": model,
+        })
+        callback_context.state[routing_key] = decisions
+        return None
+
+    return route_model
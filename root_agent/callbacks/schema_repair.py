@@ -0,0 +1,188 @@
+"""
+Callback: Schema Repair
+Validates structured agent output against its Pydantic schema and repairs it instead of failing the run.
+
+Repair steps (cheapest first, stops as soon as the output validates):
+  1. local:  strip text/code fences around the JSON, drop trailing commas,
+             trim lists that exceed their max_length
+  2. re-ask: a small structured call that regenerates only the failing top-level fields
+  3. pad:    lists still below min_length are padded by repeating their last item
+
+Every repair is appended to the session state under `schema_repairs`.
+"""
+
+import json
+import os
+import re
+import typing
+from typing import Any, Dict, List, Optional, Set, Type
+
+import annotated_types
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from google.genai import types
+from pydantic import BaseModel, ValidationError, create_model
+from root_agent.services.rate_limit import rate_limiter
+
+
+SCHEMA_REPAIR_MODEL = os.getenv("SCHEMA_REPAIR_MODEL", "gemini-2.0-flash")
+
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+_client = None
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        from google import genai
+        _client = genai.Client()
+    return _client
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """Parses the outermost JSON object in `text`, ignoring prose and code fences around it."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    candidate = text[start:end + 1]
+    for attempt in (candidate, _TRAILING_COMMA_PATTERN.sub(r"\1", candidate)):
+        try:
+            return json.loads(attempt)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def _length_bounds(field) -> tuple:
+    min_length = max_length = None
+    for constraint in field.metadata:
+        if isinstance(constraint, annotated_types.MinLen):
+            min_length = constraint.min_length
+        elif isinstance(constraint, annotated_types.MaxLen):
+            max_length = constraint.max_length
+    return min_length, max_length
+
+
+def _model_type(annotation: Any) -> Optional[Type[BaseModel]]:
+    return annotation if isinstance(annotation, type) and issubclass(annotation, BaseModel) else None
+
+
+def fit_lists(data: Any, schema: Type[BaseModel], pad: bool = False) -> Any:
+    """Trims (and with `pad`, pads) list fields to their length constraints, recursing into nested models."""
+    if not isinstance(data, dict):
+        return data
+    for name, field in schema.model_fields.items():
+        value = data.get(name)
+        nested = _model_type(field.annotation)
+        if nested is not None:
+            data[name] = fit_lists(value, nested, pad)
+            continue
+        if typing.get_origin(field.annotation) not in (list, List) or not isinstance(value, list):
+            continue
+
+        min_length, max_length = _length_bounds(field)
+        if max_length is not None and len(value) > max_length:
+            value = value[:max_length]
+        if pad and min_length is not None and value and len(value) < min_length:
+            value = value + [value[-1]] * (min_length - len(value))
+
+        item_type = _model_type((typing.get_args(field.annotation) or (None,))[0])
+        data[name] = [fit_lists(item, item_type, pad) for item in value] if item_type else value
+    return data
+
+
+def failing_fields(data: Dict[str, Any], schema: Type[BaseModel]) -> Dict[str, List[str]]:
+    """Validates `data` and returns the error messages grouped by top-level field."""
+    try:
+        schema.model_validate(data)
+    except ValidationError as e:
+        errors: Dict[str, List[str]] = {}
+        for error in e.errors():
+            field = str(error["loc"][0]) if error["loc"] else "__root__"
+            errors.setdefault(field, []).append(f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+        return errors
+    return {}
+
+
+async def reask_fields(data: Dict[str, Any], schema: Type[BaseModel], errors: Dict[str, List[str]], model: str) -> Dict[str, Any]:
+    """Regenerates only the failing top-level fields with a small structured call."""
+    fields = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in errors if name in schema.model_fields}
+    if not fields:
+        return data
+
+    repair_schema = create_model(f"{schema.__name__}Repair", **fields)
+    prompt = (
+        "The following JSON output violates its schema. Return ONLY the listed fields, corrected.\n"
+        "Keep the content consistent with the rest of the JSON.\n\n"
+        f"JSON:\n{json.dumps(data, ensure_ascii=False)}\n\n"
+        "Errors:\n" + "\n".join(message for messages in errors.values() for message in messages)
+    )
+    await rate_limiter.acquire(model)
+    response = await _get_client().aio.models.generate_content(
+        model=model,
+        contents=prompt,
+        config=types.GenerateContentConfig(response_mime_type="application/json", response_schema=repair_schema),
+    )
+    repaired = extract_json(response.text or "") or {}
+    return {**data, **{name: repaired[name] for name in fields if name in repaired}}
+
+
+def repair_structured_output(schema: Type[BaseModel], model: str = SCHEMA_REPAIR_MODEL):
+    """
+    Builds an after_model_callback that repairs output violating `schema`.
+
+    Args:
+        schema: The agent's output_schema.
+        model: Model used for the targeted re-ask.
+
+    Returns:
+        A callback for `Agent(after_model_callback=...)`.
+    """
+
+    async def repair_output(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        content = llm_response.content
+        if llm_response.partial or content is None or not content.parts:
+            return None
+        text = "".join(part.text for part in content.parts if part.text and not part.thought)
+        if not text:
+            return None
+        try:
+            schema.model_validate_json(text)
+            return None
+        except ValidationError:
+            pass
+
+        data = extract_json(text)
+        if not isinstance(data, dict):
+            return None
+
+        steps: List[str] = ["local"]
+        data = fit_lists(data, schema)
+        errors = failing_fields(data, schema)
+        repaired: Set[str] = set(errors)
+        if errors:
+            steps.append("reask")
+            try:
+                data = await reask_fields(data, schema, errors, model)
+            except Exception:
+                pass
+            errors = failing_fields(data, schema)
+        if errors:
+            steps.append("pad")
+            data = fit_lists(data, schema, pad=True)
+            errors = failing_fields(data, schema)
+
+        repairs = callback_context.state.get("schema_repairs") or []
+        callback_context.state["schema_repairs"] = repairs + [{
+            "agent": callback_context.agent_name,
+            "schema": schema.__name__,
+            "steps": steps,
+            "fields": sorted(repaired),
+            "valid": not errors,
+        }]
+
+        content.parts = [types.Part(text=json.dumps(data, ensure_ascii=False))]
+        return llm_response
+
+    return repair_output
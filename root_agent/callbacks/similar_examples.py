@@ -0,0 +1,117 @@
+"""
+Callback: Similar Examples (retrieval-augmented creation)
+Gives the Creator the top-k approved outputs of similar past runs and records new approvals.
+
+- before_agent_callback (Creator): embeds the current video analysis + insights, retrieves the
+  most similar approved examples and renders them into `similar_examples` (once per run – later
+  loop iterations reuse the state value).
+- after_agent_callback (Creation-Evaluation Loop): if the Evaluator approved the final draft,
+  adds it to the example index.
+
+Retrieval failures never fail the run; the Creator then simply starts without examples.
+"""
+
+import logging
+import os
+import re
+from typing import List, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from root_agent.services.example_index import EXAMPLE_INDEX_ENABLED, ScoredExample, embed_texts, get_example_index
+
+
+SIMILAR_EXAMPLES_K = int(os.getenv("SIMILAR_EXAMPLES_K", "3"))
+SIMILAR_EXAMPLES_MIN_SCORE = float(os.getenv("SIMILAR_EXAMPLES_MIN_SCORE", "0.6"))
+# Sections of an approved output that are shown as an example.
+EXAMPLE_SECTIONS = ("caption", "strategic hashtags")
+
+_RATING_PATTERN = re.compile(r"Rating:\s*(\d+)\s*/\s*10")
+_APPROVED_PATTERN = re.compile(r"STATUS:\W*APPROVED", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_evaluation(evaluation: str) -> Tuple[Optional[int], bool]:
+    """Extracts (rating, approved) from the Evaluator's markdown."""
+    rating = _RATING_PATTERN.search(evaluation or "")
+    return (int(rating.group(1)) if rating else None), bool(_APPROVED_PATTERN.search(evaluation or ""))
+
+
+def creator_excerpt(creative_output: str) -> str:
+    """Keeps only the caption and hashtag sections of a Creator output."""
+    sections = []
+    for section in (creative_output or "").split("##"):
+        heading = section.strip().partition("\n")[0].strip().lower()
+        if heading.startswith(EXAMPLE_SECTIONS):
+            sections.append("## " + section.strip())
+    return "\n".join(sections) or (creative_output or "").strip()
+
+
+def render_examples(examples: List[ScoredExample]) -> str:
+    """Renders the retrieved examples as the Creator's <examples> block ('' if there are none)."""
+    if not examples:
+        return ""
+    blocks = [
+        f"Example {i} (rating {scored.example.rating or '?'}/10, similarity {scored.score:.2f}):\n{creator_excerpt(scored.example.creative_output)}"
+        for i, scored in enumerate(examples, 1)
+    ]
+    return "<examples>\nApproved outputs for similar content:\n\n" + "\n\n".join(blocks) + "\n</examples>"
+
+
+def _query_text(callback_context: CallbackContext) -> str:
+    state = callback_context.state
+    return f"{state.get('video_analysis_brief') or ''}\n{state.get('insights_for_creator') or ''}".strip()
+
+
+def similar_examples_retriever(platform_key: Optional[str] = None):
+    """
+    Builds the Creator's before_agent_callback.
+
+    Args:
+        platform_key: Restricts retrieval to examples of this platform (plus platform-less ones).
+            Also prefixes the state key (e.g. tiktok_similar_examples).
+    """
+    state_key = f"{platform_key}_similar_examples" if platform_key else "similar_examples"
+
+    async def retrieve_similar_examples(callback_context: CallbackContext) -> Optional[types.Content]:
+        if callback_context.state.get(state_key) is not None:
+            return None
+        rendered = ""
+        query = _query_text(callback_context)
+        if EXAMPLE_INDEX_ENABLED and query:
+            try:
+                # Opening the index (SQLite, first load) can fail too; the Creator then runs without examples.
+                index = get_example_index()
+                if len(index):
+                    vector = (await embed_texts([query]))[0]
+                    rendered = render_examples(index.search(vector, k=SIMILAR_EXAMPLES_K, platform=platform_key,
+                                                            min_score=SIMILAR_EXAMPLES_MIN_SCORE))
+            except Exception as e:
+                logger.warning("Example retrieval failed: %s", e)
+        callback_context.state[state_key] = rendered
+        return None
+
+    return retrieve_similar_examples
+
+
+def approved_example_recorder(platform_key: Optional[str] = None):
+    """Builds the Creation-Evaluation Loop's after_agent_callback that indexes approved outputs."""
+    prefix = f"{platform_key}_" if platform_key else ""
+
+    async def record_approved_example(callback_context: CallbackContext) -> Optional[types.Content]:
+        state = callback_context.state
+        rating, approved = parse_evaluation(str(state.get(f"{prefix}evaluation_result") or ""))
+        creative_output = state.get(f"{prefix}creative_output")
+        query = _query_text(callback_context)
+        if not (EXAMPLE_INDEX_ENABLED and approved and creative_output and query):
+            return None
+        try:
+            vector = (await embed_texts([query]))[0]
+            get_example_index().add(vector, insights=query, creative_output=str(creative_output),
+                                    platform=platform_key, rating=rating)
+        except Exception as e:
+            logger.warning("Indexing the approved example failed: %s", e)
+        return None
+
+    return record_approved_example
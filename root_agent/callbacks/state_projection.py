@@ -0,0 +1,141 @@
+"""
+Callback: State Projection
+Writes compact, per-consumer views of `video_analysis` and `insights` into the session state.
+
+The full StrategySchema (3 root questions × 4 follow-ups × 4 levels) is only needed by the UI.
+Downstream agents read the projections instead, which keeps the dynamic prompt suffix small on
+every loop iteration:
+
+  video_analysis_brief   – schema extraction, measured audio, root questions (Insight Extractor, Evaluator)
+  root_question_{1..3}   – one root question each                      (Drill-Down agents)
+  drill_down_brief       – answer, diagnosis, prescription per question (Insight Extractor merge step)
+  insights_for_creator   – angle, hook strategy, prescriptive insights   (Creator)
+  insights_for_evaluator – hook strategy, angle, prescriptive summary    (Evaluator)
+"""
+
+from typing import Any, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from root_agent.services.audio_analysis import summarize_audio
+
+
+SCHEMA_FIELDS = ("hook_type", "scene_length", "visual_frequency", "unique_visual_elements")
+ROOT_QUESTION_COUNT = 3
+
+
+def _lines(pairs: List[tuple]) -> str:
+    return "\n".join(f"{label}: {value}" for label, value in pairs if value)
+
+
+def project_video_analysis(video_analysis: Any) -> str:
+    """Renders the Video Analysis as compact labelled lines (the Ground Truth for later agents)."""
+    if not isinstance(video_analysis, dict):
+        return str(video_analysis or "")
+
+    schema = video_analysis.get("schema_extraction") or {}
+    text = _lines([(field, schema.get(field)) for field in SCHEMA_FIELDS])
+
+    audio = video_analysis.get("audio_analysis")
+    if isinstance(audio, dict):
+        text += f"\naudio (measured): {summarize_audio(audio)}"
+
+    root_questions = video_analysis.get("root_questions") or []
+    if root_questions:
+        text += "\nroot_questions:\n" + "\n".join(f"{i}. {q}" for i, q in enumerate(root_questions, 1))
+    return text
+
+
+def project_drill_downs(analyses: List[Any]) -> str:
+    """Renders the parallel drill-down results as the merge step's input (follow-ups are left out)."""
+    blocks = []
+    for i, analysis in enumerate(analyses, 1):
+        if not isinstance(analysis, dict):
+            continue
+        levels = analysis.get("analysis_levels") or {}
+        blocks.append(f"Root Question {i}: {analysis.get('root_question')}\n" + _lines([
+            ("answer", analysis.get("answer")),
+            ("diagnostic", levels.get("diagnostic")),
+            ("predictive", levels.get("predictive")),
+            ("prescriptive", levels.get("prescriptive")),
+        ]))
+    return "\n\n".join(blocks)
+
+
+def project_insights_for_creator(insights: Any) -> str:
+    """Renders only the strategy fields the Creator turns into a caption."""
+    if not isinstance(insights, dict):
+        return str(insights or "")
+
+    text = _lines([
+        ("most_engaging_element", insights.get("most_engaging_element")),
+        ("hook_strategy", insights.get("hook_strategy")),
+        ("psychological_angle", insights.get("psychological_angle")),
+        ("prescriptive_summary", insights.get("prescriptive_summary")),
+    ])
+
+    prescriptions = [
+        (analysis.get("analysis_levels") or {}).get("prescriptive")
+        for analysis in insights.get("root_question_analyses") or []
+    ]
+    prescriptions = [p for p in prescriptions if p]
+    if prescriptions:
+        text += "\nprescriptive_insights:\n" + "\n".join(f"- {p}" for p in prescriptions)
+    return text
+
+
+def project_insights_for_evaluator(insights: Any) -> str:
+    """Renders only the strategy fields the Evaluator checks the caption against."""
+    if not isinstance(insights, dict):
+        return str(insights or "")
+
+    return _lines([
+        ("hook_strategy", insights.get("hook_strategy")),
+        ("psychological_angle", insights.get("psychological_angle")),
+        ("prescriptive_summary", insights.get("prescriptive_summary")),
+    ])
+
+
+def store_video_analysis_projection(callback_context: CallbackContext) -> Optional[types.Content]:
+    """after_agent_callback for the Video Analyst (also attaches the measured `audio_analysis`)."""
+    video_analysis = callback_context.state.get("video_analysis")
+    audio_analysis = callback_context.state.get("audio_analysis")
+    if isinstance(video_analysis, dict) and audio_analysis and video_analysis.get("audio_analysis") != audio_analysis:
+        video_analysis = {**video_analysis, "audio_analysis": audio_analysis}
+        callback_context.state["video_analysis"] = video_analysis
+    if video_analysis is not None:
+        callback_context.state["video_analysis_brief"] = project_video_analysis(video_analysis)
+        root_questions = (video_analysis.get("root_questions") or []) if isinstance(video_analysis, dict) else []
+        for i in range(1, ROOT_QUESTION_COUNT + 1):
+            callback_context.state[f"root_question_{i}"] = root_questions[i - 1] if i <= len(root_questions) else ""
+    return None
+
+
+def store_drill_down_projection(callback_context: CallbackContext) -> Optional[types.Content]:
+    """after_agent_callback for the parallel drill-down stage."""
+    analyses = [callback_context.state.get(f"root_question_analysis_{i}") for i in range(1, ROOT_QUESTION_COUNT + 1)]
+    callback_context.state["drill_down_brief"] = project_drill_downs(analyses)
+    return None
+
+
+def store_insights_projection(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    after_agent_callback for the Insight Extractor merge step.
+    Assembles the full StrategySchema `insights` from the merge summary and the parallel drill-downs.
+    """
+    summary = callback_context.state.get("strategy_summary")
+    if isinstance(summary, dict):
+        analyses = [callback_context.state.get(f"root_question_analysis_{i}") for i in range(1, ROOT_QUESTION_COUNT + 1)]
+        callback_context.state["insights"] = {
+            "most_engaging_element": summary.get("most_engaging_element"),
+            "hook_strategy": summary.get("hook_strategy"),
+            "psychological_angle": summary.get("psychological_angle"),
+            "root_question_analyses": [a for a in analyses if isinstance(a, dict)],
+            "prescriptive_summary": summary.get("prescriptive_summary"),
+        }
+
+    insights: Optional[Dict[str, Any]] = callback_context.state.get("insights")
+    if insights is not None:
+        callback_context.state["insights_for_creator"] = project_insights_for_creator(insights)
+        callback_context.state["insights_for_evaluator"] = project_insights_for_evaluator(insights)
+    return None
@@ -0,0 +1,81 @@
+"""
+Callback: Video Deduplication
+Reuses the analysis of a near-identical prior video instead of running the Video Analyst again.
+
+- before_agent_callback: fingerprints the video in the user message and looks it up in the
+  fingerprint index. On a confident match the stored analysis is written to `video_analysis`
+  and the agent is skipped.
+- after_agent_callback: stores the fresh analysis under the video's fingerprint.
+
+The decision is recorded in the session state under `video_dedup`.
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from root_agent.callbacks.state_projection import store_video_analysis_projection
+from root_agent.output_structure import VideoAnalysisSchema
+from root_agent.services.offload import get_offloader
+from root_agent.services.video_fingerprint import VIDEO_DEDUP_ENABLED, VideoFingerprint, compute_fingerprint, get_fingerprint_index
+
+
+FINGERPRINT_STATE_KEY = "video_fingerprint"
+
+
+def user_video(callback_context: CallbackContext) -> Optional[bytes]:
+    content = callback_context.user_content
+    for part in (content.parts if content and content.parts else []):
+        if part.inline_data and (part.inline_data.mime_type or "").startswith("video/") and part.inline_data.data:
+            return part.inline_data.data
+    return None
+
+
+async def reuse_prior_analysis(callback_context: CallbackContext) -> Optional[types.Content]:
+    """before_agent_callback for the Video Analyst."""
+    video = user_video(callback_context) if VIDEO_DEDUP_ENABLED else None
+    if video is None:
+        return None
+
+    # Decoding, frame sampling and hashing are CPU bound – run them in the offload pool.
+    fingerprint = await get_offloader().run(compute_fingerprint, video)
+    if fingerprint is None:
+        callback_context.state["video_dedup"] = {"status": "unavailable"}
+        return None
+    callback_context.state[FINGERPRINT_STATE_KEY] = fingerprint.model_dump()
+
+    match = await asyncio.to_thread(get_fingerprint_index().find, fingerprint)
+    if match is None or not match.analysis:
+        callback_context.state["video_dedup"] = {"status": "miss"}
+        return None
+    try:
+        analysis = VideoAnalysisSchema.model_validate(match.analysis).model_dump()
+    except ValueError:
+        callback_context.state["video_dedup"] = {"status": "miss"}
+        return None
+
+    callback_context.state["video_dedup"] = {
+        "status": "reused",
+        "video_id": match.video_id,
+        "confidence": match.confidence,
+        "exact": match.exact,
+    }
+    callback_context.state["video_analysis"] = analysis
+    # The agent is skipped, so its after_agent_callback does not run – project here.
+    store_video_analysis_projection(callback_context)
+    return types.Content(role="model", parts=[types.Part(text=json.dumps(analysis, ensure_ascii=False))])
+
+
+def remember_video_analysis(callback_context: CallbackContext) -> Optional[types.Content]:
+    """after_agent_callback for the Video Analyst."""
+    fingerprint = callback_context.state.get(FINGERPRINT_STATE_KEY)
+    analysis = callback_context.state.get("video_analysis")
+    if fingerprint and isinstance(analysis, dict):
+        try:
+            VideoAnalysisSchema.model_validate(analysis)
+        except ValueError:
+            return None
+        get_fingerprint_index().add(VideoFingerprint.model_validate(fingerprint), analysis)
+    return None
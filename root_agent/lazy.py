@@ -0,0 +1,51 @@
+"""
+Lazy package exports (PEP 562).
+
+A package __init__ maps its public names to the submodules that define them. A submodule is only
+imported on first access of one of its names, so a process that needs a single stage (e.g. just
+the engagement tool or just the Video Analyst) does not build every agent or load every dependency.
+
+    install_lazy_exports(__name__, {"creator_agent": ".creator_agent", ...})
+"""
+
+import importlib
+import sys
+import types
+from typing import Dict
+
+
+_EXPORTS_KEY = "__lazy_exports__"
+
+
+class LazyPackage(types.ModuleType):
+    """Module type of a package whose exports are resolved on first access."""
+
+    def __getattr__(self, name: str):
+        target = self.__dict__.get(_EXPORTS_KEY, {}).get(name)
+        if target is None:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        module = importlib.import_module(target, self.__name__)
+        # An export may also be the submodule itself (e.g. root_agent.agent).
+        is_submodule = module.__name__ == f"{self.__name__}.{name}" and not hasattr(module, name)
+        value = module if is_submodule else getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name: str, value) -> None:
+        # Importing a submodule binds it to the package attribute of the same name. For exports
+        # named like their module (creator_agent, exit_loop, ...) keep the exported object instead,
+        # just like an eager `from .creator_agent import creator_agent` would.
+        exports = self.__dict__.get(_EXPORTS_KEY, {})
+        if isinstance(value, types.ModuleType) and name in exports and value.__name__ == f"{self.__name__}.{name}":
+            value = getattr(value, name, value)
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__dict__.get(_EXPORTS_KEY, {})))
+
+
+def install_lazy_exports(package_name: str, exports: Dict[str, str]) -> None:
+    """Turns `package_name` into a LazyPackage serving `exports` (name → relative module)."""
+    package = sys.modules[package_name]
+    package.__dict__[_EXPORTS_KEY] = dict(exports)
+    package.__class__ = LazyPackage
@@ -58,6 +58,14 @@ class StrategySchema(BaseModel):
     prescriptive_summary: str = Field(description="Summary of all Prescriptive Insights.")
 
 
+class StrategySummarySchema(BaseModel):
+    """Output schema for the Insight Extractor merge step (the drill-downs run in parallel beforehand)."""
+    most_engaging_element: str = Field(description="The single most engaging element identified.")
+    hook_strategy: str = Field(description="How to stop the scroll in the first 3 seconds.")
+    psychological_angle: str = Field(description="Why will people share this? (Humor, Shock, Relatability?)")
+    prescriptive_summary: str = Field(description="Summary of all Prescriptive Insights.")
+
+
 # ============================================================================
 # Schema: Creator Agent
 # ============================================================================
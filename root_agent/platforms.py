@@ -0,0 +1,68 @@
+"""
+Target platform profiles for the multi-platform fan-out.
+Each profile carries the constraints the Creator writes against and the Evaluator checks.
+"""
+
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+
+class PlatformProfile(BaseModel):
+    """Constraints for one target platform."""
+    key: str = Field(description="Short identifier, used as prefix for agent names and state keys.")
+    display_name: str = Field(description="Human readable platform name.")
+    caption_max_length: int = Field(description="Maximum caption length in characters.")
+    hashtag_count: int = Field(description="Number of strategic hashtags to deliver.")
+    guidelines: str = Field(description="Platform-specific tone and format guidelines.")
+
+
+PLATFORMS: Dict[str, PlatformProfile] = {
+    "tiktok": PlatformProfile(
+        key="tiktok",
+        display_name="TikTok",
+        caption_max_length=280,
+        hashtag_count=5,
+        guidelines="Hook in the first line, Gen-Z slang, reference trending sounds or formats. Niche hashtags beat #fyp.",
+    ),
+    "reels": PlatformProfile(
+        key="reels",
+        display_name="Instagram Reels",
+        caption_max_length=280,
+        hashtag_count=5,
+        guidelines="Only the first ~125 characters are visible before 'more' – put the hook there. Slightly more polished tone, emojis welcome, end with a save/share call-to-action.",
+    ),
+    "shorts": PlatformProfile(
+        key="shorts",
+        display_name="YouTube Shorts",
+        caption_max_length=100,
+        hashtag_count=3,
+        guidelines="The caption is the Short's title: searchable keywords first, no slang-only titles. Only the first 3 hashtags are shown above the title.",
+    ),
+}
+
+
+def parse_platforms(value: str) -> List[PlatformProfile]:
+    """
+    Parses a comma-separated platform list (e.g. "tiktok,reels,shorts").
+
+    Raises:
+        ValueError: If a platform key is unknown.
+    """
+    keys = [key.strip().lower() for key in (value or "").split(",") if key.strip()]
+    unknown = [key for key in keys if key not in PLATFORMS]
+    if unknown:
+        raise ValueError(f"Unknown target platform(s): {', '.join(unknown)}. Available: {', '.join(PLATFORMS)}")
+    return [PLATFORMS[key] for key in dict.fromkeys(keys)]
+
+
+def render_platform_block(platform: PlatformProfile) -> str:
+    """Renders the <platform> block that is appended to the dynamic prompt suffix."""
+    return (
+        "<platform>\n"
+        f"Target platform: {platform.display_name}\n"
+        f"Caption: max {platform.caption_max_length} characters\n"
+        f"Hashtags: exactly {platform.hashtag_count}\n"
+        f"Guidelines: {platform.guidelines}\n"
+        "</platform>\n"
+    )
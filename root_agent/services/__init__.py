@@ -0,0 +1,17 @@
+"""
+Services package for the InsightBench Multi-Agent System.
+Runtime infrastructure around the agent pipeline (runner, job queue, ...).
+Exports are resolved lazily – a submodule is only imported when one of its names is used.
+"""
+
+from root_agent.lazy import install_lazy_exports
+
+
+__all__ = ["create_runner", "run_pipeline", "JobStore", "WorkerPool"]
+
+install_lazy_exports(__name__, {
+    "create_runner": ".runner",
+    "run_pipeline": ".runner",
+    "JobStore": ".job_queue",
+    "WorkerPool": ".job_queue",
+})
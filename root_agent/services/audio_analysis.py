@@ -0,0 +1,248 @@
+"""
+Service: Audio Analysis
+Local measurements of a video's audio track, so the Video Analyst can reason about sound even
+when the model only gets a muted or low-fidelity stream.
+
+- Decoding: ffmpeg streams mono 16 kHz PCM through a pipe; the analyzer consumes it block by
+  block and only keeps per-frame features (~60 values per second), never the whole track.
+- Loudness: RMS envelope in dBFS (every ENVELOPE_STEP seconds), overall and hook loudness, silence ratio
+- Onsets: spectral-flux peaks per second (overall and in the hook)
+- Tempo: BPM estimate from the autocorrelation of the onset strength (60–180 BPM)
+- Speech / music: heuristic from the low-energy frame ratio (syllable pauses), zero-crossing
+  variability and rhythmic regularity
+
+The hook is the first HOOK_SECONDS seconds. Without ffmpeg or NumPy the analysis is disabled.
+"""
+
+import math
+import os
+import shutil
+import subprocess
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel
+from root_agent.services.video_source import VideoSource
+
+
+AUDIO_ANALYSIS_ENABLED = os.getenv("AUDIO_ANALYSIS_ENABLED", "true").lower() not in ("0", "false", "no")
+SAMPLE_RATE = 16000
+WINDOW = 512
+HOP = 256
+FRAMES_PER_SECOND = SAMPLE_RATE / HOP
+HOOK_SECONDS = 3.0
+ENVELOPE_STEP = 0.5
+MAX_ENVELOPE_POINTS = 180
+SILENCE_DB = -50.0
+MIN_BPM, MAX_BPM = 60, 180
+# Below this autocorrelation peak the BPM estimate is not reported in summaries.
+MIN_BPM_CONFIDENCE = 0.2
+# Minimum distance between two onsets (50 ms).
+MIN_ONSET_GAP = int(0.05 * FRAMES_PER_SECOND)
+READ_BLOCK_BYTES = SAMPLE_RATE * 2  # one second of s16le
+
+
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def audio_analysis_available() -> bool:
+    return _load_numpy() is not None and shutil.which("ffmpeg") is not None
+
+
+class AudioFeatures(BaseModel):
+    """Measured features of a video's audio track."""
+    has_audio: bool
+    duration: float = 0.0
+    loudness_db: Optional[float] = None
+    hook_loudness_db: Optional[float] = None
+    silence_ratio: Optional[float] = None
+    loudness_envelope_db: List[float] = []
+    onset_density: Optional[float] = None
+    hook_onset_density: Optional[float] = None
+    bpm: Optional[float] = None
+    bpm_confidence: Optional[float] = None
+    content_type: Optional[str] = None  # speech / music / speech_over_music / silence
+    speech_score: Optional[float] = None
+    music_score: Optional[float] = None
+
+
+def _db(power: float) -> float:
+    return round(10 * math.log10(power + 1e-10), 1)
+
+
+class AudioAnalyzer:
+    """Streaming analyzer: feed mono float samples in [-1, 1] block by block, then call result()."""
+
+    def __init__(self):
+        self.np = _load_numpy()
+        self._carry = self.np.zeros(0, dtype=self.np.float32)
+        self._window = self.np.hanning(WINDOW).astype(self.np.float32)
+        self._previous_spectrum = None
+        self._rms: List[Any] = []
+        self._zcr: List[Any] = []
+        self._flux: List[Any] = []
+        self.samples = 0
+
+    def feed(self, samples) -> None:
+        np = self.np
+        self.samples += len(samples)
+        buffer = np.concatenate([self._carry, np.asarray(samples, dtype=np.float32)])
+        count = (len(buffer) - WINDOW) // HOP + 1
+        if count <= 0:
+            self._carry = buffer
+            return
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, WINDOW)[::HOP][:count]
+        self._carry = buffer[count * HOP:]
+
+        self._rms.append(np.sqrt(np.mean(frames ** 2, axis=1)))
+        signs = np.signbit(frames)
+        self._zcr.append(np.mean(signs[:, 1:] != signs[:, :-1], axis=1))
+        spectrum = np.abs(np.fft.rfft(frames * self._window, axis=1))
+        previous = np.vstack([self._previous_spectrum if self._previous_spectrum is not None else spectrum[:1], spectrum[:-1]])
+        self._flux.append(np.sum(np.maximum(spectrum - previous, 0.0), axis=1))
+        self._previous_spectrum = spectrum[-1:]
+
+    def result(self) -> AudioFeatures:
+        np = self.np
+        duration = round(self.samples / SAMPLE_RATE, 2)
+        if not self._rms:
+            return AudioFeatures(has_audio=self.samples > 0, duration=duration)
+        rms, zcr, flux = (np.concatenate(values) for values in (self._rms, self._zcr, self._flux))
+        power = rms ** 2
+        hook = int(HOOK_SECONDS * FRAMES_PER_SECOND)
+        step = max(1, int(ENVELOPE_STEP * FRAMES_PER_SECOND))
+        envelope = [_db(float(power[i:i + step].mean())) for i in range(0, len(power), step)][:MAX_ENVELOPE_POINTS]
+        silence_ratio = float(np.mean(20 * np.log10(rms + 1e-10) < SILENCE_DB))
+
+        onsets = self._onsets(flux)
+        seconds = len(rms) / FRAMES_PER_SECOND
+        hook_seconds = min(seconds, HOOK_SECONDS)
+        bpm, bpm_confidence = self._tempo(flux)
+        content_type, speech_score, music_score = self._classify(rms, zcr, silence_ratio, bpm_confidence)
+
+        return AudioFeatures(
+            has_audio=True,
+            duration=duration,
+            loudness_db=_db(float(power.mean())),
+            hook_loudness_db=_db(float(power[:hook].mean())),
+            silence_ratio=round(silence_ratio, 2),
+            loudness_envelope_db=envelope,
+            onset_density=round(len(onsets) / seconds, 2) if seconds else None,
+            hook_onset_density=round(int(np.sum(onsets < hook)) / hook_seconds, 2) if hook_seconds else None,
+            bpm=bpm,
+            bpm_confidence=bpm_confidence,
+            content_type=content_type,
+            speech_score=speech_score,
+            music_score=music_score,
+        )
+
+    def _onsets(self, flux):
+        """Frame indices of spectral-flux peaks above a moving-average threshold."""
+        np = self.np
+        if len(flux) < 3 or not flux.any():
+            return np.zeros(0, dtype=int)
+        width = int(0.25 * FRAMES_PER_SECOND)
+        local_mean = np.convolve(flux, np.ones(2 * width + 1) / (2 * width + 1), mode="same")
+        threshold = 1.5 * local_mean + 0.1 * flux.mean()
+        peaks = np.flatnonzero((flux[1:-1] > threshold[1:-1]) & (flux[1:-1] >= flux[:-2]) & (flux[1:-1] > flux[2:])) + 1
+        onsets, last = [], -MIN_ONSET_GAP
+        for peak in peaks:
+            if peak - last >= MIN_ONSET_GAP:
+                onsets.append(peak)
+                last = peak
+        return np.asarray(onsets, dtype=int)
+
+    def _tempo(self, flux):
+        """(BPM, confidence) from the autocorrelation of the onset strength; (None, None) if too short."""
+        np = self.np
+        if len(flux) < 4 * FRAMES_PER_SECOND:
+            return None, None
+        strength = flux - flux.mean()
+        energy = float(np.dot(strength, strength))
+        if energy <= 0:
+            return None, None
+        lags = np.arange(int(60 / MAX_BPM * FRAMES_PER_SECOND), int(60 / MIN_BPM * FRAMES_PER_SECOND) + 1)
+        correlation = np.array([np.dot(strength[:-lag], strength[lag:]) for lag in lags]) / energy
+        best = int(np.argmax(correlation))
+        confidence = float(max(correlation[best], 0.0))
+        return round(60 * FRAMES_PER_SECOND / lags[best], 1), round(confidence, 2)
+
+    def _classify(self, rms, zcr, silence_ratio: float, bpm_confidence: Optional[float]):
+        """Heuristic speech/music scores (0–1) and the resulting content type."""
+        np = self.np
+        if silence_ratio > 0.9:
+            return "silence", 0.0, 0.0
+        # Speech pauses between syllables: many frames far below the 1-second mean energy.
+        second = int(FRAMES_PER_SECOND)
+        low_energy = [
+            float(np.mean(window < 0.5 * window.mean()))
+            for window in (rms[i:i + second] for i in range(0, len(rms) - second + 1, second))
+            if window.mean() > 0
+        ] or [float(np.mean(rms < 0.5 * rms.mean()))]
+        low_energy_ratio = float(np.mean(low_energy))
+        zcr_variability = float(zcr.std() / (zcr.mean() + 1e-9))
+
+        speech = 0.6 * np.clip((low_energy_ratio - 0.15) / 0.3, 0, 1) + 0.4 * np.clip(zcr_variability, 0, 1)
+        music = 0.5 * np.clip(1 - low_energy_ratio / 0.35, 0, 1) + 0.5 * (bpm_confidence or 0.0)
+        if speech >= 0.5 and music >= 0.5:
+            content_type = "speech_over_music"
+        else:
+            content_type = "speech" if speech > music else "music"
+        return content_type, round(float(speech), 2), round(float(music), 2)
+
+
+def analyze_audio(video: Union[bytes, VideoSource]) -> Optional[AudioFeatures]:
+    """Analyzes the audio track of a video. None if ffmpeg/NumPy are missing or decoding fails."""
+    if not audio_analysis_available():
+        return None
+    np = _load_numpy()
+    with VideoSource.from_bytes(video).local_path() as path:
+        process = subprocess.Popen(
+            ["ffmpeg", "-v", "error", "-i", path, "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        analyzer = AudioAnalyzer()
+        pending = b""
+        try:
+            while True:
+                block = process.stdout.read(READ_BLOCK_BYTES)
+                if not block:
+                    break
+                block, pending = pending + block, b""
+                if len(block) % 2:
+                    block, pending = block[:-1], block[-1:]
+                analyzer.feed(np.frombuffer(block, dtype="<i2").astype(np.float32) / 32768.0)
+        finally:
+            process.stdout.close()
+            stderr = process.stderr.read().decode("utf-8", "replace")
+            process.stderr.close()
+            process.wait()
+    if process.returncode != 0:
+        # No audio stream is not an error – the clip is silent.
+        if "does not contain any stream" in stderr or "matches no streams" in stderr:
+            return AudioFeatures(has_audio=False)
+        return None
+    return analyzer.result()
+
+
+def summarize_audio(features: Dict[str, Any]) -> str:
+    """One-line summary of measured audio features (for prompts and projections)."""
+    if not features.get("has_audio"):
+        return "no audio track"
+    if features.get("content_type") == "silence":
+        return "silent audio track"
+    parts = [features.get("content_type") or "audio"]
+    rhythmic = features.get("content_type") in ("music", "speech_over_music")
+    if rhythmic and features.get("bpm") and (features.get("bpm_confidence") or 0) >= MIN_BPM_CONFIDENCE:
+        parts.append(f"~{features['bpm']:g} BPM")
+    if features.get("loudness_db") is not None:
+        parts.append(f"loudness {features['loudness_db']:g} dBFS (hook {features.get('hook_loudness_db'):g} dBFS)")
+    if features.get("onset_density") is not None:
+        parts.append(f"{features['onset_density']:g} onsets/s (hook {features.get('hook_onset_density'):g}/s)")
+    if features.get("silence_ratio"):
+        parts.append(f"{round(features['silence_ratio'] * 100)}% silence")
+    return ", ".join(parts)
@@ -0,0 +1,78 @@
+"""
+Service: Engagement API
+FastAPI routes to feed real post outcomes into the engagement model and to rank captions with it.
+
+    POST /engagement/outcomes → ingest likes/comments/shares/saves/reach of a published post
+                                (features given explicitly or taken from the run log of `session_id`;
+                                a repeated session_id + platform replaces the earlier numbers)
+    POST /engagement/rank     → candidate captions ranked by predicted engagement rate
+    GET  /engagement/stats    → observations, progressive-validation MAE, feature count
+"""
+
+import asyncio
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from root_agent.callbacks.engagement_prediction import post_features
+from root_agent.services.engagement_model import PostFeatures, get_engagement_model
+from root_agent.services.run_log import read_run_log, run_log_path, state_at_end
+
+
+_SESSION_ID_PATTERN = re.compile(r"^[\w-]+$")
+
+
+class OutcomeRequest(BaseModel):
+    """Request body for POST /engagement/outcomes."""
+    session_id: Optional[str] = Field(default=None, description="Run that produced the post (its final draft supplies the features).")
+    platform: Optional[str] = Field(default=None, description="Platform key of the draft in a multi-platform run.")
+    features: Optional[PostFeatures] = Field(default=None, description="Explicit features (instead of session_id).")
+    likes: int = Field(ge=0)
+    comments: int = Field(ge=0)
+    shares: int = Field(ge=0)
+    saves: int = Field(ge=0)
+    reach: int = Field(gt=0)
+
+
+class RankRequest(BaseModel):
+    """Request body for POST /engagement/rank."""
+    candidates: List[PostFeatures] = Field(min_length=1)
+
+
+def create_engagement_router() -> APIRouter:
+    """Creates the /engagement routes."""
+    router = APIRouter(prefix="/engagement", tags=["engagement"])
+
+    @router.post("/outcomes")
+    async def ingest(request: OutcomeRequest) -> Dict[str, Any]:
+        features = request.features
+        if features is None:
+            session_id = request.session_id or ""
+            if not _SESSION_ID_PATTERN.match(session_id) or not os.path.exists(run_log_path(session_id)):
+                raise HTTPException(status_code=422, detail="Either features or the session_id of a logged run is required.")
+            state = await asyncio.to_thread(lambda: state_at_end(read_run_log(session_id)))
+            features = post_features(state, request.platform)
+            if features is None:
+                raise HTTPException(status_code=422, detail="The run has no draft for this platform.")
+        # A repeated outcome retrains the model on every observation, so keep it off the event loop.
+        observation = await asyncio.to_thread(
+            get_engagement_model().ingest,
+            features, request.likes, request.comments, request.shares, request.saves, request.reach,
+            session_id=request.session_id,
+        )
+        return observation.model_dump()
+
+    @router.post("/rank")
+    async def rank(request: RankRequest) -> List[Dict[str, Any]]:
+        return [
+            {"index": index, **prediction.model_dump()}
+            for index, prediction in get_engagement_model().rank(request.candidates)
+        ]
+
+    @router.get("/stats")
+    async def stats() -> Dict[str, Any]:
+        return get_engagement_model().stats()
+
+    return router
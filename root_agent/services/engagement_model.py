@@ -0,0 +1,318 @@
+"""
+Service: Engagement Model
+Small online regression model that predicts a post's weighted engagement rate (as computed by
+`calculate_engagement`) from features the pipeline already produces, and learns from every
+ingested real post outcome.
+
+- Features: hook type, scene cadence (scene length, visual frequency, measured audio onsets),
+  the hashtag set, caption length and the target platform – a sparse dict of a few dozen entries.
+- Model: linear regression on log(1 + rate), trained one observation at a time with AdaGrad
+  and L2 regularization. Predicting is a dot product over the sparse features (microseconds),
+  so it can rank candidate captions before any LLM evaluation.
+- Storage: SQLite (<AGENT_DATA_DIR>/engagement.sqlite3). engagement_observations keeps every
+  ingested outcome with the prediction made right before learning from it (progressive
+  validation – the mean absolute error over these is an honest out-of-sample error);
+  engagement_weights holds the current weights. A run has at most one observation per platform:
+  reporting (session_id, platform) again replaces the stored numbers and retrains from scratch,
+  so updated counts of the same post are not learned twice.
+
+With few observations the prediction is close to the average rate seen so far; check
+`stats()["observations"]` before trusting it.
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from root_agent.services.paths import data_path
+from root_agent.tools.engagement import calculate_engagement
+
+
+ENGAGEMENT_MODEL_ENABLED = os.getenv("ENGAGEMENT_MODEL_ENABLED", "true").lower() not in ("0", "false", "no")
+ENGAGEMENT_LEARNING_RATE = float(os.getenv("ENGAGEMENT_LEARNING_RATE", "0.1"))
+ENGAGEMENT_L2 = float(os.getenv("ENGAGEMENT_L2", "0.0001"))
+
+HOOK_TYPES = ("question", "shock", "curiosity", "statement", "visual")
+REFERENCE_CAPTION_LENGTH = 280
+# Onsets per second at which the audio counts as "busy" (feature value 1.0).
+REFERENCE_ONSET_DENSITY = 5.0
+
+_FAST_PATTERN = re.compile(r"\b(fast|quick|rapid|jump|snappy|high)\b")
+_SLOW_PATTERN = re.compile(r"\b(long|slow|static|low|single)\b")
+
+
+class PostFeatures(BaseModel):
+    """Model input: what the pipeline knows about a post before it is published."""
+    hook_type: str = Field(default="", description="Schema extraction hook type (free text).")
+    scene_length: str = Field(default="", description="Schema extraction scene length (free text).")
+    visual_frequency: str = Field(default="", description="Schema extraction visual frequency (free text).")
+    onset_density: Optional[float] = Field(default=None, description="Measured audio onsets per second.")
+    hashtags: List[str] = Field(default_factory=list)
+    caption: str = ""
+    platform: Optional[str] = None
+
+
+class EngagementPrediction(BaseModel):
+    rate: float
+    assessment: str
+    observations: int
+
+
+class EngagementObservation(BaseModel):
+    id: int
+    rate: float
+    predicted_rate: float
+    observed_at: float
+    replaced: bool = False
+
+
+def normalize_hook_type(hook_type: str) -> str:
+    text = (hook_type or "").lower()
+    return next((hook for hook in HOOK_TYPES if hook in text), "other")
+
+
+def _cadence(text: str) -> str:
+    text = (text or "").lower()
+    fast, slow = bool(_FAST_PATTERN.search(text)), bool(_SLOW_PATTERN.search(text))
+    if fast == slow:
+        return "mixed"
+    return "fast" if fast else "slow"
+
+
+def featurize(features: PostFeatures) -> Dict[str, float]:
+    """Sparse feature dict (name → value) for the linear model."""
+    vector = {
+        "bias": 1.0,
+        f"hook={normalize_hook_type(features.hook_type)}": 1.0,
+        f"scene={_cadence(features.scene_length)}": 1.0,
+        f"visual={_cadence(features.visual_frequency)}": 1.0,
+    }
+    if features.onset_density is not None:
+        vector["onset_density"] = min(features.onset_density / REFERENCE_ONSET_DENSITY, 2.0)
+
+    tags = sorted({"#" + tag.strip().lstrip("#").lower() for tag in features.hashtags if tag.strip("# ")})
+    for tag in tags:
+        # 1/√n keeps the hashtag block's total weight independent of the number of hashtags.
+        vector[f"tag={tag}"] = 1 / math.sqrt(len(tags))
+    vector["hashtag_count"] = len(tags) / 10
+
+    length = len(features.caption or "")
+    vector["caption_length"] = min(length / REFERENCE_CAPTION_LENGTH, 2.0)
+    vector[f"caption={'short' if length < 80 else 'medium' if length < 160 else 'long'}"] = 1.0
+
+    if features.platform:
+        vector[f"platform={features.platform}"] = 1.0
+        vector[f"platform={features.platform}|hook={normalize_hook_type(features.hook_type)}"] = 1.0
+    return vector
+
+
+def assess(rate: float) -> str:
+    """Same thresholds as calculate_engagement."""
+    if rate > 10:
+        return "Viral Potential! 🔥"
+    if rate > 5:
+        return "Good Performance 👍"
+    return "Needs Optimization"
+
+
+class EngagementModel:
+    """Online linear regression over sparse post features, persisted in SQLite. Thread-safe."""
+
+    def __init__(self, path: Optional[str] = None, learning_rate: float = ENGAGEMENT_LEARNING_RATE,
+                 l2: float = ENGAGEMENT_L2):
+        self.path = path or data_path("engagement.sqlite3")
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        # Reentrant: ingest holds it across learn/replay so a repeated outcome cannot be learned twice.
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS engagement_observations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT,
+                platform TEXT,
+                features TEXT NOT NULL,
+                likes INTEGER NOT NULL,
+                comments INTEGER NOT NULL,
+                shares INTEGER NOT NULL,
+                saves INTEGER NOT NULL,
+                reach INTEGER NOT NULL,
+                rate REAL NOT NULL,
+                predicted_rate REAL NOT NULL,
+                observed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS engagement_weights (
+                feature TEXT PRIMARY KEY,
+                weight REAL NOT NULL,
+                grad_sq REAL NOT NULL
+            );
+            """
+        )
+        # Keep the latest outcome per (session_id, platform) from stores created before the unique key.
+        duplicates = self._conn.execute(
+            """
+            DELETE FROM engagement_observations WHERE session_id IS NOT NULL AND id NOT IN (
+                SELECT MAX(id) FROM engagement_observations WHERE session_id IS NOT NULL
+                GROUP BY session_id, COALESCE(platform, '')
+            )
+            """
+        ).rowcount
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS engagement_observations_post ON engagement_observations "
+            "(session_id, COALESCE(platform, '')) WHERE session_id IS NOT NULL"
+        )
+        # feature → [weight, sum of squared gradients]
+        self._weights: Dict[str, List[float]] = {
+            row["feature"]: [row["weight"], row["grad_sq"]]
+            for row in self._conn.execute("SELECT feature, weight, grad_sq FROM engagement_weights")
+        }
+        self._observations = self._conn.execute("SELECT COUNT(*) FROM engagement_observations").fetchone()[0]
+        if duplicates:
+            self.replay()
+
+    def _score(self, vector: Dict[str, float]) -> float:
+        weights = self._weights
+        return sum(weights[name][0] * value for name, value in vector.items() if name in weights)
+
+    def predict(self, features: PostFeatures) -> EngagementPrediction:
+        rate = round(max(math.expm1(self._score(featurize(features))), 0.0), 2)
+        return EngagementPrediction(rate=rate, assessment=assess(rate), observations=self._observations)
+
+    def rank(self, candidates: Iterable[PostFeatures]) -> List[Tuple[int, EngagementPrediction]]:
+        """(index, prediction) of every candidate, best predicted engagement first."""
+        scored = [(index, self.predict(candidate)) for index, candidate in enumerate(candidates)]
+        scored.sort(key=lambda item: item[1].rate, reverse=True)
+        return scored
+
+    def _step(self, weights: Dict[str, List[float]], vector: Dict[str, float], target: float) -> float:
+        """One AdaGrad step on `weights` (in place); returns the score before the step."""
+        score = sum(weights[name][0] * value for name, value in vector.items() if name in weights)
+        error = score - target
+        for name, value in vector.items():
+            weight, grad_sq = weights.get(name, (0.0, 0.0))
+            gradient = error * value + self.l2 * weight
+            grad_sq += gradient * gradient
+            weight -= self.learning_rate * gradient / (math.sqrt(grad_sq) + 1e-8)
+            weights[name] = [weight, grad_sq]
+        return score
+
+    def learn(self, features: PostFeatures, rate: float) -> float:
+        """One AdaGrad step towards the observed rate; returns the rate predicted before the step."""
+        vector = featurize(features)
+        with self._lock:
+            score = self._step(self._weights, vector, math.log1p(max(rate, 0.0)))
+            self._conn.executemany(
+                """
+                INSERT INTO engagement_weights (feature, weight, grad_sq) VALUES (?, ?, ?)
+                ON CONFLICT (feature) DO UPDATE SET weight = excluded.weight, grad_sq = excluded.grad_sq
+                """,
+                [(name, *self._weights[name]) for name in vector],
+            )
+        return round(max(math.expm1(score), 0.0), 2)
+
+    def ingest(self, features: PostFeatures, likes: int, comments: int, shares: int, saves: int, reach: int,
+               session_id: Optional[str] = None) -> EngagementObservation:
+        """
+        Records a real post outcome and learns from it.
+
+        A repeated outcome for the same session_id and platform (e.g. updated numbers a week later)
+        replaces the stored one and retrains the weights via replay() instead of learning it again.
+        It keeps the original predicted_rate, the only prediction made before the model saw the post.
+        """
+        if reach <= 0:
+            raise ValueError("Reach must be positive.")
+        rate = calculate_engagement(likes, comments, shares, saves, reach)["rate"]
+        observed_at = time.time()
+        with self._lock:
+            existing = None
+            if session_id is not None:
+                existing = self._conn.execute(
+                    "SELECT id, predicted_rate FROM engagement_observations "
+                    "WHERE session_id = ? AND COALESCE(platform, '') = ?",
+                    (session_id, features.platform or ""),
+                ).fetchone()
+            if existing is not None:
+                self._conn.execute(
+                    """
+                    UPDATE engagement_observations SET features = ?, likes = ?, comments = ?, shares = ?, saves = ?,
+                        reach = ?, rate = ?, observed_at = ?
+                    WHERE id = ?
+                    """,
+                    (features.model_dump_json(), likes, comments, shares, saves, reach, rate, observed_at,
+                     existing["id"]),
+                )
+                self.replay()
+                return EngagementObservation(id=existing["id"], rate=rate, predicted_rate=existing["predicted_rate"],
+                                             observed_at=observed_at, replaced=True)
+            predicted_rate = self.learn(features, rate)
+            cursor = self._conn.execute(
+                """
+                INSERT INTO engagement_observations
+                    (session_id, platform, features, likes, comments, shares, saves, reach, rate, predicted_rate, observed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (session_id, features.platform, features.model_dump_json(), likes, comments, shares, saves, reach,
+                 rate, predicted_rate, observed_at),
+            )
+            self._observations += 1
+        return EngagementObservation(id=cursor.lastrowid, rate=rate, predicted_rate=predicted_rate, observed_at=observed_at)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Observation count and progressive-validation error (mean absolute error in rate points)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS observations, AVG(ABS(rate - predicted_rate)) AS mae, AVG(rate) AS mean_rate "
+                "FROM engagement_observations"
+            ).fetchone()
+        return {
+            "observations": row["observations"],
+            "mae": round(row["mae"], 3) if row["mae"] is not None else None,
+            "mean_rate": round(row["mean_rate"], 3) if row["mean_rate"] is not None else None,
+            "features": len(self._weights),
+        }
+
+    def replay(self) -> int:
+        """
+        Retrains the weights from scratch on all stored observations (e.g. after changing the features).
+
+        Trains in memory and writes the weights in one transaction; predictions keep using the old
+        weights until the new ones are swapped in.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT features, rate FROM engagement_observations ORDER BY id").fetchall()
+            weights: Dict[str, List[float]] = {}
+            for row in rows:
+                vector = featurize(PostFeatures.model_validate(json.loads(row["features"])))
+                self._step(weights, vector, math.log1p(max(row["rate"], 0.0)))
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM engagement_weights")
+                self._conn.executemany(
+                    "INSERT INTO engagement_weights (feature, weight, grad_sq) VALUES (?, ?, ?)",
+                    [(name, weight, grad_sq) for name, (weight, grad_sq) in weights.items()],
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self._weights = weights
+        return len(rows)
+
+_model: Optional[EngagementModel] = None
+
+
+def get_engagement_model() -> EngagementModel:
+    """Process-wide model (loaded on first use)."""
+    global _model
+    if _model is None:
+        _model = EngagementModel()
+    return _model
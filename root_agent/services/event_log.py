@@ -0,0 +1,191 @@
+"""
+Service: Run Event Log
+Append-only, gzip-compressed JSONL log per session that records every ADK event, model call,
+tool call, state delta and timing of a run. Finished runs can be replayed without re-executing them.
+
+The log files themselves (location, writer, readers) are handled by services/run_log.py.
+
+Record types (every record has 'type', 'ts' and 'invocation_id'):
+  run_start / run_end        – user message summary / total duration
+  agent_start / agent_end    – agent name / duration
+  model_request / model_response / model_error – model, latency, token usage
+  tool_call / tool_result / tool_error         – tool name, args, result, latency
+  event                      – author, text parts, function calls/responses, state delta
+"""
+
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+from root_agent.services.memory_profile import MEMORY_PROFILE
+from root_agent.services.run_export import RUN_EXPORT_ENABLED, run_export_available
+from root_agent.services.run_log import RunLogWriter
+
+
+EVENT_LOG_ENABLED = os.getenv("EVENT_LOG_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def summarize_parts(content: Optional[types.Content]) -> Dict[str, Any]:
+    """Text, function calls/responses of a content; binary data is reduced to mime type and size."""
+    summary: Dict[str, Any] = {"text_parts": [], "function_calls": [], "function_responses": [], "blobs": []}
+    for part in (content.parts if content and content.parts else []):
+        if part.text and not part.thought:
+            summary["text_parts"].append(part.text)
+        if part.function_call:
+            summary["function_calls"].append({"name": part.function_call.name, "args": part.function_call.args})
+        if part.function_response:
+            summary["function_responses"].append({"name": part.function_response.name, "response": part.function_response.response})
+        if part.inline_data:
+            summary["blobs"].append({"mime_type": part.inline_data.mime_type, "size": len(part.inline_data.data or b"")})
+    return {key: value for key, value in summary.items() if value}
+
+
+class EventLogPlugin(BasePlugin):
+    """Runner plugin that writes every run to its session's event log."""
+
+    def __init__(self, name: str = "event_log"):
+        super().__init__(name=name)
+        self._writers: Dict[str, RunLogWriter] = {}
+        self._started: Dict[tuple, float] = {}
+
+    def _write(self, invocation_id: str, record_type: str, **fields: Any) -> None:
+        writer = self._writers.get(invocation_id)
+        if writer is not None:
+            writer.write({"type": record_type, "ts": time.time(), "invocation_id": invocation_id, **fields})
+
+    def _start(self, *key: Any) -> None:
+        self._started[key] = time.monotonic()
+
+    def _elapsed_ms(self, *key: Any) -> Optional[float]:
+        started = self._started.pop(key, None)
+        return round((time.monotonic() - started) * 1000, 1) if started is not None else None
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> Optional[types.Content]:
+        invocation_id = invocation_context.invocation_id
+        self._writers[invocation_id] = RunLogWriter(invocation_context.session.id)
+        self._start(invocation_id)
+        self._write(
+            invocation_id, "run_start",
+            session_id=invocation_context.session.id,
+            user_id=invocation_context.user_id,
+            app_name=invocation_context.app_name,
+            user_message=summarize_parts(invocation_context.user_content),
+        )
+        return None
+
+    async def on_event_callback(self, *, invocation_context: InvocationContext, event: Event) -> Optional[Event]:
+        if event.partial:
+            return None
+        self._write(
+            invocation_context.invocation_id, "event",
+            event_id=event.id,
+            author=event.author,
+            branch=event.branch,
+            event_ts=event.timestamp,
+            state_delta=event.actions.state_delta or None,
+            escalate=event.actions.escalate or None,
+            **summarize_parts(event.content),
+        )
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        invocation_id = invocation_context.invocation_id
+        self._write(invocation_id, "run_end", duration_ms=self._elapsed_ms(invocation_id))
+        writer = self._writers.pop(invocation_id, None)
+        if writer is not None:
+            writer.close()
+
+    async def before_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> Optional[types.Content]:
+        self._start(callback_context.invocation_id, "agent", agent.name)
+        self._write(callback_context.invocation_id, "agent_start", agent=agent.name)
+        return None
+
+    async def after_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> Optional[types.Content]:
+        duration_ms = self._elapsed_ms(callback_context.invocation_id, "agent", agent.name)
+        self._write(callback_context.invocation_id, "agent_end", agent=agent.name, duration_ms=duration_ms)
+        return None
+
+    async def before_model_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        self._start(callback_context.invocation_id, "model", callback_context.agent_name)
+        self._write(
+            callback_context.invocation_id, "model_request",
+            agent=callback_context.agent_name,
+            model=llm_request.model,
+            contents=len(llm_request.contents),
+            cached_content=llm_request.config.cached_content if llm_request.config else None,
+        )
+        return None
+
+    async def after_model_callback(self, *, callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        usage = llm_response.usage_metadata
+        self._write(
+            callback_context.invocation_id, "model_response",
+            agent=callback_context.agent_name,
+            duration_ms=self._elapsed_ms(callback_context.invocation_id, "model", callback_context.agent_name),
+            prompt_tokens=usage.prompt_token_count if usage else None,
+            cached_tokens=usage.cached_content_token_count if usage else None,
+            output_tokens=usage.candidates_token_count if usage else None,
+            finish_reason=llm_response.finish_reason,
+            error_code=llm_response.error_code,
+        )
+        return None
+
+    async def on_model_error_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception) -> Optional[LlmResponse]:
+        self._write(
+            callback_context.invocation_id, "model_error",
+            agent=callback_context.agent_name,
+            model=llm_request.model,
+            duration_ms=self._elapsed_ms(callback_context.invocation_id, "model", callback_context.agent_name),
+            error=f"{type(error).__name__}: {error}",
+        )
+        return None
+
+    async def before_tool_callback(self, *, tool: BaseTool, tool_args: Dict[str, Any], tool_context: ToolContext) -> Optional[dict]:
+        self._start(tool_context.invocation_id, "tool", tool_context.function_call_id)
+        self._write(tool_context.invocation_id, "tool_call", agent=tool_context.agent_name, tool=tool.name, args=tool_args)
+        return None
+
+    async def after_tool_callback(self, *, tool: BaseTool, tool_args: Dict[str, Any], tool_context: ToolContext, result: dict) -> Optional[dict]:
+        self._write(
+            tool_context.invocation_id, "tool_result",
+            agent=tool_context.agent_name,
+            tool=tool.name,
+            result=result,
+            duration_ms=self._elapsed_ms(tool_context.invocation_id, "tool", tool_context.function_call_id),
+        )
+        return None
+
+    async def on_tool_error_callback(self, *, tool: BaseTool, tool_args: Dict[str, Any], tool_context: ToolContext, error: Exception) -> Optional[dict]:
+        self._write(
+            tool_context.invocation_id, "tool_error",
+            agent=tool_context.agent_name,
+            tool=tool.name,
+            error=f"{type(error).__name__}: {error}",
+            duration_ms=self._elapsed_ms(tool_context.invocation_id, "tool", tool_context.function_call_id),
+        )
+        return None
+
+
+def default_plugins() -> List[BasePlugin]:
+    """Plugins attached to every Runner of the app."""
+    plugins: List[BasePlugin] = [EventLogPlugin()] if EVENT_LOG_ENABLED else []
+    if MEMORY_PROFILE:
+        from root_agent.services.memory_plugin import MemoryProfilePlugin
+
+        plugins.append(MemoryProfilePlugin())
+    if RUN_EXPORT_ENABLED and run_export_available():
+        from root_agent.services.export_plugin import RunExportPlugin
+
+        plugins.append(RunExportPlugin())
+    return plugins
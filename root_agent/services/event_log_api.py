@@ -0,0 +1,34 @@
+"""
+Service: Run Event Log API
+FastAPI routes to browse and replay the event logs of finished (or running) pipeline runs.
+
+    GET /runs               → most recent run logs [{session_id, modified_at, size}]
+    GET /runs/{session_id}  → all records of one run (404 if there is no log)
+"""
+
+import os
+import re
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException
+from root_agent.services.run_log import list_run_logs, read_run_log, run_log_path
+
+
+_SESSION_ID_PATTERN = re.compile(r"^[\w-]+$")
+
+
+def create_event_log_router() -> APIRouter:
+    """Creates the /runs routes."""
+    router = APIRouter(prefix="/runs", tags=["runs"])
+
+    @router.get("")
+    async def list_runs(limit: int = 50) -> List[Dict[str, Any]]:
+        return list_run_logs(limit=limit)
+
+    @router.get("/{session_id}")
+    async def get_run(session_id: str) -> List[Dict[str, Any]]:
+        if not _SESSION_ID_PATTERN.match(session_id) or not os.path.exists(run_log_path(session_id)):
+            raise HTTPException(status_code=404, detail="Run log not found")
+        return read_run_log(session_id)
+
+    return router
@@ -0,0 +1,203 @@
+"""
+Service: Example Index
+In-process vector index over approved Creator outputs and the insights they were written for.
+
+- Every approved run adds one example (insights projection + approved creative output + rating).
+- Retrieval embeds the current insights and returns the top-k most similar approved examples
+  (cosine similarity, brute force over a NumPy matrix – exact and fast for tens of thousands of rows).
+- Storage is append-only: <AGENT_DATA_DIR>/examples/<embedder>.f32 holds the raw float32 vectors,
+  <embedder>.jsonl the metadata of the same rows. Inserts append to both files, nothing is rewritten.
+
+Embeddings come from the Gemini embedding API (EMBEDDING_MODEL). EMBEDDING_MODEL=hashing uses a
+local feature-hashing embedder instead (no API calls, lexical similarity only); offline test runs
+switch to it with use_embedder. Every embedder has its own files, so vectors of different models
+are never compared.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from pydantic import BaseModel
+from root_agent.services.paths import data_path
+from root_agent.services.rate_limit import rate_limiter
+
+
+EXAMPLE_INDEX_ENABLED = os.getenv("EXAMPLE_INDEX_ENABLED", "true").lower() not in ("0", "false", "no")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "gemini-embedding-001")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "768"))
+HASHING_EMBEDDER = "hashing"
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_client = None
+_embedder = EMBEDDING_MODEL
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        from google import genai
+        _client = genai.Client()
+    return _client
+
+
+def _normalize(vectors):
+    import numpy as np
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+
+def hashing_embedding(texts: List[str], dim: int = EMBEDDING_DIM):
+    """Feature-hashing embedding over unigrams and bigrams (signed buckets, L2-normalized)."""
+    import numpy as np
+
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+            vectors[row, digest % dim] += 1.0 if digest >> 63 else -1.0
+    return _normalize(vectors)
+
+
+def use_embedder(name: str) -> None:
+    """Switches the process to another embedder (before the index is first used)."""
+    global _embedder
+    _embedder = name
+
+
+async def embed_texts(texts: List[str], model: Optional[str] = None, dim: int = EMBEDDING_DIM):
+    """Embeds `texts` into an (n, dim) float32 matrix with unit-length rows (default: the configured embedder)."""
+    import numpy as np
+
+    model = model or _embedder
+    if model == HASHING_EMBEDDER:
+        return hashing_embedding(texts, dim)
+    await rate_limiter.acquire(model)
+    response = await _get_client().aio.models.embed_content(
+        model=model,
+        contents=texts,
+        config={"output_dimensionality": dim},
+    )
+    return _normalize(np.array([embedding.values for embedding in response.embeddings], dtype=np.float32))
+
+
+class Example(BaseModel):
+    """One approved Creator output."""
+    id: str
+    created_at: float
+    platform: Optional[str] = None
+    insights: str
+    creative_output: str
+    rating: Optional[int] = None
+
+
+class ScoredExample(BaseModel):
+    example: Example
+    score: float
+
+
+class ExampleIndex:
+    """Append-only vector index with exact cosine search. Thread-safe."""
+
+    def __init__(self, name: Optional[str] = None, dim: int = EMBEDDING_DIM):
+        import numpy as np
+
+        name = name or _embedder
+        slug = re.sub(r"[^\w.-]", "_", name)
+        self.dim = dim
+        self.vectors_path = data_path("examples", f"{slug}-{dim}.f32")
+        self.meta_path = data_path("examples", f"{slug}-{dim}.jsonl")
+        self._lock = threading.Lock()
+
+        examples: List[Example] = []
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        examples.append(Example.model_validate_json(line))
+                    except ValueError:
+                        break
+        vectors = np.fromfile(self.vectors_path, dtype=np.float32) if os.path.exists(self.vectors_path) else np.zeros(0, np.float32)
+        vectors = vectors[: len(vectors) // dim * dim].reshape(-1, dim)
+        # A crash between the two appends leaves one file a row ahead – keep the common prefix.
+        count = min(len(examples), len(vectors))
+        self._examples = examples[:count]
+        self._matrix = np.zeros((max(count * 2, 64), dim), dtype=np.float32)
+        self._matrix[:count] = vectors[:count]
+        self._fingerprints = {self._fingerprint(example.creative_output) for example in self._examples}
+        if count < len(examples) or count < len(vectors):
+            self._rewrite()
+
+    @staticmethod
+    def _fingerprint(text: str) -> str:
+        return hashlib.sha256(" ".join(text.split()).lower().encode("utf-8")).hexdigest()
+
+    def _rewrite(self) -> None:
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            f.writelines(example.model_dump_json() + "\n" for example in self._examples)
+        self._matrix[: len(self._examples)].tofile(self.vectors_path)
+
+    def add(self, vector, insights: str, creative_output: str, platform: Optional[str] = None,
+            rating: Optional[int] = None) -> Optional[Example]:
+        """Appends one example (skipped if the same output is already indexed)."""
+        import numpy as np
+
+        fingerprint = self._fingerprint(creative_output)
+        example = Example(id=str(uuid.uuid4()), created_at=time.time(), platform=platform,
+                          insights=insights, creative_output=creative_output, rating=rating)
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            if fingerprint in self._fingerprints:
+                return None
+            count = len(self._examples)
+            if count == len(self._matrix):
+                grown = np.zeros((len(self._matrix) * 2, self.dim), dtype=np.float32)
+                grown[:count] = self._matrix[:count]
+                self._matrix = grown
+            self._matrix[count] = vector
+            self._examples.append(example)
+            self._fingerprints.add(fingerprint)
+            with open(self.vectors_path, "ab") as f:
+                f.write(vector.tobytes())
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                f.write(example.model_dump_json() + "\n")
+        return example
+
+    def search(self, vector, k: int = 3, platform: Optional[str] = None, min_score: float = 0.0) -> List[ScoredExample]:
+        """Top-k examples by cosine similarity (optionally restricted to one platform)."""
+        import numpy as np
+
+        query = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            count = len(self._examples)
+            if count == 0:
+                return []
+            scores = self._matrix[:count] @ query
+            examples = list(self._examples)
+        if platform is not None:
+            mask = np.array([example.platform in (platform, None) for example in examples])
+            scores = np.where(mask, scores, -np.inf)
+        top = np.argpartition(-scores, min(k, count) - 1)[:k] if count > k else np.arange(count)
+        top = top[np.argsort(-scores[top])]
+        return [ScoredExample(example=examples[i], score=round(float(scores[i]), 4)) for i in top if scores[i] >= min_score]
+
+    def __len__(self) -> int:
+        return len(self._examples)
+
+
+_index: Optional[ExampleIndex] = None
+
+
+def get_example_index() -> ExampleIndex:
+    """Process-wide index for the configured embedder (loaded on first use)."""
+    global _index
+    if _index is None:
+        _index = ExampleIndex()
+    return _index
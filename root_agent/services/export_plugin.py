@@ -0,0 +1,88 @@
+"""
+Service: Run Export Plugin
+Runner plugin that hands every finished run to the columnar export (services/run_export.py).
+
+Collects per invocation what the session state does not hold – user message, agent durations,
+model calls and token usage – and at the end of the run adds a RunSummary with the final state
+to the process-wide RunExporter, which writes it in the next batch.
+
+Only attached when RUN_EXPORT_ENABLED is set and pyarrow is installed (see
+services/event_log.default_plugins).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+from root_agent.services.run_export import RunSummary, get_run_exporter
+
+
+logger = logging.getLogger(__name__)
+
+
+class RunExportPlugin(BasePlugin):
+    """Runner plugin that exports every finished run as flat analytics rows."""
+
+    def __init__(self, name: str = "run_export"):
+        super().__init__(name=name)
+        self._runs: Dict[str, RunSummary] = {}
+        self._started: Dict[tuple, float] = {}
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> Optional[types.Content]:
+        content = invocation_context.user_content
+        self._started[(invocation_context.invocation_id,)] = time.monotonic()
+        self._runs[invocation_context.invocation_id] = RunSummary(
+            session_id=invocation_context.session.id,
+            user_id=invocation_context.user_id,
+            started_at=time.time(),
+            user_text="\n".join(part.text for part in (content.parts if content and content.parts else []) if part.text),
+        )
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        invocation_id = invocation_context.invocation_id
+        summary = self._runs.pop(invocation_id, None)
+        started = self._started.pop((invocation_id,), None)
+        if summary is None:
+            return
+        summary.duration_ms = round((time.monotonic() - started) * 1000, 1) if started is not None else None
+        summary.state = dict(invocation_context.session.state)
+        try:
+            exporter = get_run_exporter()
+            if exporter.add(summary):
+                # Parquet encoding and file I/O must not block the event loop.
+                await asyncio.to_thread(exporter.flush)
+        except Exception:
+            # Analytics must never fail a run.
+            logger.exception("Run export failed for session %s", summary.session_id)
+
+    async def before_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> Optional[types.Content]:
+        self._started[(callback_context.invocation_id, agent.name)] = time.monotonic()
+        return None
+
+    async def after_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> Optional[types.Content]:
+        started = self._started.pop((callback_context.invocation_id, agent.name), None)
+        summary = self._runs.get(callback_context.invocation_id)
+        if summary is not None and started is not None:
+            elapsed = round((time.monotonic() - started) * 1000, 1)
+            summary.agent_ms[agent.name] = summary.agent_ms.get(agent.name, 0.0) + elapsed
+        return None
+
+    async def after_model_callback(self, *, callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        summary = self._runs.get(callback_context.invocation_id)
+        if summary is None or llm_response.partial:
+            return None
+        usage = llm_response.usage_metadata
+        summary.model_calls += 1
+        if usage:
+            summary.prompt_tokens += usage.prompt_token_count or 0
+            summary.cached_tokens += usage.cached_content_token_count or 0
+            summary.output_tokens += usage.candidates_token_count or 0
+        return None
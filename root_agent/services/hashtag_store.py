@@ -0,0 +1,194 @@
+"""
+Service: Hashtag Knowledge Base
+SQLite store of hashtag verifications and outcomes, so the Evaluator does not re-search the
+same niche hashtags on every run and the Creator can start from pre-vetted hashtags.
+
+Tables:
+  hashtag_verifications – every search result (hashtag, TRENDING/OUTDATED/NOT FOUND, niche, timestamp)
+  hashtag_outcomes      – per hashtag: uses in final drafts, approvals, sum of Evaluator ratings
+  hashtag_keywords      – inverted index niche keyword → hashtag (weight = approved uses)
+
+A verification is "fresh" for HASHTAG_VERIFICATION_TTL_HOURS; within that window the latest
+result is served from the store instead of a new google_search call.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+from root_agent.services.paths import data_path
+
+
+HASHTAG_STORE_ENABLED = os.getenv("HASHTAG_STORE_ENABLED", "true").lower() not in ("0", "false", "no")
+HASHTAG_VERIFICATION_TTL_HOURS = float(os.getenv("HASHTAG_VERIFICATION_TTL_HOURS", "72"))
+VERIFICATION_STATUSES = ("TRENDING", "OUTDATED", "NOT FOUND")
+
+
+def normalize_hashtag(hashtag: str) -> str:
+    return "#" + hashtag.strip().lstrip("#").lower()
+
+
+class HashtagVerification(BaseModel):
+    """Latest verification of a hashtag."""
+    hashtag: str
+    status: str
+    niche: str = ""
+    verified_at: float
+
+
+class HashtagSuggestion(BaseModel):
+    """A pre-vetted hashtag for the current niche."""
+    hashtag: str
+    score: float
+    approvals: int
+    uses: int
+    avg_rating: Optional[float] = None
+    status: str
+    verified_at: float
+
+
+class HashtagStore:
+    """Hashtag verifications, outcomes and the keyword index in SQLite. Thread-safe."""
+
+    def __init__(self, path: Optional[str] = None, ttl_hours: float = HASHTAG_VERIFICATION_TTL_HOURS):
+        self.path = path or data_path("hashtags.sqlite3")
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS hashtag_verifications (
+                hashtag TEXT NOT NULL,
+                status TEXT NOT NULL,
+                niche TEXT NOT NULL DEFAULT '',
+                verified_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS hashtag_verifications_latest ON hashtag_verifications (hashtag, verified_at DESC);
+            CREATE TABLE IF NOT EXISTS hashtag_outcomes (
+                hashtag TEXT PRIMARY KEY,
+                uses INTEGER NOT NULL DEFAULT 0,
+                approvals INTEGER NOT NULL DEFAULT 0,
+                rating_sum REAL NOT NULL DEFAULT 0,
+                rated INTEGER NOT NULL DEFAULT 0,
+                last_used_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS hashtag_keywords (
+                keyword TEXT NOT NULL,
+                hashtag TEXT NOT NULL,
+                weight INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (keyword, hashtag)
+            );
+            """
+        )
+
+    def record_verification(self, hashtag: str, status: str, niche: str = "") -> None:
+        status = status.upper()
+        if status not in VERIFICATION_STATUSES:
+            raise ValueError(f"Unknown verification status: {status}")
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO hashtag_verifications (hashtag, status, niche, verified_at) VALUES (?, ?, ?, ?)",
+                (normalize_hashtag(hashtag), status, niche, time.time()),
+            )
+
+    def fresh_verifications(self, hashtags: Iterable[str]) -> Dict[str, HashtagVerification]:
+        """Latest verification per hashtag, if it is younger than the TTL."""
+        tags = sorted({normalize_hashtag(hashtag) for hashtag in hashtags})
+        if not tags:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT hashtag, status, niche, MAX(verified_at) AS verified_at FROM hashtag_verifications
+                WHERE hashtag IN ({",".join("?" * len(tags))}) AND verified_at >= ?
+                GROUP BY hashtag
+                """,
+                (*tags, time.time() - self.ttl_seconds),
+            ).fetchall()
+        return {row["hashtag"]: HashtagVerification(**dict(row)) for row in rows}
+
+    def record_outcome(self, hashtags: Iterable[str], keywords: Iterable[str], approved: bool, rating: Optional[int] = None) -> None:
+        """Records the final draft's hashtags; approved drafts also strengthen the keyword index."""
+        tags = sorted({normalize_hashtag(hashtag) for hashtag in hashtags})
+        now = time.time()
+        with self._lock:
+            for tag in tags:
+                self._conn.execute(
+                    """
+                    INSERT INTO hashtag_outcomes (hashtag, uses, approvals, rating_sum, rated, last_used_at)
+                    VALUES (?, 1, ?, ?, ?, ?)
+                    ON CONFLICT (hashtag) DO UPDATE SET
+                        uses = uses + 1,
+                        approvals = approvals + excluded.approvals,
+                        rating_sum = rating_sum + excluded.rating_sum,
+                        rated = rated + excluded.rated,
+                        last_used_at = excluded.last_used_at
+                    """,
+                    (tag, int(approved), rating or 0, int(rating is not None), now),
+                )
+            if approved:
+                self._conn.executemany(
+                    """
+                    INSERT INTO hashtag_keywords (keyword, hashtag, weight) VALUES (?, ?, 1)
+                    ON CONFLICT (keyword, hashtag) DO UPDATE SET weight = weight + 1
+                    """,
+                    [(keyword, tag) for keyword in set(keywords) for tag in tags],
+                )
+
+    def suggest(self, keywords: Iterable[str], limit: int = 8) -> List[HashtagSuggestion]:
+        """
+        Hashtags linked to the niche keywords that were approved before and are verified TRENDING
+        within the TTL. Ranked by keyword overlap × approval rate.
+        """
+        keywords = sorted(set(keywords))
+        if not keywords:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                WITH matches AS (
+                    SELECT hashtag, SUM(weight) AS weight FROM hashtag_keywords
+                    WHERE keyword IN ({",".join("?" * len(keywords))}) GROUP BY hashtag
+                ),
+                latest AS (
+                    SELECT hashtag, status, MAX(verified_at) AS verified_at FROM hashtag_verifications
+                    WHERE hashtag IN (SELECT hashtag FROM matches) GROUP BY hashtag
+                )
+                SELECT m.hashtag, m.weight, o.uses, o.approvals, o.rating_sum, o.rated, l.status, l.verified_at
+                FROM matches m
+                JOIN hashtag_outcomes o ON o.hashtag = m.hashtag
+                JOIN latest l ON l.hashtag = m.hashtag
+                WHERE l.status = 'TRENDING' AND l.verified_at >= ?
+                """,
+                (*keywords, time.time() - self.ttl_seconds),
+            ).fetchall()
+        suggestions = [
+            HashtagSuggestion(
+                hashtag=row["hashtag"],
+                score=round(row["weight"] * row["approvals"] / max(row["uses"], 1), 3),
+                approvals=row["approvals"],
+                uses=row["uses"],
+                avg_rating=round(row["rating_sum"] / row["rated"], 1) if row["rated"] else None,
+                status=row["status"],
+                verified_at=row["verified_at"],
+            )
+            for row in rows
+        ]
+        suggestions.sort(key=lambda suggestion: suggestion.score, reverse=True)
+        return suggestions[:limit]
+
+
+_store: Optional[HashtagStore] = None
+
+
+def get_hashtag_store() -> HashtagStore:
+    """Process-wide store (created on first use)."""
+    global _store
+    if _store is None:
+        _store = HashtagStore()
+    return _store
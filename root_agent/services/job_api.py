@@ -0,0 +1,54 @@
+"""
+Service: Job API
+FastAPI routes for the job queue: enqueue a pipeline run, poll its status, fetch its result.
+
+    POST /jobs                 → {job_id, status, queue_position}
+    GET  /jobs/{job_id}        → status, attempts, error, timestamps
+    GET  /jobs/{job_id}/result → run result (409 while the job is not finished)
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from root_agent.services.job_queue import WorkerPool
+
+
+class EnqueueRequest(BaseModel):
+    """Request body for POST /jobs."""
+    user_id: str = Field(default="user", description="User the pipeline session belongs to.")
+    parts: List[Dict[str, Any]] = Field(description="Message parts in ADK JSON form (text / inline_data).", min_length=1)
+    priority: int = Field(default=0, description="Higher priorities are processed first.")
+
+
+def create_job_router(pool: WorkerPool) -> APIRouter:
+    """Creates the /jobs routes backed by the given worker pool."""
+    router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+    @router.post("")
+    async def enqueue(request: EnqueueRequest) -> Dict[str, Any]:
+        job = await pool.submit({"user_id": request.user_id, "parts": request.parts}, priority=request.priority)
+        queue_position = await asyncio.to_thread(pool.store.queue_position, job)
+        return {"job_id": job.id, "status": job.status, "queue_position": queue_position}
+
+    @router.get("/{job_id}")
+    async def status(job_id: str) -> Dict[str, Any]:
+        job = await asyncio.to_thread(pool.store.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found.")
+        response = job.model_dump(exclude={"payload", "result"})
+        if job.status == "queued":
+            response["queue_position"] = await asyncio.to_thread(pool.store.queue_position, job)
+        return response
+
+    @router.get("/{job_id}/result")
+    async def result(job_id: str) -> Dict[str, Any]:
+        job = await asyncio.to_thread(pool.store.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found.")
+        if job.status != "succeeded":
+            raise HTTPException(status_code=409, detail={"status": job.status, "error": job.error})
+        return job.result
+
+    return router
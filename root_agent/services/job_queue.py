@@ -0,0 +1,252 @@
+"""
+Service: Job Queue & Worker Pool
+SQLite-backed job queue with an asyncio worker pool that executes pipeline runs.
+
+- Jobs are persisted, so queued work survives a restart (running jobs are re-queued on startup).
+- Workers claim jobs by priority (higher first), then FIFO.
+- Concurrency is bounded by the number of workers.
+- Transient model errors (429/5xx, timeouts, connection resets) are retried with exponential backoff.
+- Store calls run in a worker thread: results and payloads can be several MB of JSON.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from root_agent.services.paths import data_path
+from root_agent.services.resilience import is_transient_error
+
+
+JOB_DB_PATH = os.getenv("JOB_DB_PATH")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", "5"))
+
+
+class Job(BaseModel):
+    """A queued pipeline run."""
+    id: str
+    status: str = Field(description="queued | running | succeeded | failed")
+    priority: int = 0
+    attempts: int = 0
+    max_attempts: int = JOB_MAX_ATTEMPTS
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float
+    not_before: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class JobStore:
+    """Persistent job table in SQLite. Thread-safe; all methods are synchronous and short."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or JOB_DB_PATH or data_path("jobs.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                not_before REAL NOT NULL DEFAULT 0,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at)")
+
+    def enqueue(self, payload: Dict[str, Any], priority: int = 0, max_attempts: int = JOB_MAX_ATTEMPTS) -> Job:
+        job = Job(id=str(uuid.uuid4()), status="queued", priority=priority, max_attempts=max_attempts,
+                  payload=payload, created_at=time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, max_attempts, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, job.status, job.priority, job.max_attempts, json.dumps(payload), job.created_at),
+            )
+        return job
+
+    def get(self, job_id: str, include_payload: bool = False) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row, include_payload) if row else None
+
+    def claim_next(self) -> Optional[Job]:
+        """Atomically marks the next due job as running and returns it."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs WHERE status = 'queued' AND not_before <= ?
+                    ORDER BY priority DESC, created_at LIMIT 1
+                )
+                RETURNING *
+                """,
+                (now, now),
+            ).fetchone()
+        return self._to_job(row, include_payload=True) if row else None
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'succeeded', result = ?, error = NULL, finished_at = ? WHERE id = ?",
+                (json.dumps(result), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str, retry_in: Optional[float] = None) -> None:
+        """Marks a job as failed, or re-queues it after `retry_in` seconds."""
+        with self._lock:
+            if retry_in is None:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    (error, time.time(), job_id),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, not_before = ? WHERE id = ?",
+                    (error, time.time() + retry_in, job_id),
+                )
+
+    def requeue_running(self, refund_attempt: bool = False) -> int:
+        """
+        Re-queues jobs left 'running' by a crashed process. Returns the number of re-queued jobs.
+
+        claim_next already counted the interrupted run as an attempt, so a job that keeps taking the
+        process down fails once it has used up max_attempts instead of being re-queued forever.
+        With `refund_attempt` (graceful shutdown) the interrupted run is not counted and every job is re-queued.
+        """
+        with self._lock:
+            if refund_attempt:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0) WHERE status = 'running'"
+                )
+                return cursor.rowcount
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = 'failed', error = COALESCE(error, 'Interrupted while running'), finished_at = ?
+                WHERE status = 'running' AND attempts >= max_attempts
+                """,
+                (time.time(),),
+            )
+            cursor = self._conn.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+        return cursor.rowcount
+
+    def queue_position(self, job: Job) -> int:
+        """Number of queued jobs that will be claimed before this one."""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT COUNT(*) FROM jobs WHERE status = 'queued'
+                AND (priority > ? OR (priority = ? AND created_at < ?))
+                """,
+                (job.priority, job.priority, job.created_at),
+            ).fetchone()
+        return row[0]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row, include_payload: bool) -> Job:
+        data = dict(row)
+        data["payload"] = json.loads(data["payload"]) if include_payload else {}
+        data["result"] = json.loads(data["result"]) if data["result"] else None
+        return Job(**data)
+
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class WorkerPool:
+    """Runs queued jobs with bounded concurrency (one asyncio task per worker)."""
+
+    def __init__(self, store: JobStore, handler: JobHandler, workers: int = JOB_WORKERS,
+                 retry_base_delay: float = JOB_RETRY_BASE_DELAY, poll_interval: float = 1.0):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.retry_base_delay = retry_base_delay
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self.store.requeue_running)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work(), name=f"job-worker-{i}") for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs interrupted by the shutdown go back to the queue without using up an attempt.
+        await asyncio.to_thread(self.store.requeue_running, refund_attempt=True)
+
+    async def submit(self, payload: Dict[str, Any], priority: int = 0) -> Job:
+        job = await asyncio.to_thread(self.store.enqueue, payload, priority=priority)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self.store.claim_next)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        try:
+            result = await self.handler(job.payload)
+            # Inside the try: a result that is not JSON-serializable or a failed write fails the job
+            # instead of killing the worker and leaving the job 'running'.
+            await asyncio.to_thread(self.store.complete, job.id, result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            message = f"{type(e).__name__}: {e}"
+            if is_transient_error(e) and job.attempts < job.max_attempts:
+                await asyncio.to_thread(self.store.fail, job.id, message,
+                                        retry_in=self.retry_base_delay * 2 ** (job.attempts - 1))
+            else:
+                await asyncio.to_thread(self.store.fail, job.id, message)
+
+
+def pipeline_job_handler(runner=None) -> JobHandler:
+    """Builds a job handler that runs the agent pipeline for payloads of the form {"user_id", "parts"}."""
+    from root_agent.services.runner import create_runner, run_pipeline
+
+    runner = runner or create_runner()
+
+    async def handle(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await run_pipeline(runner, payload["parts"], user_id=payload.get("user_id", "user"))
+
+    return handle
@@ -0,0 +1,76 @@
+"""
+Service: Memory Profile Plugin
+Runner plugin that reports allocations per run and per agent (services/memory_profile.py).
+
+  stage "run"           – the whole invocation; ended after a full GC, so `retained` is what the
+                          session keeps alive afterwards (in-memory session events, caches, ...)
+                          plus `session_events` / `session_state_bytes` of the session
+  stage "agent:<name>"  – every run of a pipeline stage (the root agent's direct sub-agents:
+                          video analysis, insight extraction, creation loop / platform fan-out)
+
+Nested agents are not profiled separately – a snapshot of a large heap costs far more than a
+typical agent turn, and concurrent sub-agents would only see each other's allocations.
+
+Only attached when MEMORY_PROFILE=true (see services/event_log.default_plugins).
+"""
+
+from typing import Dict, List, Optional
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+from root_agent.services.memory_profile import StageToken, deep_sizeof, get_memory_profiler
+
+
+class MemoryProfilePlugin(BasePlugin):
+    """Runner plugin that takes allocation snapshots at run and agent boundaries."""
+
+    def __init__(self, name: str = "memory_profile"):
+        super().__init__(name=name)
+        self._profiler = get_memory_profiler()
+        # (invocation_id, agent) → started stages (a stack, in case a stage is re-entered)
+        self._stages: Dict[tuple, List[StageToken]] = {}
+
+    def _begin(self, key: tuple, session_id: str, stage: str) -> None:
+        if self._profiler is not None:
+            self._stages.setdefault(key, []).append(self._profiler.begin(session_id, stage))
+
+    def _end(self, key: tuple, **kwargs) -> None:
+        tokens = self._stages.get(key)
+        if self._profiler is None or not tokens:
+            return
+        token = tokens.pop()
+        if not tokens:
+            del self._stages[key]
+        self._profiler.end(token, **kwargs)
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> Optional[types.Content]:
+        self._begin((invocation_context.invocation_id,), invocation_context.session.id, "run")
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        session = invocation_context.session
+        self._end(
+            (invocation_context.invocation_id,),
+            collect=True,
+            session_events=len(session.events),
+            session_state_bytes=deep_sizeof(dict(session.state)),
+        )
+
+    @staticmethod
+    def _is_stage(agent: BaseAgent) -> bool:
+        return agent.parent_agent is not None and agent.parent_agent.parent_agent is None
+
+    async def before_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> Optional[types.Content]:
+        if not self._is_stage(agent):
+            return None
+        self._begin((callback_context.invocation_id, agent.name), callback_context.session.id, f"agent:{agent.name}")
+        return None
+
+    async def after_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> Optional[types.Content]:
+        if not self._is_stage(agent):
+            return None
+        self._end((callback_context.invocation_id, agent.name))
+        return None
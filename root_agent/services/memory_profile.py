@@ -0,0 +1,193 @@
+"""
+Service: Memory Profile
+Opt-in allocation tracking per pipeline stage and frontend phase (MEMORY_PROFILE=true).
+
+Every stage takes a tracemalloc snapshot when it starts and when it ends and appends one JSON
+record to <AGENT_DATA_DIR>/memory/<MEMORY_PROFILE_LABEL>-<process>-<pid>.jsonl:
+
+  session_id, stage, duration_ms
+  traced_delta   – bytes allocated during the stage and still alive at its end
+  rss_start / rss_end
+  top            – largest allocation sites of that delta: the allocating line and the
+                   innermost root_agent / app.py frame that led to it
+  retained       – only for stages ended with collect=True (whole runs): the delta after a full
+                   garbage collection, i.e. what the session keeps alive after it is done
+  extra fields   – e.g. session event count or sizes of st.session_state entries
+
+The label (e.g. a release tag) names the file, so two releases can be compared with
+root_agent/test/memory_report.py. Stages that run concurrently (parallel agents, several
+sessions) see each other's allocations. tracemalloc slows allocations down noticeably and a
+snapshot of a large heap takes a while, so this is for profiling runs only.
+
+No ADK imports: the Streamlit frontend uses this module directly, the ADK side through
+MemoryProfilePlugin (services/memory_plugin.py).
+"""
+
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict
+from root_agent.services.paths import data_path
+
+
+MEMORY_PROFILE = os.getenv("MEMORY_PROFILE", "false").lower() in ("1", "true", "yes")
+MEMORY_PROFILE_LABEL = os.getenv("MEMORY_PROFILE_LABEL", "dev")
+MEMORY_PROFILE_FRAMES = int(os.getenv("MEMORY_PROFILE_FRAMES", "8"))
+MEMORY_PROFILE_TOP = int(os.getenv("MEMORY_PROFILE_TOP", "15"))
+
+# Frames of these files count as "our" code when attributing an allocation.
+PROJECT_MARKERS = (f"{os.sep}root_agent{os.sep}", f"{os.sep}app.py", f"{os.sep}server.py")
+
+_IGNORED_FILES = (tracemalloc.__file__, "<unknown>")
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of the process (None where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Approximate size of an object including the strings, bytes and containers it holds."""
+    seen, stack, size = set(), [obj], 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item, 0)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, BaseModel):
+            stack.append(item.__dict__)
+    return size
+
+
+def _frame_label(frame: tracemalloc.Frame) -> str:
+    return f"{os.path.relpath(frame.filename) if os.path.isabs(frame.filename) else frame.filename}:{frame.lineno}"
+
+
+def _attribute(traceback: tracemalloc.Traceback) -> Tuple[str, Optional[str]]:
+    """(allocating line, innermost project frame) of a traceback (most recent frame first)."""
+    site = _frame_label(traceback[0])
+    caller = next((frame for frame in traceback if any(marker in frame.filename for marker in PROJECT_MARKERS)), None)
+    return site, (_frame_label(caller) if caller is not None else None)
+
+
+class StageToken(BaseModel):
+    """A started stage; pass it to MemoryProfiler.end()."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    session_id: Optional[str]
+    stage: str
+    started: float
+    rss: Optional[int]
+    snapshot: Any
+
+
+class MemoryProfiler:
+    """Snapshots at stage boundaries and the per-process JSONL report. Thread-safe."""
+
+    def __init__(self, path: Optional[str] = None, frames: int = MEMORY_PROFILE_FRAMES, top: int = MEMORY_PROFILE_TOP):
+        process = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+        self.path = path or data_path("memory", f"{MEMORY_PROFILE_LABEL}-{process}-{os.getpid()}.jsonl")
+        self.top = top
+        self._lock = threading.Lock()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, name) for name in _IGNORED_FILES])
+
+    def begin(self, session_id: Optional[str], stage: str) -> StageToken:
+        return StageToken(session_id=session_id, stage=stage, started=time.monotonic(), rss=rss_bytes(), snapshot=self._snapshot())
+
+    def end(self, token: StageToken, collect: bool = False, **extra: Any) -> Dict[str, Any]:
+        """Diffs against the stage's start snapshot and appends the record (collect=True: after a full GC)."""
+        if collect:
+            gc.collect()
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(token.snapshot, "traceback")
+        traced_delta = sum(stat.size_diff for stat in stats)
+
+        sites: Dict[Tuple[str, Optional[str]], List[int]] = {}
+        for stat in stats:
+            if stat.size_diff <= 0:
+                continue
+            totals = sites.setdefault(_attribute(stat.traceback), [0, 0])
+            totals[0] += stat.size_diff
+            totals[1] += stat.count_diff
+        top = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+
+        rss_end = rss_bytes()
+        record = {
+            "ts": time.time(),
+            "pid": os.getpid(),
+            "session_id": token.session_id,
+            "stage": token.stage,
+            "duration_ms": round((time.monotonic() - token.started) * 1000, 1),
+            "traced_delta": traced_delta,
+            "traced_peak": tracemalloc.get_traced_memory()[1],
+            "rss_start": token.rss,
+            "rss_end": rss_end,
+            "rss_delta": rss_end - token.rss if rss_end is not None and token.rss is not None else None,
+            "top": [{"site": site, "caller": caller, "size_diff": size, "count_diff": count}
+                    for (site, caller), (size, count) in top],
+            **({"retained": traced_delta} if collect else {}),
+            **extra,
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return record
+
+
+_profiler: Optional[MemoryProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_memory_profiler() -> Optional[MemoryProfiler]:
+    """Process-wide profiler (None unless MEMORY_PROFILE is enabled)."""
+    global _profiler
+    if not MEMORY_PROFILE:
+        return None
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = MemoryProfiler()
+    return _profiler
+
+
+def begin_stage(session_id: Optional[str], stage: str) -> Optional[StageToken]:
+    """Starts a stage (no-op returning None when profiling is disabled)."""
+    profiler = get_memory_profiler()
+    return profiler.begin(session_id, stage) if profiler else None
+
+
+def end_stage(token: Optional[StageToken], collect: bool = False, **extra: Any) -> None:
+    """Ends a stage started with begin_stage (no-op for None)."""
+    profiler = get_memory_profiler()
+    if profiler and token is not None:
+        profiler.end(token, collect=collect, **extra)
+
+
+@contextmanager
+def profile_stage(session_id: Optional[str], stage: str, collect: bool = False) -> Iterator[None]:
+    token = begin_stage(session_id, stage)
+    try:
+        yield
+    finally:
+        end_stage(token, collect=collect)
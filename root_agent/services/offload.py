@@ -0,0 +1,212 @@
+"""
+Service: CPU Offload
+Process pool for CPU-bound work that takes much longer than moving its input to a worker (frame
+sampling and pHash fingerprinting, audio analysis), so the asyncio runner loop never blocks on it.
+Pure base64 encoding/decoding stays out of the pool – pickling the payload costs as much as the
+work itself; it runs in place or in a thread (asyncio.to_thread).
+
+- Bounded: at most OFFLOAD_WORKERS tasks run and OFFLOAD_QUEUE_SIZE wait in the pool. Further
+  callers wait for a slot in arrival order (backpressure) instead of piling up work and memory.
+- One pool per process, shared by all event loops and threads; created on first use.
+- OFFLOAD_WORKERS=0 falls back to a thread pool (still off the event loop, no pickling).
+
+Task functions must be importable top-level functions; their arguments and results are pickled.
+This module only imports the standard library, so worker processes start fast.
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+OFFLOAD_WORKERS = int(os.getenv("OFFLOAD_WORKERS", str(min(4, os.cpu_count() or 1))))
+OFFLOAD_QUEUE_SIZE = int(os.getenv("OFFLOAD_QUEUE_SIZE", "16"))
+# "spawn" keeps workers independent of the parent's threads (asyncio, gRPC, SQLite).
+OFFLOAD_START_METHOD = os.getenv("OFFLOAD_START_METHOD", "spawn")
+THREAD_FALLBACK_WORKERS = 4
+
+
+# --- Message helpers (decoding is run in a thread, not in the pool) ---
+
+def build_content(parts: List[Dict[str, Any]], role: str = "user"):
+    """Validates ADK JSON message parts into a types.Content (decodes base64 inline data)."""
+    from google.genai import types
+
+    return types.Content.model_validate({"role": role, "parts": parts})
+
+
+def has_inline_data(parts: List[Dict[str, Any]]) -> bool:
+    return any("inline_data" in part for part in parts)
+
+
+def _run_in_worker(fn: Callable, *args: Any) -> Any:
+    """Runs a task in a worker process and closes the VideoSources unpickled for it (their mmaps)."""
+    try:
+        return fn(*args)
+    finally:
+        from root_agent.services.video_source import VideoSource
+
+        for arg in args:
+            if isinstance(arg, VideoSource):
+                arg.close()
+
+
+# --- Pool ---
+
+class _Slots:
+    """FIFO counting semaphore usable from any thread and any event loop."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Any] = deque()
+
+    def _take_or_enqueue(self, waiter: Any) -> bool:
+        with self._lock:
+            if self.in_use < self.capacity and not self._waiters:
+                self.in_use += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        if self._take_or_enqueue(waiter):
+            return
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                handed_over = waiter not in self._waiters
+                if not handed_over:
+                    self._waiters.remove(waiter)
+            if handed_over:
+                self.release()
+            raise
+
+    def acquire_sync(self) -> None:
+        waiter = threading.Event()
+        if not self._take_or_enqueue(waiter):
+            waiter.wait()
+
+    def release(self) -> None:
+        """Hands the slot to the next waiter, or frees it."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                loop, future = waiter
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(_resolve, future)
+                    return
+            self.in_use -= 1
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class Offloader:
+    """Bounded process pool with async and sync entry points."""
+
+    def __init__(self, workers: int = OFFLOAD_WORKERS, queue_size: int = OFFLOAD_QUEUE_SIZE,
+                 start_method: str = OFFLOAD_START_METHOD):
+        self.workers = workers
+        self.start_method = start_method
+        self._slots = _Slots(max(workers, 1) + max(queue_size, 0))
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.completed = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context(self.start_method)
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=THREAD_FALLBACK_WORKERS, thread_name_prefix="offload")
+            return self._executor
+
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        if self.workers > 0:
+            # Arguments are copies in the worker; the thread fallback shares them with the caller.
+            fn, args = _run_in_worker, (fn, *args)
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge video) – start a fresh pool and retry once.
+            with self._lock:
+                self._executor = None
+            future = self._get_executor().submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future) -> None:
+        self.completed += 1
+        self._slots.release()
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """Runs `fn(*args)` in the pool; waits for a free slot first if the pool is saturated."""
+        await self._slots.acquire_async()
+        try:
+            future = self._submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        return await asyncio.wrap_future(future)
+
+    def run_sync(self, fn: Callable, *args: Any) -> Any:
+        """Blocking variant for threads without an event loop (e.g. the Streamlit script thread)."""
+        self._slots.acquire_sync()
+        try:
+            future = self._submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        return future.result()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "capacity": self._slots.capacity,
+            "in_use": self._slots.in_use,
+            "waiting": self._slots.waiting,
+            "completed": self.completed,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_offloader: Optional[Offloader] = None
+_offloader_lock = threading.Lock()
+
+
+def get_offloader() -> Offloader:
+    """Process-wide offloader (the pool itself starts on the first task)."""
+    global _offloader
+    with _offloader_lock:
+        if _offloader is None:
+            _offloader = Offloader()
+            atexit.register(_offloader.shutdown)
+        return _offloader
@@ -0,0 +1,27 @@
+"""
+Service: Data Paths
+Local storage location shared by all services (job DB, run logs, indexes, exports).
+"""
+
+import os
+
+
+DATA_DIR = os.path.abspath(os.getenv("AGENT_DATA_DIR", os.path.join(os.path.dirname(__file__), "..", "..", ".data")))
+
+
+def data_path(*parts: str) -> str:
+    """Returns a path below DATA_DIR and creates its parent directory."""
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def use_data_dir(path: str) -> None:
+    """
+    Points all services at another data directory, e.g. a temporary one for offline test runs.
+    Call it before the stores are first used – open stores keep their files.
+    """
+    global DATA_DIR
+    DATA_DIR = os.path.abspath(path)
+    # Offload workers are fresh interpreters and read the location from the environment.
+    os.environ["AGENT_DATA_DIR"] = DATA_DIR
@@ -0,0 +1,94 @@
+"""
+Service: Rate Limiter
+Process-wide token buckets that pace model and Google Search calls across all concurrent sessions.
+
+Buckets are keyed by model name (and `google_search`) and configured from the environment:
+
+    RATE_LIMIT_<KEY>_RPM     requests per minute, e.g. RATE_LIMIT_GEMINI_2_5_PRO_RPM=5
+    RATE_LIMIT_<KEY>_BURST   bucket capacity (defaults to the RPM)
+    RATE_LIMIT_DEFAULT_RPM   fallback for keys without their own setting
+
+<KEY> is the bucket key upper-cased with non-alphanumerics replaced by "_". Keys without
+any configured limit are not throttled. Callers wait for a token instead of failing; waiting
+callers are served strictly in arrival order, so one busy session cannot starve the others.
+"""
+
+import asyncio
+import os
+import re
+import time
+import weakref
+from typing import Dict, Optional
+
+
+GOOGLE_SEARCH_BUCKET = "google_search"
+
+
+def _env_key(key: str) -> str:
+    return re.sub(r"[^A-Z0-9]", "_", key.upper())
+
+
+class TokenBucket:
+    """Async token bucket; acquire() waits FIFO until a token is available."""
+
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(requests_per_minute)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        # asyncio.Lock is bound to one event loop; keep one per loop (scripts may call asyncio.run repeatedly).
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if loop not in self._locks:
+            self._locks[loop] = asyncio.Lock()
+        return self._locks[loop]
+
+    async def acquire(self) -> float:
+        """Takes one token, waiting if necessary. Returns the seconds waited."""
+        started = time.monotonic()
+        # The lock queues waiters in arrival order; only its holder sleeps on the bucket.
+        async with self._lock():
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return time.monotonic() - started
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Registry of token buckets, created lazily from the environment."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+
+    def configure(self, key: str, requests_per_minute: Optional[float], burst: Optional[int] = None) -> None:
+        """Sets (or with None removes) the limit of a bucket, overriding the environment."""
+        self._buckets[key] = TokenBucket(requests_per_minute, burst) if requests_per_minute else None
+
+    def bucket(self, key: str) -> Optional[TokenBucket]:
+        if key not in self._buckets:
+            env_key = _env_key(key)
+            rpm = os.getenv(f"RATE_LIMIT_{env_key}_RPM") or os.getenv("RATE_LIMIT_DEFAULT_RPM")
+            burst = os.getenv(f"RATE_LIMIT_{env_key}_BURST")
+            self.configure(key, float(rpm) if rpm else None, int(burst) if burst else None)
+        return self._buckets[key]
+
+    async def acquire(self, *keys: str) -> float:
+        """Takes one token from each bucket. Returns the total seconds waited."""
+        waited = 0.0
+        for key in keys:
+            bucket = self.bucket(key)
+            if bucket is not None:
+                waited += await bucket.acquire()
+        return waited
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,252 @@
+"""
+Service: Resilience
+Retry with jittered exponential backoff, per-model circuit breakers and hedged requests for Gemini calls.
+
+`ResilientGemini` is a drop-in replacement for the model string of an Agent:
+
+    Agent(model=ResilientGemini(model="gemini-2.0-flash"), ...)
+
+Google Search runs server-side as part of the model call, so search quota errors (429) are retried here too.
+
+- Retry:     transient errors (408/429/5xx, timeouts, connection errors of httpx / aiohttp) are retried
+             with full jitter;
+             a server-provided Retry-After / RetryInfo delay takes precedence.
+- Breaker:   after CIRCUIT_FAILURE_THRESHOLD consecutive transient failures a model is failed fast for
+             CIRCUIT_RESET_SECONDS, then a single probe call decides whether it closes again.
+- Hedging:   with `hedge_delay` set, a duplicate request is sent if the first one has not answered
+             after that many seconds; the first response wins, the other call is cancelled.
+- Pacing:    every request (including retries and hedges) takes a token from the model's bucket and
+             from the buckets in `rate_limit_keys` (see rate_limit.py).
+"""
+
+import asyncio
+import os
+import random
+import re
+import sys
+import time
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+import httpx
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.models.google_llm import Gemini
+from pydantic import Field
+from root_agent.services.rate_limit import rate_limiter
+
+
+MODEL_RETRY_ATTEMPTS = int(os.getenv("MODEL_RETRY_ATTEMPTS", "5"))
+MODEL_RETRY_BASE_DELAY = float(os.getenv("MODEL_RETRY_BASE_DELAY", "1.0"))
+MODEL_RETRY_MAX_DELAY = float(os.getenv("MODEL_RETRY_MAX_DELAY", "60"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# HTTP status codes worth retrying (quota and server-side errors).
+TRANSIENT_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+_RETRY_DELAY_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)s\s*$")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model whose circuit breaker is open."""
+    code = 503
+
+    def __init__(self, model: str, retry_in: float):
+        self.model = model
+        self.retry_in = retry_in
+        super().__init__(f"Circuit breaker open for {model}, retry in {retry_in:.0f}s.")
+
+
+# Network failures of the HTTP clients google-genai uses. None of them subclass ConnectionError.
+_NETWORK_ERRORS: Tuple[type, ...] = (
+    asyncio.TimeoutError, ConnectionError,
+    httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError,
+)
+
+
+def _network_errors() -> Tuple[type, ...]:
+    # aiohttp is optional (google-genai's aiohttp transport); if it is not loaded, it raised nothing.
+    aiohttp = sys.modules.get("aiohttp")
+    if aiohttp is None:
+        return _NETWORK_ERRORS
+    return _NETWORK_ERRORS + (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Returns True for errors a retry can fix (quota, overload, network)."""
+    if isinstance(error, _network_errors()):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return isinstance(code, int) and code in TRANSIENT_STATUS_CODES
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Extracts the server-requested delay from a Retry-After header or a google.rpc.RetryInfo detail."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        for detail in (details.get("error") or {}).get("details") or []:
+            if isinstance(detail, dict) and "retryDelay" in detail:
+                match = _RETRY_DELAY_PATTERN.match(str(detail["retryDelay"]))
+                if match:
+                    return float(match.group(1))
+    return None
+
+
+def backoff_delay(attempt: int, base: float = MODEL_RETRY_BASE_DELAY, cap: float = MODEL_RETRY_MAX_DELAY) -> float:
+    """Full-jitter exponential backoff for the given (1-based) attempt."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed → open → half-open → closed)."""
+
+    def __init__(self, model: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """
+        Raises CircuitOpenError if the call must not go out.
+
+        Returns:
+            True if the call is the half-open probe – the caller must end it with record_success,
+            record_failure or release_probe.
+        """
+        state = self.state
+        if state == "open" or (state == "half_open" and self._probe_in_flight):
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            raise CircuitOpenError(self.model, retry_in)
+        if state == "half_open":
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Ends a probe without an outcome (cancelled), so the next call can probe again."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(model: str) -> CircuitBreaker:
+    """Returns the process-wide circuit breaker of a model."""
+    if model not in _circuit_breakers:
+        _circuit_breakers[model] = CircuitBreaker(model)
+    return _circuit_breakers[model]
+
+
+class ResilientGemini(Gemini):
+    """Gemini model with retry, circuit breaker and optional request hedging."""
+
+    max_attempts: int = MODEL_RETRY_ATTEMPTS
+    hedge_delay: Optional[float] = None
+    """Seconds to wait before sending a duplicate request (None disables hedging)."""
+    rate_limit_keys: List[str] = Field(default_factory=list)
+    """Additional rate limit buckets per request, e.g. ["google_search"] for agents with search grounding."""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        model = llm_request.model or self.model
+        breaker = get_circuit_breaker(model)
+
+        for attempt in range(1, self.max_attempts + 1):
+            probe = breaker.before_call()
+            yielded = False
+            try:
+                await rate_limiter.acquire(model, *self.rate_limit_keys)
+                try:
+                    if self.hedge_delay and not stream:
+                        for response in await self._hedged_call(llm_request):
+                            yielded = True
+                            yield response
+                    else:
+                        async for response in super().generate_content_async(llm_request, stream=stream):
+                            yielded = True
+                            yield response
+                except Exception as e:
+                    if not is_transient_error(e):
+                        # The model answered (e.g. 400 invalid request) – a probe has proven it reachable.
+                        if probe:
+                            breaker.record_success()
+                        raise
+                    breaker.record_failure()
+                    # A partially streamed answer cannot be replayed; the last attempt surfaces the error.
+                    if yielded or attempt == self.max_attempts:
+                        raise
+                    delay = retry_after_seconds(e)
+                    await asyncio.sleep(delay + random.uniform(0, 1) if delay is not None else backoff_delay(attempt))
+                    continue
+
+                breaker.record_success()
+                return
+            finally:
+                # Cancelled (speculative draft, hedge loser, rate-limit wait) or closed mid-stream:
+                # the probe ended without an outcome and must not block the model for good.
+                if probe:
+                    breaker.release_probe()
+
+    async def _single_call(self, llm_request: LlmRequest) -> List[LlmResponse]:
+        return [response async for response in super().generate_content_async(llm_request, stream=False)]
+
+    async def _hedged_call(self, llm_request: LlmRequest) -> List[LlmResponse]:
+        """Sends the request, and a duplicate after `hedge_delay` seconds; returns the first success."""
+        tasks = [asyncio.create_task(self._single_call(llm_request))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+            if done:
+                return tasks[0].result()
+
+            # The duplicate gets its own config (the call mutates headers/labels); contents are shared read-only.
+            duplicate_request = llm_request.model_copy(update={"config": llm_request.config.model_copy(deep=True)})
+            await rate_limiter.acquire(llm_request.model or self.model, *self.rate_limit_keys)
+            tasks.append(asyncio.create_task(self._single_call(duplicate_request)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Also on cancellation of the caller (e.g. during the hedge delay or the rate-limit wait):
+            # no request may keep running (and billing) unobserved.
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
@@ -0,0 +1,397 @@
+"""
+Service: Run Export
+Append-only columnar dataset of finished runs for analytics (Parquet, partitioned by day).
+
+One row per run and target platform (single-platform runs: platform = null) with flat columns:
+
+  run            session_id, user_id, started_at, date, duration_ms, model_calls, token counts
+  engagement in  likes, comments, shares, saves, reach (parsed from the user message)
+  video analysis schema extraction fields, root questions, measured audio features
+  strategy       insight fields plus question / answer / 4 analysis levels per root question
+  creation       caption, hashtags, creative output, creator calls and models, speculation
+  evaluation     rating, approved, evaluation text, predicted engagement rate
+  timings        stage durations (video_analysis_ms, insight_extraction_ms, creation_ms) and
+                 agent_ms – every agent's total duration as a map
+
+Rows are buffered and written in batches (RUN_EXPORT_BATCH_SIZE rows, or by a background thread
+once the oldest row is RUN_EXPORT_FLUSH_SECONDS old, and at shutdown) as new part files under <AGENT_DATA_DIR>/exports/runs/date=YYYY-MM-DD/ –
+existing files are never rewritten. The layout is hive-partitioned, so pyarrow.dataset, DuckDB,
+Polars or pandas read it directly and prune by day (see load_runs).
+
+Runs that never reach the export (crash before a flush, export disabled) can be added later from
+their event logs with `backfill_from_run_logs`. Needs pyarrow (a Streamlit dependency); without
+it the export is disabled.
+"""
+
+import atexit
+import importlib.util
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, Field
+from root_agent.services.paths import data_path
+from root_agent.services.run_log import list_run_logs, read_run_log, state_at_end
+
+
+logger = logging.getLogger(__name__)
+
+RUN_EXPORT_ENABLED = os.getenv("RUN_EXPORT_ENABLED", "true").lower() not in ("0", "false", "no")
+RUN_EXPORT_BATCH_SIZE = int(os.getenv("RUN_EXPORT_BATCH_SIZE", "500"))
+RUN_EXPORT_FLUSH_SECONDS = float(os.getenv("RUN_EXPORT_FLUSH_SECONDS", "300"))
+EXPORT_DIR = ("exports", "runs")
+
+ROOT_QUESTION_COUNT = 3
+ANALYSIS_LEVELS = ("descriptive", "diagnostic", "predictive", "prescriptive")
+ENGAGEMENT_INPUTS = ("likes", "comments", "shares", "saves", "reach")
+# Stage duration columns → agents whose duration is the stage duration (first one present wins).
+STAGE_AGENTS = {
+    "video_analysis_ms": ("video_analyst_agent",),
+    "insight_extraction_ms": ("insight_extraction_stage",),
+    "creation_ms": ("platform_fan_out", "creation_evaluation_loop"),
+}
+
+_ENGAGEMENT_PATTERN = re.compile(r"\b(likes|comments|shares|saves|reach)\s*[=:]\s*([\d.,]+)", re.IGNORECASE)
+
+
+def _load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401 – registers pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def run_export_available() -> bool:
+    """True if pyarrow is installed (checked without importing it)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class RunSummary(BaseModel):
+    """Everything the export needs about one finished run."""
+    session_id: str
+    user_id: Optional[str] = None
+    started_at: float
+    duration_ms: Optional[float] = None
+    user_text: str = ""
+    state: Dict[str, Any] = Field(default_factory=dict)
+    agent_ms: Dict[str, float] = Field(default_factory=dict, description="Total duration per agent (all iterations).")
+    model_calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+
+
+def summary_from_run_log(records: List[Dict[str, Any]]) -> Optional[RunSummary]:
+    """RunSummary of a logged run (None if the log has no run_start)."""
+    start = next((record for record in records if record["type"] == "run_start"), None)
+    if start is None:
+        return None
+    end = next((record for record in records if record["type"] == "run_end"), None)
+    summary = RunSummary(
+        session_id=start["session_id"],
+        user_id=start.get("user_id"),
+        started_at=start["ts"],
+        duration_ms=end.get("duration_ms") if end else None,
+        user_text="\n".join((start.get("user_message") or {}).get("text_parts") or []),
+        state=state_at_end(records),
+    )
+    for record in records:
+        if record["type"] == "agent_end" and record.get("duration_ms") is not None:
+            summary.agent_ms[record["agent"]] = summary.agent_ms.get(record["agent"], 0.0) + record["duration_ms"]
+        elif record["type"] == "model_response":
+            summary.model_calls += 1
+            summary.prompt_tokens += record.get("prompt_tokens") or 0
+            summary.cached_tokens += record.get("cached_tokens") or 0
+            summary.output_tokens += record.get("output_tokens") or 0
+    return summary
+
+
+def parse_engagement_inputs(text: str) -> Dict[str, Optional[int]]:
+    """Likes/Comments/Shares/Saves/Reach as given in the user message (None if missing)."""
+    values: Dict[str, Optional[int]] = dict.fromkeys(ENGAGEMENT_INPUTS)
+    for name, value in _ENGAGEMENT_PATTERN.findall(text or ""):
+        try:
+            values[name.lower()] = int(float(value.replace(",", "")))
+        except ValueError:
+            pass
+    return values
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _draft_sections(creative_output: str) -> Dict[str, Any]:
+    # Imported lazily: the callbacks package pulls in ADK, the rest of this module does not need it.
+    from root_agent.callbacks.draft_precheck import draft_section
+    from root_agent.callbacks.hashtag_knowledge import draft_hashtags
+
+    caption = draft_section(creative_output, "caption")
+    return {"caption": caption, "caption_length": len(caption) if caption else None, "hashtags": draft_hashtags(creative_output)}
+
+
+def flatten_run(summary: RunSummary) -> List[Dict[str, Any]]:
+    """Flat rows of a run (one per target platform)."""
+    from root_agent.callbacks.similar_examples import parse_evaluation
+
+    state = summary.state
+    started = datetime.fromtimestamp(summary.started_at, tz=timezone.utc)
+    base: Dict[str, Any] = {
+        "session_id": summary.session_id,
+        "user_id": summary.user_id,
+        "started_at": started,
+        "date": started.date(),
+        "duration_ms": summary.duration_ms,
+        "model_calls": summary.model_calls,
+        "prompt_tokens": summary.prompt_tokens,
+        "cached_tokens": summary.cached_tokens,
+        "output_tokens": summary.output_tokens,
+        "user_text": summary.user_text,
+        **parse_engagement_inputs(summary.user_text),
+    }
+
+    video_analysis = _dict(state.get("video_analysis"))
+    schema = _dict(video_analysis.get("schema_extraction"))
+    audio = _dict(video_analysis.get("audio_analysis") or state.get("audio_analysis"))
+    root_questions = list(video_analysis.get("root_questions") or [])
+    base.update({
+        "hook_type": schema.get("hook_type"),
+        "scene_length": schema.get("scene_length"),
+        "visual_frequency": schema.get("visual_frequency"),
+        "unique_visual_elements": schema.get("unique_visual_elements"),
+        "root_questions": [str(question) for question in root_questions],
+        "audio_content_type": audio.get("content_type"),
+        "audio_loudness_db": audio.get("loudness_db"),
+        "audio_onset_density": audio.get("onset_density"),
+        "audio_bpm": audio.get("bpm"),
+        "video_dedup_reused": (_dict(state.get("video_dedup")).get("status") == "reused") if state.get("video_dedup") else None,
+    })
+
+    insights = _dict(state.get("insights"))
+    base.update({
+        "most_engaging_element": insights.get("most_engaging_element"),
+        "hook_strategy": insights.get("hook_strategy"),
+        "psychological_angle": insights.get("psychological_angle"),
+        "prescriptive_summary": insights.get("prescriptive_summary"),
+    })
+    analyses = [_dict(analysis) for analysis in insights.get("root_question_analyses") or []]
+    for i in range(ROOT_QUESTION_COUNT):
+        analysis = analyses[i] if i < len(analyses) else {}
+        levels = _dict(analysis.get("analysis_levels"))
+        base[f"rq{i + 1}_question"] = analysis.get("root_question")
+        base[f"rq{i + 1}_answer"] = analysis.get("answer")
+        for level in ANALYSIS_LEVELS:
+            base[f"rq{i + 1}_{level}"] = levels.get(level)
+
+    base["agent_ms"] = dict(summary.agent_ms)
+    for column, agents in STAGE_AGENTS.items():
+        base[column] = next((summary.agent_ms[agent] for agent in agents if agent in summary.agent_ms), None)
+
+    platform_results = _dict(state.get("platform_results"))
+    if platform_results:
+        variants = [
+            (key, result.get("creative_output"), result.get("evaluation_result"),
+             state.get(f"{key}_model_routing"), result.get("speculation"), result.get("predicted_engagement"))
+            for key, result in ((key, _dict(result)) for key, result in platform_results.items())
+        ]
+    else:
+        variants = [(None, state.get("creative_output"), state.get("evaluation_result"),
+                     state.get("model_routing"), state.get("speculation"), state.get("predicted_engagement"))]
+
+    rows = []
+    for platform, creative_output, evaluation, routing, speculation, prediction in variants:
+        creative_output, evaluation = str(creative_output or ""), str(evaluation or "")
+        rating, approved = parse_evaluation(evaluation)
+        decisions = [_dict(decision) for decision in routing or []]
+        rows.append({
+            **base,
+            "platform": platform,
+            **_draft_sections(creative_output),
+            "creative_output": creative_output or None,
+            "creator_calls": len(decisions),
+            "creator_models": [str(decision.get("model")) for decision in decisions if decision.get("model")],
+            "speculative_drafts_kept": sum(1 for decision in speculation or [] if _dict(decision).get("status") == "kept"),
+            "evaluation_result": evaluation or None,
+            "rating": rating,
+            "approved": approved if evaluation else None,
+            "predicted_engagement_rate": _dict(prediction).get("rate"),
+        })
+    return rows
+
+
+def export_schema():
+    """Explicit Arrow schema, so every part file of the dataset has the same columns and types."""
+    pa = _load_pyarrow()
+    string, integer, double = pa.string(), pa.int64(), pa.float64()
+    fields = [
+        ("session_id", string), ("user_id", string), ("platform", string),
+        ("started_at", pa.timestamp("ms", tz="UTC")), ("duration_ms", double),
+        ("model_calls", integer), ("prompt_tokens", integer), ("cached_tokens", integer), ("output_tokens", integer),
+        ("user_text", string),
+        *[(name, integer) for name in ENGAGEMENT_INPUTS],
+        ("hook_type", string), ("scene_length", string), ("visual_frequency", string), ("unique_visual_elements", string),
+        ("root_questions", pa.list_(string)),
+        ("audio_content_type", string), ("audio_loudness_db", double), ("audio_onset_density", double), ("audio_bpm", double),
+        ("video_dedup_reused", pa.bool_()),
+        ("most_engaging_element", string), ("hook_strategy", string), ("psychological_angle", string), ("prescriptive_summary", string),
+        *[(f"rq{i}_{name}", string) for i in range(1, ROOT_QUESTION_COUNT + 1) for name in ("question", "answer", *ANALYSIS_LEVELS)],
+        *[(column, double) for column in STAGE_AGENTS],
+        ("agent_ms", pa.map_(string, double)),
+        ("caption", string), ("caption_length", integer), ("hashtags", pa.list_(string)), ("creative_output", string),
+        ("creator_calls", integer), ("creator_models", pa.list_(string)), ("speculative_drafts_kept", integer),
+        ("evaluation_result", string), ("rating", integer), ("approved", pa.bool_()), ("predicted_engagement_rate", double),
+    ]
+    return pa.schema(fields)
+
+
+class RunExporter:
+    """Buffers run rows and appends them as Parquet part files per day. Thread-safe."""
+
+    def __init__(self, root: Optional[str] = None, batch_size: int = RUN_EXPORT_BATCH_SIZE,
+                 flush_seconds: float = RUN_EXPORT_FLUSH_SECONDS):
+        self.root = root or os.path.dirname(data_path(*EXPORT_DIR, "_"))
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._rows: List[Dict[str, Any]] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+
+    def _due(self) -> bool:
+        return bool(self._rows) and (
+            len(self._rows) >= self.batch_size or time.monotonic() - self._oldest >= self.flush_seconds
+        )
+
+    def add(self, summary: RunSummary) -> bool:
+        """Buffers the rows of a run; returns True if a flush is due (batch size or age reached)."""
+        rows = flatten_run(summary)
+        with self._lock:
+            self._rows.extend(rows)
+            self._oldest = self._oldest or time.monotonic()
+            return self._due()
+
+    def flush_if_due(self) -> List[str]:
+        with self._lock:
+            due = self._due()
+        return self.flush() if due else []
+
+    def flush(self) -> List[str]:
+        """
+        Writes all buffered rows (one part file per day); returns the written paths.
+        Blocking file I/O – call it via asyncio.to_thread from async code. Rows whose write fails
+        go back into the buffer for the next flush.
+        """
+        with self._lock:
+            rows, oldest, self._rows, self._oldest = self._rows, self._oldest, [], None
+        if not rows:
+            return []
+        by_day: Dict[date, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_day.setdefault(row["date"], []).append(row)
+
+        paths: List[str] = []
+        pending = sorted(by_day)
+        try:
+            pa = _load_pyarrow()
+            schema = export_schema()
+            while pending:
+                day = pending[0]
+                table = pa.Table.from_pylist(by_day[day], schema=schema)
+                directory = os.path.join(self.root, f"date={day.isoformat()}")
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"part-{int(time.time() * 1000)}-{os.getpid()}-{uuid.uuid4().hex[:8]}.parquet")
+                # Written under a temporary name, so readers never see a half-written part file.
+                pa.parquet.write_table(table, path + ".tmp", compression="zstd")
+                os.replace(path + ".tmp", path)
+                paths.append(path)
+                pending.pop(0)
+        except BaseException:
+            with self._lock:
+                self._rows[:0] = [row for day in pending for row in by_day[day]]
+                self._oldest = min(oldest, self._oldest) if self._oldest is not None else oldest
+            raise
+        return paths
+
+    def start(self) -> None:
+        """Starts the background thread that writes rows older than flush_seconds, also when no further runs arrive."""
+        if self._timer is None:
+            self._stop.clear()
+            self._timer = threading.Thread(target=self._flush_periodically, name="run-export-flush", daemon=True)
+            self._timer.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(max(1.0, self.flush_seconds / 4)):
+            try:
+                self.flush_if_due()
+            except Exception:
+                logger.exception("Run export flush failed (rows kept for the next attempt)")
+
+    def close(self) -> None:
+        """Stops the background thread and writes the remaining rows."""
+        if self._timer is not None:
+            self._stop.set()
+            self._timer.join()
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Final run export flush failed – %d rows lost", self.pending())
+
+    def pending(self) -> int:
+        return len(self._rows)
+
+
+def load_runs(start: Optional[str] = None, end: Optional[str] = None, columns: Optional[List[str]] = None,
+              root: Optional[str] = None):
+    """Reads the dataset as a pyarrow Table, optionally only the days start..end (ISO dates, inclusive)."""
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(root or os.path.dirname(data_path(*EXPORT_DIR, "_")), format="parquet", partitioning="hive")
+    condition = None
+    if start:
+        condition = ds.field("date") >= start
+    if end:
+        condition = (ds.field("date") <= end) if condition is None else condition & (ds.field("date") <= end)
+    return dataset.to_table(columns=columns, filter=condition)
+
+
+def backfill_from_run_logs(session_ids: Optional[Iterable[str]] = None, exporter: Optional["RunExporter"] = None) -> int:
+    """Exports logged runs (default: all run logs); returns the number of exported runs."""
+    exporter = exporter or get_run_exporter()
+    ids = list(session_ids) if session_ids is not None else [entry["session_id"] for entry in list_run_logs(limit=10 ** 9)]
+    exported = 0
+    for session_id in ids:
+        summary = summary_from_run_log(read_run_log(session_id))
+        if summary is not None:
+            if exporter.add(summary):
+                exporter.flush()
+            exported += 1
+    exporter.flush()
+    return exported
+
+
+_exporter: Optional[RunExporter] = None
+
+
+def get_run_exporter() -> RunExporter:
+    """Process-wide exporter (created on first use, flushed periodically and at exit)."""
+    global _exporter
+    if _exporter is None:
+        _exporter = RunExporter()
+        _exporter.start()
+        atexit.register(_exporter.close)
+    return _exporter
+
+
+def close_run_exporter() -> None:
+    """Writes the buffered rows of the process-wide exporter (server shutdown); no-op if it was never used."""
+    if _exporter is not None:
+        _exporter.close()
@@ -0,0 +1,86 @@
+"""
+Service: Run Log Files
+Storage of the per-session event logs written by the EventLogPlugin (services/event_log.py).
+
+Files live under <AGENT_DATA_DIR>/runs/<session_id>.jsonl.gz. The writer flushes when a record
+arrives at least RUN_LOG_FLUSH_SECONDS after the last flush, and on close (after run_end) – not
+per record, which would end a deflate block every time. The log of a crashed or still running
+session is readable up to its last flush.
+Reading needs no ADK imports, so replay tooling starts fast.
+"""
+
+import gzip
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from root_agent.services.paths import data_path
+
+
+RUNS_DIR = "runs"
+RUN_LOG_FLUSH_SECONDS = float(os.getenv("RUN_LOG_FLUSH_SECONDS", "1.0"))
+
+
+def run_log_path(session_id: str) -> str:
+    return data_path(RUNS_DIR, f"{session_id}.jsonl.gz")
+
+
+class RunLogWriter:
+    """Appends JSON records to the gzip log of one session."""
+
+    def __init__(self, session_id: str, flush_seconds: float = RUN_LOG_FLUSH_SECONDS):
+        self.path = run_log_path(session_id)
+        self.flush_seconds = flush_seconds
+        # "ab" starts a new gzip member; multi-member files are read back transparently.
+        self._file = gzip.open(self.path, "ab")
+        self._flushed_at = time.monotonic()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write((json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+        if time.monotonic() - self._flushed_at >= self.flush_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_run_log(session_id: str) -> List[Dict[str, Any]]:
+    """Reads all records of a session log (tolerates a truncated tail of a running or crashed run)."""
+    return read_log_file(run_log_path(session_id))
+
+
+def read_log_file(path: str) -> List[Dict[str, Any]]:
+    """Reads all records of a run log file."""
+    records: List[Dict[str, Any]] = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                records.append(json.loads(line))
+    except (EOFError, json.JSONDecodeError):
+        pass
+    return records
+
+
+def state_at_end(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Session state after the last logged event (all state deltas applied in order)."""
+    state: Dict[str, Any] = {}
+    for record in records:
+        state.update(record.get("state_delta") or {})
+    return state
+
+
+def list_run_logs(limit: int = 50) -> List[Dict[str, Any]]:
+    """Lists the most recent session logs (newest first)."""
+    directory = os.path.dirname(run_log_path("_"))
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(".jsonl.gz"):
+            stat = os.stat(os.path.join(directory, name))
+            entries.append({"session_id": name[:-len(".jsonl.gz")], "modified_at": stat.st_mtime, "size": stat.st_size})
+    entries.sort(key=lambda entry: entry["modified_at"], reverse=True)
+    return entries[:limit]
@@ -0,0 +1,78 @@
+"""
+Service: Pipeline Runner
+Builds an ADK Runner around `root_agent` and executes single pipeline runs outside the ADK web server.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from google.adk import Runner
+from google.adk.agents import BaseAgent
+from google.adk.apps import App
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from root_agent.services.event_log import default_plugins
+from root_agent.services.offload import build_content, has_inline_data
+
+
+APP_NAME = "root_agent"
+
+# State keys that make up the result of a run (everything else is intermediate).
+RESULT_STATE_KEYS = (
+    "video_analysis",
+    "insights",
+    "creative_output",
+    "evaluation_result",
+    "model_routing",
+    "schema_repairs",
+    "platform_results",
+    "video_dedup",
+    "speculation",
+    "predicted_engagement",
+)
+
+
+def create_runner(agent: Optional[BaseAgent] = None, session_service: Optional[BaseSessionService] = None) -> Runner:
+    """
+    Creates a Runner for the pipeline.
+
+    Args:
+        agent: Root agent to run (defaults to the pipeline `app` of `root_agent.agent`, including its plugins).
+        session_service: Session service (defaults to a fresh InMemorySessionService).
+    """
+    if agent is None:
+        from root_agent.agent import app
+    else:
+        app = App(name=APP_NAME, root_agent=agent, plugins=default_plugins())
+    return Runner(app=app, session_service=session_service or InMemorySessionService())
+
+
+async def run_pipeline(runner: Runner, parts: List[Dict[str, Any]], user_id: str = "user") -> Dict[str, Any]:
+    """
+    Runs the pipeline once in a fresh session.
+
+    Args:
+        runner: Runner created by `create_runner`.
+        parts: Message parts in ADK JSON form, e.g. [{"text": ...}, {"inline_data": {"mime_type": ..., "data": <base64>}}].
+        user_id: User the session belongs to.
+
+    Returns:
+        dict: 'session_id', 'events' (list of {author, text}) and 'state' (the result keys of the final session state).
+    """
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id=user_id)
+    # Validating inline video decodes the whole base64 payload – do that off the event loop. A thread,
+    # not the offload pool: pickling the payload to a worker process would cost as much as decoding it.
+    if has_inline_data(parts):
+        content = await asyncio.to_thread(build_content, parts)
+    else:
+        content = build_content(parts)
+
+    text_entries = []
+    async for event in runner.run_async(user_id=user_id, session_id=session.id, new_message=content):
+        if event.content and event.content.parts:
+            for part in event.content.parts:
+                if part.text:
+                    text_entries.append({"author": event.author, "text": part.text})
+
+    session = await runner.session_service.get_session(app_name=runner.app_name, user_id=user_id, session_id=session.id)
+    state = {key: session.state[key] for key in RESULT_STATE_KEYS if key in session.state}
+    return {"session_id": session.id, "events": text_entries, "state": state}
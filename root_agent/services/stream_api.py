@@ -0,0 +1,113 @@
+"""
+Service: Compact Stream API
+Server-sent events with only the fields the Streamlit client renders.
+
+/run_sse streams full ADK events – function calls, grounding metadata of every google_search,
+state deltas, usage metadata. The client only reads `author` and `content.parts[].text`, so this
+endpoint runs the pipeline and sends a projection of each event instead:
+
+    POST /stream  {"user_id", "session_id"?, "parts"}
+      data: {"session_id": "..."}                  first line
+      data: {"author": "...", "text": ["..."]}     one line per event with text (others are skipped)
+      data: {"state": {...}}                       result keys of the final session state (RESULT_STATE_KEYS)
+      data: {"error": "..."}                       if the run fails
+      data: [DONE]
+
+With `Accept-Encoding: gzip` the stream is gzip-compressed; every event is flushed on its own,
+so the client still receives them as they happen.
+"""
+
+import asyncio
+import json
+import logging
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from root_agent.services.offload import build_content, has_inline_data
+
+
+logger = logging.getLogger(__name__)
+
+
+class StreamRequest(BaseModel):
+    """Request body for POST /stream."""
+    user_id: str = Field(default="user", description="User the pipeline session belongs to.")
+    session_id: Optional[str] = Field(default=None, description="Session to create and run in (generated if missing).")
+    parts: List[Dict[str, Any]] = Field(description="Message parts in ADK JSON form (text / inline_data).", min_length=1)
+
+
+def project_event(event) -> Optional[Dict[str, Any]]:
+    """The client-facing projection of an ADK event (None if it carries no text)."""
+    if event.content is None or not event.content.parts:
+        return None
+    texts = [part.text for part in event.content.parts if part.text]
+    if not texts:
+        return None
+    return {"author": event.author, "text": texts}
+
+
+def sse_line(data: Any) -> bytes:
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"data: {payload}\n\n".encode("utf-8")
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip-compresses a stream, flushing after every chunk (Z_SYNC_FLUSH) so events are not held back."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def create_stream_router(runner=None) -> APIRouter:
+    """Creates the /stream route (the runner is created on the first request if not given)."""
+    router = APIRouter(prefix="/stream", tags=["stream"])
+    runners: Dict[str, Any] = {"runner": runner}
+
+    def get_runner():
+        if runners["runner"] is None:
+            from root_agent.services.runner import create_runner
+
+            runners["runner"] = create_runner()
+        return runners["runner"]
+
+    @router.post("")
+    async def stream(request: StreamRequest, http_request: Request) -> StreamingResponse:
+        runner = get_runner()
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name, user_id=request.user_id, session_id=request.session_id,
+        )
+        if has_inline_data(request.parts):
+            # Off the event loop, in a thread (see run_pipeline).
+            content = await asyncio.to_thread(build_content, request.parts)
+        else:
+            content = build_content(request.parts)
+
+        async def events() -> AsyncIterator[bytes]:
+            from root_agent.services.runner import RESULT_STATE_KEYS
+
+            yield sse_line({"session_id": session.id})
+            try:
+                async for event in runner.run_async(user_id=request.user_id, session_id=session.id, new_message=content):
+                    projected = project_event(event)
+                    if projected is not None:
+                        yield sse_line(projected)
+                final = await runner.session_service.get_session(
+                    app_name=runner.app_name, user_id=request.user_id, session_id=session.id,
+                )
+                yield sse_line({"state": {key: final.state[key] for key in RESULT_STATE_KEYS if key in final.state}})
+            except Exception as e:
+                logger.exception("Stream for session %s failed", session.id)
+                yield sse_line({"error": str(e)})
+            yield sse_line("[DONE]")
+
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Vary": "Accept-Encoding"}
+        if "gzip" in http_request.headers.get("accept-encoding", "").lower():
+            headers["Content-Encoding"] = "gzip"
+            return StreamingResponse(gzip_stream(events()), media_type="text/event-stream", headers=headers)
+        return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+    return router
@@ -0,0 +1,301 @@
+"""
+Service: Video Fingerprint Index
+Perceptual fingerprints for incoming videos, so re-encodes, light crops and re-uploads of a
+clip at a different bitrate are recognized as the same video.
+
+- Fingerprint: pHash (64 bit, DCT of a 32x32 grayscale frame) of FINGERPRINT_FRAMES frames
+  sampled at fixed relative positions, so different frame rates and lengths still line up.
+- Lookup: every frame hash goes into a BK-tree (Hamming distance); the videos whose frames fall
+  within FRAME_MATCH_DISTANCE are verified frame by frame (confidence = share of matching frames).
+- Storage: SQLite table next to the job DB; the BK-tree is rebuilt from it on first use.
+
+Frame decoding uses OpenCV (cv2) if installed, otherwise the ffmpeg/ffprobe binaries. Without
+either (or without NumPy) fingerprinting is disabled and every video is analyzed normally.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from root_agent.services.paths import data_path
+from root_agent.services.video_source import VideoSource
+
+
+VIDEO_DEDUP_ENABLED = os.getenv("VIDEO_DEDUP_ENABLED", "true").lower() not in ("0", "false", "no")
+VIDEO_DEDUP_MIN_CONFIDENCE = float(os.getenv("VIDEO_DEDUP_MIN_CONFIDENCE", "0.85"))
+FRAME_MATCH_DISTANCE = int(os.getenv("VIDEO_DEDUP_FRAME_DISTANCE", "10"))
+FINGERPRINT_FRAMES = 16
+HASH_SIZE = 8
+FRAME_SIZE = 32
+# Frames flatter than this (black/white fades) carry no information and are skipped.
+MIN_FRAME_STD = 3.0
+# Allowed relative length difference between two matching videos.
+MAX_DURATION_DELTA = 0.15
+
+
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _load_cv2():
+    try:
+        import cv2
+    except ImportError:
+        return None
+    return cv2
+
+
+def fingerprinting_available() -> bool:
+    """NumPy plus a frame decoder (cv2 or ffmpeg) are available."""
+    return _load_numpy() is not None and (_load_cv2() is not None or shutil.which("ffmpeg") is not None)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def phash(frame) -> Optional[int]:
+    """64-bit perceptual hash of a FRAME_SIZE x FRAME_SIZE grayscale frame (None for flat frames)."""
+    np = _load_numpy()
+    pixels = np.asarray(frame, dtype=np.float64)
+    if pixels.std() < MIN_FRAME_STD:
+        return None
+    n = pixels.shape[0]
+    k = np.arange(n)
+    dct_matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+    low = (dct_matrix @ pixels @ dct_matrix.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    # The DC term only encodes brightness – leave it out of the median.
+    bits = low > np.median(low[1:])
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def _sample_frames_cv2(cv2, path: str) -> Tuple[List[Any], float]:
+    capture = cv2.VideoCapture(path)
+    try:
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0.0
+        frames = []
+        for i in range(FINGERPRINT_FRAMES):
+            capture.set(cv2.CAP_PROP_POS_FRAMES, int((i + 0.5) / FINGERPRINT_FRAMES * frame_count))
+            ok, frame = capture.read()
+            if not ok:
+                frames.append(None)
+                continue
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            frames.append(cv2.resize(gray, (FRAME_SIZE, FRAME_SIZE), interpolation=cv2.INTER_AREA))
+        return frames, (frame_count / fps if fps else 0.0)
+    finally:
+        capture.release()
+
+
+def _sample_frames_ffmpeg(np, path: str) -> Tuple[List[Any], float]:
+    probe = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True,
+    )
+    duration = float(probe.stdout.strip() or 0)
+    if duration <= 0:
+        return [], 0.0
+    raw = subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-i", path,
+            "-vf", f"fps={FINGERPRINT_FRAMES}/{duration},scale={FRAME_SIZE}:{FRAME_SIZE}:flags=area,format=gray",
+            "-frames:v", str(FINGERPRINT_FRAMES), "-f", "rawvideo", "-",
+        ],
+        capture_output=True, check=True,
+    ).stdout
+    frame_bytes = FRAME_SIZE * FRAME_SIZE
+    frames = [
+        np.frombuffer(raw[i:i + frame_bytes], dtype=np.uint8).reshape(FRAME_SIZE, FRAME_SIZE)
+        for i in range(0, len(raw) - frame_bytes + 1, frame_bytes)
+    ]
+    return frames, duration
+
+
+def sample_frames(video: Union[bytes, VideoSource]) -> Tuple[List[Any], float]:
+    """Decodes FINGERPRINT_FRAMES evenly spaced grayscale frames. Returns (frames, duration in s)."""
+    np, cv2 = _load_numpy(), _load_cv2()
+    with VideoSource.from_bytes(video).local_path() as path:
+        if cv2 is not None:
+            return _sample_frames_cv2(cv2, path)
+        return _sample_frames_ffmpeg(np, path)
+
+
+class VideoFingerprint(BaseModel):
+    """Perceptual fingerprint of one video."""
+    sha256: str
+    duration: float
+    frame_hashes: List[Optional[int]]
+
+    @property
+    def informative_frames(self) -> int:
+        return sum(h is not None for h in self.frame_hashes)
+
+
+def compute_fingerprint(video: Union[bytes, VideoSource]) -> Optional[VideoFingerprint]:
+    """Fingerprints a video. None if no decoder is available or the video has too few informative frames."""
+    if not fingerprinting_available():
+        return None
+    video = VideoSource.from_bytes(video)
+    try:
+        frames, duration = sample_frames(video)
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+    fingerprint = VideoFingerprint(
+        sha256=video.sha256(),
+        duration=duration,
+        frame_hashes=[phash(frame) if frame is not None else None for frame in frames],
+    )
+    return fingerprint if fingerprint.informative_frames >= FINGERPRINT_FRAMES // 2 else None
+
+
+def match_confidence(a: VideoFingerprint, b: VideoFingerprint, max_distance: int = FRAME_MATCH_DISTANCE) -> float:
+    """Share of aligned informative frames within `max_distance` (0 if the lengths differ too much)."""
+    if a.duration and b.duration and abs(a.duration - b.duration) / max(a.duration, b.duration) > MAX_DURATION_DELTA:
+        return 0.0
+    pairs = [(x, y) for x, y in zip(a.frame_hashes, b.frame_hashes) if x is not None and y is not None]
+    if len(pairs) < FINGERPRINT_FRAMES // 2:
+        return 0.0
+    return sum(hamming(x, y) <= max_distance for x, y in pairs) / len(pairs)
+
+
+class BKTree:
+    """BK-tree over 64-bit hashes (Hamming metric); every node keeps the ids of the videos containing it."""
+
+    def __init__(self):
+        self._root: Optional[list] = None  # [hash, ids, {distance: child}]
+        self.size = 0
+
+    def add(self, value: int, item_id: str) -> None:
+        if self._root is None:
+            self._root = [value, {item_id}, {}]
+            self.size += 1
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].add(item_id)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, {item_id}, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> List[Tuple[int, str]]:
+        """All (distance, id) pairs within `radius` of `value`."""
+        results: List[Tuple[int, str]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                results.extend((distance, item_id) for item_id in node[1])
+            # Triangle inequality: only children in [d - r, d + r] can contain matches.
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return results
+
+
+class VideoMatch(BaseModel):
+    """A prior video that matches an incoming one."""
+    video_id: str
+    confidence: float
+    exact: bool
+    analysis: Dict[str, Any]
+
+
+class FingerprintIndex:
+    """Persistent fingerprint → analysis store with a BK-tree lookup. Thread-safe."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or data_path("fingerprints.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS video_fingerprints (
+                sha256 TEXT PRIMARY KEY,
+                duration REAL NOT NULL,
+                frame_hashes TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._tree = BKTree()
+        self._fingerprints: Dict[str, VideoFingerprint] = {}
+        for sha256, duration, frame_hashes in self._conn.execute("SELECT sha256, duration, frame_hashes FROM video_fingerprints"):
+            self._insert(VideoFingerprint(sha256=sha256, duration=duration, frame_hashes=json.loads(frame_hashes)))
+
+    def _insert(self, fingerprint: VideoFingerprint) -> None:
+        self._fingerprints[fingerprint.sha256] = fingerprint
+        for frame_hash in fingerprint.frame_hashes:
+            if frame_hash is not None:
+                self._tree.add(frame_hash, fingerprint.sha256)
+
+    def add(self, fingerprint: VideoFingerprint, analysis: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO video_fingerprints (sha256, duration, frame_hashes, analysis, created_at) VALUES (?, ?, ?, ?, ?)",
+                (fingerprint.sha256, fingerprint.duration, json.dumps(fingerprint.frame_hashes), json.dumps(analysis), time.time()),
+            )
+            if fingerprint.sha256 not in self._fingerprints:
+                self._insert(fingerprint)
+
+    def find(self, fingerprint: VideoFingerprint, min_confidence: float = VIDEO_DEDUP_MIN_CONFIDENCE) -> Optional[VideoMatch]:
+        """The best prior video with confidence >= min_confidence (exact byte matches first)."""
+        with self._lock:
+            if fingerprint.sha256 in self._fingerprints:
+                return VideoMatch(video_id=fingerprint.sha256, confidence=1.0, exact=True, analysis=self._analysis(fingerprint.sha256))
+
+            votes: Dict[str, int] = {}
+            for frame_hash in fingerprint.frame_hashes:
+                if frame_hash is None:
+                    continue
+                for item_id in {item_id for _, item_id in self._tree.search(frame_hash, FRAME_MATCH_DISTANCE)}:
+                    votes[item_id] = votes.get(item_id, 0) + 1
+
+            best: Optional[Tuple[float, str]] = None
+            needed = min_confidence * fingerprint.informative_frames / 2
+            for item_id, count in votes.items():
+                if count < needed:
+                    continue
+                confidence = match_confidence(fingerprint, self._fingerprints[item_id])
+                if confidence >= min_confidence and (best is None or confidence > best[0]):
+                    best = (confidence, item_id)
+            if best is None:
+                return None
+            return VideoMatch(video_id=best[1], confidence=round(best[0], 3), exact=False, analysis=self._analysis(best[1]))
+
+    def _analysis(self, sha256: str) -> Dict[str, Any]:
+        row = self._conn.execute("SELECT analysis FROM video_fingerprints WHERE sha256 = ?", (sha256,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+_index: Optional[FingerprintIndex] = None
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+    """Process-wide index (created on first use)."""
+    global _index
+    if _index is None:
+        _index = FingerprintIndex()
+    return _index
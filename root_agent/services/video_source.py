@@ -0,0 +1,146 @@
+"""
+Service: Video Source
+Read-only video bytes without full copies. Local files are memory-mapped, in-memory videos
+(e.g. decoded inline_data) are wrapped as they are; both are exposed as a memoryview.
+
+- view(start, stop): zero-copy byte slice
+- chunks(): fixed-size memoryview chunks for hashing and streaming
+- sha256(): incremental hash over the chunks
+- base64() / iter_base64(): encoding for ADK JSON payloads; only the encoded output is allocated
+- pickling (offload pool): file-backed sources are re-mapped by path in the worker process (the
+  pool closes that copy once the task is done)
+- local_path(): a file path for decoders (ffmpeg/cv2) – the file itself if the source is
+  file-backed, otherwise a temporary file written chunk by chunk
+
+Memory stays flat for large local clips: the mapped pages belong to the page cache, are loaded
+on demand and released from the process again once a chunk has been processed.
+"""
+
+import binascii
+import hashlib
+import mimetypes
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+
+CHUNK_SIZE = 3 * 1024 * 1024  # multiple of 3, so base64 chunks concatenate without padding
+
+
+class VideoSource:
+    """Video bytes backed by an mmap (local files) or an existing buffer."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap], path: Optional[str] = None,
+                 mime_type: str = "video/mp4"):
+        self._buffer = buffer
+        self._view = memoryview(buffer).cast("B")
+        self.path = path
+        self.mime_type = mime_type
+
+    @classmethod
+    def open(cls, path: str, mime_type: Optional[str] = None) -> "VideoSource":
+        """Memory-maps a local file (read-only)."""
+        mime_type = mime_type or mimetypes.guess_type(path)[0] or "video/mp4"
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"", path=path, mime_type=mime_type)
+            # The mapping stays valid after the file object is closed.
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), path=path, mime_type=mime_type)
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview, "VideoSource"], mime_type: str = "video/mp4") -> "VideoSource":
+        if isinstance(data, VideoSource):
+            return data
+        return cls(data, mime_type=mime_type)
+
+    @property
+    def size(self) -> int:
+        return self._view.nbytes
+
+    def __len__(self) -> int:
+        return self.size
+
+    def view(self, start: int = 0, stop: Optional[int] = None) -> memoryview:
+        """Zero-copy slice of the raw bytes."""
+        return self._view[start:stop]
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE, start: int = 0, stop: Optional[int] = None) -> Iterator[memoryview]:
+        view = self.view(start, stop)
+        for offset in range(0, view.nbytes, chunk_size):
+            chunk = view[offset:offset + chunk_size]
+            yield chunk
+            self._drop_pages(start + offset, chunk.nbytes)
+
+    def _drop_pages(self, offset: int, length: int) -> None:
+        """Unmaps already processed pages from this process (they stay in the OS page cache)."""
+        if not isinstance(self._buffer, mmap.mmap) or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        aligned = offset - offset % mmap.PAGESIZE
+        self._buffer.madvise(mmap.MADV_DONTNEED, aligned, length + offset - aligned)
+
+    def sha256(self) -> str:
+        digest = hashlib.sha256()
+        for chunk in self.chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def iter_base64(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Base64 in ASCII chunks (chunk_size must be a multiple of 3), e.g. for a streamed request body."""
+        if chunk_size % 3:
+            raise ValueError("chunk_size must be a multiple of 3")
+        for chunk in self.chunks(chunk_size):
+            yield binascii.b2a_base64(chunk, newline=False)
+
+    def base64(self) -> str:
+        """Base64 string of the whole video, encoded chunk by chunk into one preallocated buffer."""
+        encoded = bytearray(4 * ((self.size + 2) // 3))
+        offset = 0
+        for piece in self.iter_base64():
+            encoded[offset:offset + len(piece)] = piece
+            offset += len(piece)
+        return encoded.decode("ascii")
+
+    def inline_data(self) -> dict:
+        """ADK JSON form of the video as a message part."""
+        return {"inline_data": {"mime_type": self.mime_type, "data": self.base64()}}
+
+    @contextmanager
+    def local_path(self, suffix: str = ".mp4") -> Iterator[str]:
+        """Path of a file with the video's bytes (the source file itself if file-backed)."""
+        if self.path is not None:
+            yield self.path
+            return
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            for chunk in self.chunks():
+                f.write(chunk)
+            path = f.name
+        try:
+            yield path
+        finally:
+            os.unlink(path)
+
+    def __reduce__(self):
+        # Pickled for the offload pool: file-backed sources are re-mapped in the worker instead of copied.
+        if self.path is not None:
+            return VideoSource.open, (self.path, self.mime_type)
+        return VideoSource, (bytes(self._view), None, self.mime_type)
+
+    def close(self) -> None:
+        """
+        Releases the buffer. If a view() or chunks() slice is still alive the mapping cannot be closed
+        yet – it is then unmapped when the last slice is garbage collected.
+        """
+        try:
+            self._view.release()
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> "VideoSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,17 +1,33 @@
 """
 Subagents package for the InsightBench Multi-Agent System.
+Exports are resolved lazily – a submodule is only imported when one of its names is used.
 """
 
-from .video_analyst_agent import video_analyst_agent
-from .insight_extractor_agent import insight_extractor_agent
-from .creator_agent import creator_agent
-from .evaluator_agent import evaluator_agent
-from .creation_evaluation_loop import creation_evaluation_loop
+from root_agent.lazy import install_lazy_exports
+
 
 __all__ = [
     "video_analyst_agent",
+    "build_drill_down_agent",
+    "root_question_drill_down",
     "insight_extractor_agent",
+    "insight_extraction_stage",
     "creator_agent",
     "evaluator_agent",
     "creation_evaluation_loop",
+    "build_creation_evaluation_loop",
+    "build_platform_fan_out",
 ]
+
+install_lazy_exports(__name__, {
+    "video_analyst_agent": ".video_analyst_agent",
+    "build_drill_down_agent": ".drill_down_agent",
+    "root_question_drill_down": ".drill_down_agent",
+    "insight_extractor_agent": ".insight_extractor_agent",
+    "insight_extraction_stage": ".insight_extractor_agent",
+    "creator_agent": ".creator_agent",
+    "evaluator_agent": ".evaluator_agent",
+    "creation_evaluation_loop": ".creation_evaluation_loop",
+    "build_creation_evaluation_loop": ".creation_evaluation_loop",
+    "build_platform_fan_out": ".platform_fan_out",
+})
@@ -1,16 +1,197 @@
 """
 Sub-Agent: Creation-Evaluation Loop
 LoopAgent wrapping Creator + Evaluator for retry logic (max 3 iterations).
+
+With SPECULATIVE_DRAFTS=true the loop is a SpeculativeCreationLoop: while the Evaluator verifies
+a draft, a speculative Creator already writes the next one from the local pre-check findings.
+If the draft is approved, the speculative draft is discarded; if it is rejected, the speculative
+draft becomes the next draft and the Creator's turn is skipped.
 """
 
-from google.adk.agents import LoopAgent
-from root_agent.subagents.creator_agent import creator_agent
-from root_agent.subagents.evaluator_agent import evaluator_agent
+import asyncio
+import logging
+import os
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from google.adk.agents import BaseAgent, LoopAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from root_agent.callbacks.hashtag_knowledge import hashtag_outcome_recorder
+from root_agent.callbacks.similar_examples import approved_example_recorder
+from root_agent.platforms import PLATFORMS, PlatformProfile
+from root_agent.subagents.creator_agent import build_creator_agent, creator_agent
+from root_agent.subagents.evaluator_agent import build_evaluator_agent, evaluator_agent
+
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_DRAFTS = os.getenv("SPECULATIVE_DRAFTS", "false").lower() in ("1", "true", "yes")
+MAX_ITERATIONS = 3
+
+
+class SpeculativeCreationLoop(BaseAgent):
+    """
+    Creator + Evaluator loop that overlaps each evaluation with the next draft.
+
+    sub_agents: [creator, evaluator, speculative creator]. The speculative Creator runs in its own
+    branch, so the Evaluator never sees its draft in the conversation history. Every decision is
+    appended to the session state under `<prefix>speculation`.
+    """
+
+    max_iterations: int = MAX_ITERATIONS
+    state_prefix: str = ""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        creator, evaluator, speculative_creator = self.sub_agents
+        draft_ready = False
+        for iteration in range(1, self.max_iterations + 1):
+            if not draft_ready:
+                async for event in creator.run_async(ctx):
+                    yield event
+
+            outcome: Dict[str, Any] = {}
+            # Every Evaluator run uses the same branch, so its history looks the same in the last iteration.
+            evaluator_ctx = ctx.model_copy(update={"branch": ctx.branch or self.name})
+            if iteration == self.max_iterations:
+                runs = {"evaluator": evaluator.run_async(evaluator_ctx)}
+            else:
+                runs = {
+                    "evaluator": evaluator.run_async(evaluator_ctx),
+                    "speculative": speculative_creator.run_async(
+                        ctx.model_copy(update={"branch": f"{ctx.branch or self.name}.{speculative_creator.name}"})
+                    ),
+                }
+            async for event in self._evaluate(runs, outcome):
+                yield event
+
+            if outcome.get("approved") or iteration == self.max_iterations:
+                if "speculative" in runs:
+                    yield self._record(ctx, iteration, "discarded")
+                return
+
+            speculative_output = ctx.session.state.get(f"{self.state_prefix}speculative_output")
+            draft_ready = bool(outcome.get("speculative_done") and speculative_output)
+            yield self._record(
+                ctx, iteration, "kept" if draft_ready else "unavailable",
+                {f"{self.state_prefix}creative_output": speculative_output} if draft_ready else None,
+            )
+
+    async def _evaluate(self, runs: Dict[str, AsyncGenerator[Event, None]], outcome: Dict[str, Any]) -> AsyncGenerator[Event, None]:
+        """
+        Runs the Evaluator and (optionally) the speculative Creator concurrently and yields their events.
+        The speculative run is cancelled as soon as the Evaluator approves.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump(name: str, events: AsyncGenerator[Event, None]) -> None:
+            try:
+                async for event in events:
+                    processed = asyncio.Event()
+                    await queue.put((name, event, processed))
+                    # Wait until the runner has appended the event (and applied its state delta).
+                    await processed.wait()
+                outcome[f"{name}_done"] = True
+            except Exception:
+                if name == "evaluator":
+                    raise
+                logger.warning("Speculative draft failed", exc_info=True)
+            finally:
+                await events.aclose()
+                await queue.put((name, None, None))
+
+        tasks = {name: asyncio.create_task(pump(name, events)) for name, events in runs.items()}
+        try:
+            running = set(tasks)
+            while running:
+                name, event, processed = await queue.get()
+                if event is None:
+                    running.discard(name)
+                    if name == "evaluator":
+                        await tasks[name]  # re-raises an Evaluator failure
+                        if outcome.get("approved") and "speculative" in running:
+                            outcome["speculative_cancelled"] = True
+                            tasks["speculative"].cancel()
+                    continue
+                if name == "speculative" and outcome.get("speculative_cancelled"):
+                    continue
+                if name == "evaluator" and event.actions.escalate:
+                    outcome["approved"] = True
+                yield event
+                processed.set()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    def _record(self, ctx: InvocationContext, iteration: int, status: str,
+                state_delta: Optional[Dict[str, Any]] = None) -> Event:
+        key = f"{self.state_prefix}speculation"
+        decisions: List[Dict[str, Any]] = list(ctx.session.state.get(key) or [])
+        decisions.append({"iteration": iteration, "status": status})
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={**(state_delta or {}), key: decisions}),
+        )
+
+
+def _build_loop(name: str, description: str, creator: BaseAgent, evaluator: BaseAgent,
+                platform: Optional[PlatformProfile] = None) -> BaseAgent:
+    platform_key = platform.key if platform else None
+    after_agent_callback = [approved_example_recorder(platform_key), hashtag_outcome_recorder(platform_key)]
+    if SPECULATIVE_DRAFTS:
+        return SpeculativeCreationLoop(
+            name=name,
+            description=description,
+            sub_agents=[creator, evaluator, build_creator_agent(platform, speculative=True)],
+            max_iterations=MAX_ITERATIONS,
+            state_prefix=f"{platform_key}_" if platform_key else "",
+            after_agent_callback=after_agent_callback,
+        )
+    return LoopAgent(
+        name=name,
+        description=description,
+        sub_agents=[creator, evaluator],
+        max_iterations=MAX_ITERATIONS,
+        after_agent_callback=after_agent_callback,
+    )
+
+
+def speculative_loop(loop: LoopAgent) -> SpeculativeCreationLoop:
+    """
+    The SpeculativeCreationLoop equivalent of a plain Creator + Evaluator loop, reusing its agents and
+    callbacks (e.g. to run a cloned pipeline with speculative drafts regardless of SPECULATIVE_DRAFTS).
+    """
+    creator, evaluator = loop.sub_agents
+    platform = next((p for key, p in PLATFORMS.items() if loop.name.startswith(f"{key}_")), None)
+    for sub_agent in loop.sub_agents:
+        sub_agent.parent_agent = None
+    return SpeculativeCreationLoop(
+        name=loop.name,
+        description=loop.description,
+        sub_agents=[creator, evaluator, build_creator_agent(platform, speculative=True)],
+        max_iterations=loop.max_iterations or MAX_ITERATIONS,
+        state_prefix=f"{platform.key}_" if platform else "",
+        before_agent_callback=loop.before_agent_callback,
+        after_agent_callback=loop.after_agent_callback,
+    )
+
+
+def build_creation_evaluation_loop(platform: PlatformProfile) -> BaseAgent:
+    """Builds an independent Creator + Evaluator loop for one target platform."""
+    return _build_loop(
+        name=f"{platform.key}_creation_evaluation_loop",
+        description=f"Iteratively creates and evaluates content for {platform.display_name} until approved or max iterations are reached.",
+        creator=build_creator_agent(platform),
+        evaluator=build_evaluator_agent(platform),
+        platform=platform,
+    )
 
 
-creation_evaluation_loop = LoopAgent(
+creation_evaluation_loop = _build_loop(
     name="creation_evaluation_loop",
     description="Iteratively creates content and evaluates it. Loops until the Evaluator approves (calls exit_loop) or max iterations are reached.",
-    sub_agents=[creator_agent, evaluator_agent],
-    max_iterations=3,
+    creator=creator_agent,
+    evaluator=evaluator_agent,
 )
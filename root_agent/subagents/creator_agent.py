@@ -3,22 +3,34 @@ Sub-Agent: Creator
 Generates social media captions and strategy using trend research.
 """
 
+import os
+from typing import Optional
+
 from google.adk.agents import Agent
 from google.adk.tools import google_search
+from root_agent.callbacks.context_cache import as_static_instruction, use_prompt_cache
+from root_agent.callbacks.draft_precheck import speculative_brief_writer
+from root_agent.callbacks.hashtag_knowledge import vetted_hashtag_suggester
+from root_agent.callbacks.model_router import CREATOR_FULL_MODEL, creator_model_router
+from root_agent.callbacks.similar_examples import similar_examples_retriever
+from root_agent.platforms import PlatformProfile, render_platform_block
+from root_agent.services.rate_limit import GOOGLE_SEARCH_BUCKET
+from root_agent.services.resilience import ResilientGemini
+
+
+# Seconds after which a slow Creator call is duplicated (0 disables hedging).
+CREATOR_HEDGE_DELAY = float(os.getenv("CREATOR_HEDGE_DELAY", "0"))
 
 
-creator_agent = Agent(
-    model="gemini-2.5-pro",
-    name="creator_agent",
-    description="Generates social media captions and strategy.",
-    instruction="""
+# Static prefix – identical for every call, served from the context cache.
+STATIC_INSTRUCTION = """
 <context>
 You are a specialized Social Media Content Creator AI. You receive structured data from a Video Analyst.
 Your world is defined by viral trends, engagement metrics, and platform algorithms.
 You have access to Google Search for real-time trend research.
 
 **Input:**
-- Insights from the Insight Extractor: {insights}
+- Insights from the Insight Extractor (provided in the <input> block).
 - If this is a revision round, check the conversation history for the Evaluator's feedback and incorporate it.
 </context>
 
@@ -63,6 +75,13 @@ NO "Corporate AI" speak (e.g., "Unlock your potential"). Use slang naturally.
 3. **Constraint:** Do not invent details not in the input. Stay grounded in the video's reality.
 4. **Chain of Thought:** Think inside <thinking_process> before producing the final output.
 5. **NO URLS:** NEVER include URLs, hyperlinks, or source links in your output. Only mention trend names, not links.
+6. **Platform:** If a <platform> block is present, its caption length, hashtag count and guidelines replace the defaults.
+7. **Examples:** If an <examples> block is present, it shows approved outputs for similar content. Use them as
+   orientation for tone, hook style and hashtag mix – never copy them; the current insights always take priority.
+8. **Vetted Hashtags:** If a <vetted_hashtags> block is present, prefer those hashtags where they fit the content –
+   they were approved before for this niche and recently verified as trending. Still research current trends.
+9. **Draft Review:** If a <draft_review> block is present, write a complete new draft that fixes every listed
+   finding and improves on the previous draft – do not just repeat it.
 </specifications>
 
 <output_format>
@@ -84,7 +103,59 @@ List each trend you found via Google Search (NO URLs or links!):
 ## Strategic Justification
 [Why this caption and hashtags embody the logic – reference your trend research above]
 </output_format>
-""",
-    tools=[google_search],
-    output_key="creative_output",
-)
+"""
+
+# Dynamic suffix – the only part that changes between calls.
+DYNAMIC_INSTRUCTION = """
+<input>
+**Insights from the Insight Extractor:**
+{insights_for_creator}
+</input>
+{similar_examples?}
+{vetted_hashtags?}
+"""
+
+
+def build_creator_agent(platform: Optional[PlatformProfile] = None, speculative: bool = False) -> Agent:
+    """
+    Builds a Creator agent, optionally bound to a target platform.
+
+    Without a platform the agent uses the default names and state keys (creator_agent → creative_output).
+    With a platform, names and state keys are prefixed with the platform key (e.g. tiktok_creator_agent
+    → tiktok_creative_output) so several Creators can run side by side on the same session state.
+
+    A speculative Creator (speculative_creator_agent → speculative_output) revises the current draft
+    from its local pre-check while the Evaluator is still running.
+    """
+    prefix = f"{platform.key}_" if platform else ""
+    role = "speculative_creator" if speculative else "creator"
+    instruction = (
+        DYNAMIC_INSTRUCTION
+        .replace("{similar_examples?}", "{" + prefix + "similar_examples?}")
+        .replace("{vetted_hashtags?}", "{" + prefix + "vetted_hashtags?}")
+    )
+    if speculative:
+        instruction += "{" + prefix + "speculative_brief}\n"
+    return Agent(
+        model=ResilientGemini(model=CREATOR_FULL_MODEL, hedge_delay=CREATOR_HEDGE_DELAY or None,
+                              rate_limit_keys=[GOOGLE_SEARCH_BUCKET]),
+        name=f"{prefix}{role}_agent",
+        description=f"Generates social media captions and strategy{f' for {platform.display_name}' if platform else ''}.",
+        static_instruction=as_static_instruction(STATIC_INSTRUCTION),
+        instruction=instruction + (render_platform_block(platform) if platform else ""),
+        tools=[google_search],
+        before_agent_callback=[
+            similar_examples_retriever(platform.key if platform else None),
+            vetted_hashtag_suggester(platform.key if platform else None),
+            *([speculative_brief_writer(platform)] if speculative else []),
+        ],
+        before_model_callback=[
+            creator_model_router(feedback_key=f"{prefix}evaluation_result",
+                                 routing_key=f"{prefix}{'speculative_' if speculative else ''}model_routing"),
+            use_prompt_cache,
+        ],
+        output_key=f"{prefix}{'speculative_output' if speculative else 'creative_output'}",
+    )
+
+
+creator_agent = build_creator_agent()
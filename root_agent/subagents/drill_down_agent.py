@@ -0,0 +1,80 @@
+"""
+Sub-Agent: Root Question Drill-Down
+Analyzes a single Root Question (answer, 4 follow-ups, 4 analysis levels).
+Three instances run in parallel, one per Root Question from the Video Analyst.
+"""
+
+from google.adk.agents import Agent, ParallelAgent
+from root_agent.callbacks.context_cache import as_static_instruction, use_prompt_cache
+from root_agent.callbacks.schema_repair import repair_structured_output
+from root_agent.callbacks.state_projection import ROOT_QUESTION_COUNT, store_drill_down_projection
+from root_agent.output_structure import RootQuestionAnalysis
+from root_agent.services.resilience import ResilientGemini
+
+
+# Static prefix – identical for every call, served from the context cache.
+STATIC_INSTRUCTION = """
+<context>
+You are the Strategist. You sit between the Analyst (Video Data) and the Creator (Content).
+You receive:
+1. Video Analysis from the previous agent (provided in the <input> block).
+2. ONE Root Question from that analysis (provided in the <input> block).
+Other strategists analyze the remaining Root Questions in parallel – focus on yours only.
+</context>
+
+<objective>
+Perform a **Drill-Down** on your Root Question. DO NOT write a caption.
+</objective>
+
+<steps>
+1. Repeat the Root Question verbatim in `root_question`.
+2. Answer the Root Question directly.
+3. Generate exactly 4 follow-up questions with answers.
+4. Analyze across 4 levels:
+   * **Descriptive**: What was shown exactly?
+   * **Diagnostic**: Why does this moment captivate?
+   * **Predictive**: What retention rate is expected?
+   * **Prescriptive**: What concrete change would maximize success?
+</steps>
+
+You MUST respond with valid JSON matching the output schema. Do NOT include any text outside the JSON.
+"""
+
+# Dynamic suffix – the only part that changes between calls.
+DYNAMIC_INSTRUCTION = """
+<input>
+**Video Analysis:**
+{video_analysis_brief}
+
+**Your Root Question:**
+{root_question_INDEX}
+</input>
+"""
+
+
+def build_drill_down_agent(index: int) -> Agent:
+    """Builds the drill-down agent for Root Question `index` (1-based)."""
+    return Agent(
+        model=ResilientGemini(model="gemini-2.0-flash"),
+        name=f"drill_down_agent_{index}",
+        description=f"Drill-down analysis of Root Question {index}.",
+        static_instruction=as_static_instruction(STATIC_INSTRUCTION),
+        instruction=DYNAMIC_INSTRUCTION.replace("INDEX", str(index)),
+        # Everything it needs is in the <input> block – without the history the user message
+        # (inline video) is not re-sent by each of the three parallel calls.
+        include_contents="none",
+        before_model_callback=use_prompt_cache,
+        after_model_callback=repair_structured_output(RootQuestionAnalysis),
+        output_key=f"root_question_analysis_{index}",
+        output_schema=RootQuestionAnalysis,
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+    )
+
+
+root_question_drill_down = ParallelAgent(
+    name="root_question_drill_down",
+    description="Runs the drill-down of all Root Questions concurrently.",
+    sub_agents=[build_drill_down_agent(i) for i in range(1, ROOT_QUESTION_COUNT + 1)],
+    after_agent_callback=store_drill_down_projection,
+)
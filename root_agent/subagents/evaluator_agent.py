@@ -3,16 +3,21 @@ Sub-Agent: Evaluator
 Validates content for facts, trends, and safety. Scores 1-10 (LLaMA-3-Eval Protocol).
 """
 
+from typing import Optional
+
 from google.adk.agents import Agent
 from google.adk.tools import google_search
+from root_agent.callbacks.context_cache import as_static_instruction, use_prompt_cache
+from root_agent.callbacks.engagement_prediction import engagement_predictor
+from root_agent.callbacks.hashtag_knowledge import hashtag_verification_lookup, hashtag_verification_recorder
+from root_agent.platforms import PlatformProfile, render_platform_block
 from root_agent.tools.exit_loop import exit_loop
+from root_agent.services.rate_limit import GOOGLE_SEARCH_BUCKET
+from root_agent.services.resilience import ResilientGemini
 
 
-evaluator_agent = Agent(
-    model="gemini-2.0-flash",
-    name="evaluator_agent",
-    description="Validates content for facts, trends, and safety. Scores 1-10.",
-    instruction="""
+# Static prefix – identical for every call, served from the context cache.
+STATIC_INSTRUCTION = """
 <context>
 You are a STRICT Quality Assurance Auditor and Devil's Advocate. Your default stance is SKEPTICAL.
 You assume the content is FLAWED until proven otherwise. You receive Draft Content from the Creator Agent.
@@ -20,10 +25,10 @@ You assume the content is FLAWED until proven otherwise. You receive Draft Conte
 **Your Mindset:** You are protecting a brand's reputation. One bad post can cause irreversible damage.
 Your job is to FIND problems, not to confirm quality. If you cannot find a clear problem, look harder.
 
-**Input:**
-- Original Video Analysis (Ground Truth): {video_analysis}
-- Generated Insights: {insights}
-- Creative Output (Caption & Hashtags): {creative_output}
+**Input (provided in the <input> block):**
+- Original Video Analysis (Ground Truth)
+- Generated Insights
+- Creative Output (Caption & Hashtags)
 </context>
 
 <objective>
@@ -36,20 +41,23 @@ You MUST use `google_search` to verify at least 2 claims before making any ratin
 **BEFORE you assign any score, you MUST complete these steps:**
 1. Call `google_search` to verify the PRIMARY claim or topic in the caption.
 2. Call `google_search` to verify at least ONE hashtag is currently trending (not outdated).
-3. Compare the caption word-by-word against {video_analysis} – flag any detail not in the original.
+   Exception: if the <hashtag_verifications> block lists one of the draft's hashtags as TRENDING, cite it as
+   `Hashtag checked: "#[hashtag]" → Result: TRENDING (knowledge base)` instead of searching it again.
+3. Compare the caption word-by-word against the Video Analysis – flag any detail not in the original.
 If you skip any of these steps, your evaluation is INVALID.
 **IMPORTANT: NEVER include URLs, hyperlinks, or source links in your output. Only reference findings by name.**
 </mandatory_verification>
 
 <red_flags>
 **Automatic score < 7 if ANY of these are detected:**
-- Caption mentions facts, stats, or details NOT present in {video_analysis} → HALLUCINATION
+- Caption mentions facts, stats, or details NOT present in the Video Analysis → HALLUCINATION
 - Hashtags that are generic (#fyp, #viral) without niche-specific tags → LAZY
 - Caption is vague or could apply to any video → NOT SPECIFIC ENOUGH
 - Caption exceeds 280 characters → FORMAT VIOLATION
 - Fewer than 5 hashtags with strategic reasoning → INCOMPLETE
 - Caption uses "Corporate AI" language ("Unlock", "Elevate", "Journey") → TONE VIOLATION
 - Trends referenced are older than 30 days based on google_search results → OUTDATED
+If a <platform> block is present, its caption limit and hashtag count replace the 280 characters / 5 hashtags above.
 </red_flags>
 
 <rating_scale>
@@ -88,7 +96,7 @@ Most first drafts deserve a 4-6. Be honest, not kind.
 
 ### Google Search Verification:
 - Claim checked: "[exact claim]" → Result: [TRUE/FALSE/UNVERIFIABLE]
-- Hashtag checked: "#[hashtag]" → Result: [TRENDING/OUTDATED/NOT FOUND]
+- Hashtag checked: "#[hashtag]" → Result: [TRENDING/OUTDATED/NOT FOUND] [add "(knowledge base)" if taken from <hashtag_verifications>]
 (Do NOT include any URLs or links in this section)
 
 ### Rating: [X]/10
@@ -112,7 +120,51 @@ Most first drafts deserve a 4-6. Be honest, not kind.
 ### STATUS: [APPROVED / NEEDS_REVISION]
 [If NEEDS_REVISION: Quote the exact problem → Explain why → Suggest specific fix]
 </output_format>
-""",
-    tools=[google_search, exit_loop],
-    output_key="evaluation_result",
-)
+"""
+
+# Dynamic suffix – the only part that changes between calls.
+DYNAMIC_INSTRUCTION = """
+<input>
+**Original Video Analysis (Ground Truth):**
+{video_analysis_brief}
+
+**Generated Insights:**
+{insights_for_evaluator}
+
+**Creative Output (Caption & Hashtags):**
+{creative_output}
+</input>
+{hashtag_verifications?}
+"""
+
+
+def build_evaluator_agent(platform: Optional[PlatformProfile] = None) -> Agent:
+    """
+    Builds an Evaluator agent, optionally bound to a target platform.
+
+    With a platform, the agent reads `<platform>_creative_output` and writes `<platform>_evaluation_result`.
+    """
+    prefix = f"{platform.key}_" if platform else ""
+    instruction = (
+        DYNAMIC_INSTRUCTION
+        .replace("{creative_output}", "{" + prefix + "creative_output}")
+        .replace("{hashtag_verifications?}", "{" + prefix + "hashtag_verifications?}")
+    )
+    return Agent(
+        model=ResilientGemini(model="gemini-2.0-flash", rate_limit_keys=[GOOGLE_SEARCH_BUCKET]),
+        name=f"{prefix}evaluator_agent",
+        description="Validates content for facts, trends, and safety. Scores 1-10.",
+        static_instruction=as_static_instruction(STATIC_INSTRUCTION),
+        instruction=instruction + (render_platform_block(platform) if platform else ""),
+        tools=[google_search, exit_loop],
+        before_agent_callback=[
+            hashtag_verification_lookup(platform.key if platform else None),
+            engagement_predictor(platform.key if platform else None),
+        ],
+        before_model_callback=use_prompt_cache,
+        after_model_callback=hashtag_verification_recorder(),
+        output_key=f"{prefix}evaluation_result",
+    )
+
+
+evaluator_agent = build_evaluator_agent()
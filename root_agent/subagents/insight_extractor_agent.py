@@ -1,21 +1,27 @@
 """
 Sub-Agent: Insight Extractor
 Synthesizes analysis into a content strategy via multi-step drill-down.
+
+The drill-down of the 3 Root Questions runs in parallel (see drill_down_agent.py);
+this agent only merges the results into the strategy fields of StrategySchema.
 """
 
-from google.adk.agents import Agent
-from root_agent.output_structure import StrategySchema
+from google.adk.agents import Agent, SequentialAgent
+from root_agent.callbacks.context_cache import as_static_instruction, use_prompt_cache
+from root_agent.callbacks.schema_repair import repair_structured_output
+from root_agent.callbacks.state_projection import store_insights_projection
+from root_agent.output_structure import StrategySummarySchema
+from root_agent.services.resilience import ResilientGemini
+from root_agent.subagents.drill_down_agent import root_question_drill_down
 
 
-insight_extractor_agent = Agent(
-    model="gemini-2.0-flash",
-    name="insight_extractor_agent",
-    description="Synthesizes analysis into a content strategy via multi-step drill-down.",
-    instruction="""
+# Static prefix – identical for every call, served from the context cache.
+STATIC_INSTRUCTION = """
 <context>
 You are the Strategist. You sit between the Analyst (Video Data) and the Creator (Content).
 You receive:
-1. Video Analysis from the previous agent: {video_analysis}
+1. Video Analysis from the previous agent (provided in the <input> block).
+2. Drill-Down results for each of the 3 Root Questions (provided in the <input> block).
 </context>
 
 <objective>
@@ -27,21 +33,42 @@ DO NOT write the caption yourself. Define the *angle* and strategy.
 1. Identify the single `most_engaging_element` from the video data.
 2. Define `hook_strategy`: How to stop the scroll in the first 3 seconds.
 3. Define `psychological_angle`: Why will people share this? (Humor, Shock, Relatability?)
-4. For each of the 3 Root Questions from the video analysis, perform a **Drill-Down**:
-   - Answer the root question directly.
-   - Generate exactly 4 follow-up questions with answers.
-   - Analyze across 4 levels:
-     * **Descriptive**: What was shown exactly?
-     * **Diagnostic**: Why does this moment captivate?
-     * **Predictive**: What retention rate is expected?
-     * **Prescriptive**: What concrete change would maximize success?
-5. Write a `prescriptive_summary` combining all prescriptive insights.
+4. Write a `prescriptive_summary` combining the prescriptive insights of all 3 Drill-Downs.
 </steps>
 
 You MUST respond with valid JSON matching the output schema. Do NOT include any text outside the JSON.
-""",
-    output_key="insights",
-    output_schema=StrategySchema,
+"""
+
+# Dynamic suffix – the only part that changes between calls.
+DYNAMIC_INSTRUCTION = """
+<input>
+**Video Analysis:**
+{video_analysis_brief}
+
+**Root Question Drill-Downs:**
+{drill_down_brief}
+</input>
+"""
+
+
+insight_extractor_agent = Agent(
+    model=ResilientGemini(model="gemini-2.0-flash"),
+    name="insight_extractor_agent",
+    description="Merges the Root Question drill-downs into a content strategy.",
+    static_instruction=as_static_instruction(STATIC_INSTRUCTION),
+    instruction=DYNAMIC_INSTRUCTION,
+    before_model_callback=use_prompt_cache,
+    after_model_callback=repair_structured_output(StrategySummarySchema),
+    after_agent_callback=store_insights_projection,
+    output_key="strategy_summary",
+    output_schema=StrategySummarySchema,
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
 )
+
+
+insight_extraction_stage = SequentialAgent(
+    name="insight_extraction_stage",
+    description="Parallel Root Question drill-downs followed by the strategy merge step.",
+    sub_agents=[root_question_drill_down, insight_extractor_agent],
+)
@@ -0,0 +1,43 @@
+"""
+Sub-Agent: Platform Fan-Out
+Runs one Creation-Evaluation Loop per target platform concurrently on the shared
+`video_analysis` / `insights` state and collects all results under `platform_results`.
+"""
+
+from typing import List, Optional
+
+from google.adk.agents import ParallelAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from root_agent.callbacks.similar_examples import parse_evaluation
+from root_agent.platforms import PlatformProfile
+from root_agent.subagents.creation_evaluation_loop import build_creation_evaluation_loop
+
+
+def build_platform_fan_out(platforms: List[PlatformProfile]) -> ParallelAgent:
+    """Builds a ParallelAgent with one Creation-Evaluation Loop per platform."""
+
+    def collect_platform_results(callback_context: CallbackContext) -> Optional[types.Content]:
+        state = callback_context.state
+        results = {}
+        for platform in platforms:
+            evaluation = str(state.get(f"{platform.key}_evaluation_result") or "")
+            rating, approved = parse_evaluation(evaluation)
+            results[platform.key] = {
+                "platform": platform.display_name,
+                "creative_output": state.get(f"{platform.key}_creative_output"),
+                "evaluation_result": evaluation or None,
+                "rating": rating,
+                "approved": approved,
+                "speculation": state.get(f"{platform.key}_speculation"),
+                "predicted_engagement": state.get(f"{platform.key}_predicted_engagement"),
+            }
+        state["platform_results"] = results
+        return None
+
+    return ParallelAgent(
+        name="platform_fan_out",
+        description="Creates and evaluates one caption variant per target platform in parallel.",
+        sub_agents=[build_creation_evaluation_loop(platform) for platform in platforms],
+        after_agent_callback=collect_platform_results,
+    )
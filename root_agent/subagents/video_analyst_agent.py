@@ -4,14 +4,17 @@ Extracts the data structure of social media content and formulates Root Question
 """
 
 from google.adk.agents import Agent
+from root_agent.callbacks.audio_features import measure_audio_features
+from root_agent.callbacks.context_cache import as_static_instruction, use_prompt_cache
+from root_agent.callbacks.schema_repair import repair_structured_output
+from root_agent.callbacks.state_projection import store_video_analysis_projection
+from root_agent.callbacks.video_dedup import remember_video_analysis, reuse_prior_analysis
 from root_agent.output_structure import VideoAnalysisSchema
+from root_agent.services.resilience import ResilientGemini
 
 
-video_analyst_agent = Agent(
-    model="gemini-2.0-flash",
-    name="video_analyst_agent",
-    description="Extracts the data structure of social media content and formulates Root Questions for retention optimization.",
-    instruction="""
+# Static prefix – identical for every call; the video arrives in the user message.
+STATIC_INSTRUCTION = """
 <context>
 You are an advanced Computer Vision and Audio Analysis AI Agent in a multi-agent system.
 Your task is to transform video input (or descriptions) into structured data that serves as
@@ -38,10 +41,33 @@ Attitude: Clinical, objective, precise – you describe observable reality witho
    - Question 3: How can this be optimized?
 4. **Clinical Style:** No human conversation, only structured data output.
 5. **Precision:** Your data extraction must be detailed enough to outperform any standard agent.
+6. **Audio:** If an <audio_features> block is present, it was measured from the original audio track (loudness,
+   speech/music, onset density, BPM). Base all statements about sound on it – the video you receive may be muted
+   or compressed – and include the audio in `hook_type` and `unique_visual_elements` where it shapes the hook.
 </specifications>
 
 You MUST respond with valid JSON matching the output schema. Do NOT include any text outside the JSON.
-""",
+"""
+
+# Dynamic suffix – locally measured audio features (only present for uploaded videos).
+DYNAMIC_INSTRUCTION = """
+<input>
+The video (or its description) to analyze is in the user message.
+</input>
+{audio_features?}
+"""
+
+
+video_analyst_agent = Agent(
+    model=ResilientGemini(model="gemini-2.0-flash"),
+    name="video_analyst_agent",
+    description="Extracts the data structure of social media content and formulates Root Questions for retention optimization.",
+    static_instruction=as_static_instruction(STATIC_INSTRUCTION),
+    instruction=DYNAMIC_INSTRUCTION,
+    before_agent_callback=[measure_audio_features, reuse_prior_analysis],
+    before_model_callback=use_prompt_cache,
+    after_model_callback=repair_structured_output(VideoAnalysisSchema),
+    after_agent_callback=[store_video_analysis_projection, remember_video_analysis],
     output_key="video_analysis",
     output_schema=VideoAnalysisSchema,
     disallow_transfer_to_parent=True,
@@ -0,0 +1,162 @@
+"""
+Execution backends for the scenario runner.
+
+  live    – runs the real pipeline against Gemini (optionally records the run for replay)
+  replay  – rebuilds a run from a recorded event log in test/recordings/ (offline, no model calls)
+  stub    – runs the real agent graph with a deterministic offline model (tests the plumbing, stub.py)
+
+The offline backends (replay, stub) run against a temporary data directory and the local hashing
+embedder, so test runs never write into the production stores (hashtag knowledge base, example
+index, engagement model, run logs, Parquet export) and never call the embedding API.
+
+A scenario may name a registered variant (variants.py), e.g. "variant": "speculative_drafts";
+the live and stub backends then run that variant instead of the default pipeline.
+
+The agent pipeline (and with it ADK) is only imported by the live and stub backends,
+so replay runs start without that cost.
+"""
+
+import asyncio
+import atexit
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from root_agent.services.paths import use_data_dir
+from root_agent.services.run_log import read_log_file, run_log_path
+from root_agent.services.video_source import VideoSource
+from root_agent.test.checks import RunResult
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(TEST_DIR, "..", ".."))
+RECORDINGS_DIR = os.path.join(TEST_DIR, "recordings")
+
+_offline_data_dir: Optional[str] = None
+
+
+def use_offline_data_dir() -> str:
+    """Isolates offline runs: temporary data directory (removed at exit) and the hashing embedder."""
+    global _offline_data_dir
+    if _offline_data_dir is None:
+        from root_agent.services.example_index import HASHING_EMBEDDER, use_embedder
+
+        _offline_data_dir = tempfile.mkdtemp(prefix="agent-offline-")
+        atexit.register(shutil.rmtree, _offline_data_dir, ignore_errors=True)
+        use_data_dir(_offline_data_dir)
+        use_embedder(HASHING_EMBEDDER)
+    return _offline_data_dir
+
+
+def build_parts(case: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Builds the message parts (text + optional video) of a scenario in ADK JSON form."""
+    parts: List[Dict[str, Any]] = [{"text": case["user_input"]}]
+    video_file = case.get("video_file")
+    if video_file:
+        video_path = os.path.join(TEST_DIR, video_file)
+        # Fallback: check root dir if not found in test dir
+        if not os.path.exists(video_path):
+            video_path = os.path.join(ROOT_DIR, video_file)
+        with VideoSource.open(video_path, mime_type="video/mp4") as video:
+            parts.append(video.inline_data())
+    return parts
+
+
+async def build_parts_offloaded(case: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """build_parts in a thread if the scenario has a video (text-only parts are built inline)."""
+    if case.get("video_file"):
+        # Encoding straight from the mmap; a worker process would have to pickle the payload back.
+        return await asyncio.to_thread(build_parts, case)
+    return build_parts(case)
+
+
+def recording_path(case: Dict[str, Any], directory: str = RECORDINGS_DIR) -> str:
+    return os.path.join(directory, f"{case['test_case_id']}.jsonl.gz")
+
+
+class PipelineBackend:
+    """Base of the backends that execute the agent graph: one runner for `agent`, one per scenario variant."""
+
+    def __init__(self, agent=None):
+        self.agent = agent
+        self.runner = self.create_runner(agent)
+        self._variant_runners: Dict[str, Any] = {}
+
+    def create_runner(self, agent):
+        raise NotImplementedError
+
+    def runner_for(self, case: Dict[str, Any]):
+        """The runner of the scenario's variant (a backend built for an explicit `agent` always uses that)."""
+        variant = case.get("variant")
+        if not variant or self.agent is not None:
+            return self.runner
+        if variant not in self._variant_runners:
+            from root_agent.test.variants import build_variant
+
+            self._variant_runners[variant] = self.create_runner(build_variant(variant))
+        return self._variant_runners[variant]
+
+
+class LiveBackend(PipelineBackend):
+    """Runs the real pipeline (or `agent`). With `record`, the run's event log is copied to `recordings_dir`."""
+    name = "live"
+
+    def __init__(self, record: bool = False, agent=None, recordings_dir: str = RECORDINGS_DIR):
+        self.record = record
+        self.recordings_dir = recordings_dir
+        super().__init__(agent)
+
+    def create_runner(self, agent):
+        from root_agent.services.runner import create_runner
+
+        return create_runner(agent=agent)
+
+    async def run(self, case: Dict[str, Any]) -> RunResult:
+        from root_agent.services.runner import run_pipeline
+
+        result = await run_pipeline(self.runner_for(case), await build_parts_offloaded(case), user_id="eval_bot")
+        if self.record:
+            os.makedirs(self.recordings_dir, exist_ok=True)
+            shutil.copyfile(run_log_path(result["session_id"]), recording_path(case, self.recordings_dir))
+        return RunResult(**result)
+
+
+class ReplayBackend:
+    """Rebuilds events and final state from a recorded event log."""
+    name = "replay"
+
+    def __init__(self, recordings_dir: str = RECORDINGS_DIR):
+        use_offline_data_dir()
+        self.recordings_dir = recordings_dir
+
+    async def run(self, case: Dict[str, Any]) -> RunResult:
+        path = recording_path(case, self.recordings_dir)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No recording for {case['test_case_id']} (record it with --backend live --record)")
+
+        records = read_log_file(path)
+        events, state = [], {}
+        for record in records:
+            if record.get("type") != "event":
+                continue
+            state.update(record.get("state_delta") or {})
+            events.extend({"author": record.get("author", ""), "text": text} for text in record.get("text_parts", []))
+        session_id = next((r.get("session_id") for r in records if r.get("type") == "run_start"), None)
+        return RunResult(session_id=session_id, events=events, state=state)
+
+
+BACKENDS = ("live", "replay", "stub")
+
+
+def create_backend(name: str, record: bool = False, agent=None, recordings_dir: str = RECORDINGS_DIR):
+    """Creates a backend by name (`agent`: pipeline variant to run instead of root_agent, live and stub only)."""
+    if name == "live":
+        return LiveBackend(record=record, agent=agent, recordings_dir=recordings_dir)
+    if name == "replay":
+        return ReplayBackend(recordings_dir=recordings_dir)
+    if name == "stub":
+        from root_agent.test.stub import StubBackend
+
+        return StubBackend(agent=agent)
+    raise ValueError(f"Unknown backend: {name}. Available: {', '.join(BACKENDS)}")
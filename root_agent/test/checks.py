@@ -0,0 +1,209 @@
+"""
+Pluggable scoring checks for the scenario runner.
+
+A check receives the scenario and the run result and returns one CheckResult per
+thing it verified. Register new checks with @register_check("name"); scenarios pick
+their checks via "checks": [...] (default: DEFAULT_CHECKS).
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, ValidationError
+from root_agent.output_structure import StrategySchema, VideoAnalysisSchema
+from root_agent.platforms import PLATFORMS
+
+
+DEFAULT_CHECKS = ["keywords", "video_analysis_schema", "insights_schema", "caption_length", "hashtag_count"]
+
+# Limits of the single-platform pipeline (CreatorOutputSchema).
+DEFAULT_CAPTION_MAX_LENGTH = 280
+DEFAULT_HASHTAG_COUNT = 5
+
+_NUMBERED_HASHTAG_PATTERN = re.compile(r"^\s*\d+\.\s*\**\s*(#[\wÀ-ɏ]+)", re.MULTILINE)
+
+
+class CheckResult(BaseModel):
+    """Outcome of a single check."""
+    name: str
+    passed: bool
+    message: str = ""
+
+
+class RunResult(BaseModel):
+    """What a backend returns for one scenario."""
+    session_id: Optional[str] = None
+    events: List[Dict[str, Any]] = []
+    state: Dict[str, Any] = {}
+
+    @property
+    def full_text(self) -> str:
+        return "\n".join(f"[{entry.get('author', '')}]: {entry.get('text', '')}" for entry in self.events)
+
+
+Check = Callable[[Dict[str, Any], RunResult], List[CheckResult]]
+CHECKS: Dict[str, Check] = {}
+
+
+def register_check(name: str):
+    """Decorator that registers a check under `name`."""
+    def decorator(check: Check) -> Check:
+        CHECKS[name] = check
+        return check
+    return decorator
+
+
+def parse_creator_output(text: str) -> Dict[str, Any]:
+    """Extracts the caption and the numbered strategic hashtags from the Creator's markdown."""
+    caption, hashtags = "", []
+    for section in (text or "").split("##"):
+        heading, _, body = section.strip().partition("\n")
+        heading = heading.strip().lower()
+        if heading.startswith("caption"):
+            caption = body.strip()
+        elif heading.startswith("strategic hashtag"):
+            hashtags = _NUMBERED_HASHTAG_PATTERN.findall(body)
+    return {"caption": caption, "hashtags": hashtags}
+
+
+def creator_outputs(case: Dict[str, Any], result: RunResult) -> List[tuple]:
+    """Returns (label, creator text, platform profile) for every Creator output of the run."""
+    platform_results = result.state.get("platform_results") or {}
+    if platform_results:
+        return [(key, entry.get("creative_output") or "", PLATFORMS.get(key)) for key, entry in platform_results.items()]
+    platform = PLATFORMS.get(case.get("platform", ""))
+    return [("creator", result.state.get("creative_output") or "", platform)]
+
+
+def _validate(name: str, schema: type, value: Any) -> CheckResult:
+    if value is None:
+        return CheckResult(name=name, passed=False, message="missing in state")
+    try:
+        schema.model_validate(value)
+    except ValidationError as e:
+        return CheckResult(name=name, passed=False, message=f"{e.error_count()} validation error(s): {e.errors()[0]['msg']}")
+    return CheckResult(name=name, passed=True)
+
+
+@register_check("keywords")
+def check_keywords(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    """Case-insensitive keyword containment over all agent texts."""
+    text = result.full_text.lower()
+    missing = [keyword for keyword in case.get("expected_output_contains", []) if keyword.lower() not in text]
+    return [CheckResult(name="keywords", passed=not missing, message=f"missing: {missing}" if missing else "")]
+
+
+@register_check("video_analysis_schema")
+def check_video_analysis_schema(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    return [_validate("video_analysis_schema", VideoAnalysisSchema, result.state.get("video_analysis"))]
+
+
+@register_check("insights_schema")
+def check_insights_schema(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    return [_validate("insights_schema", StrategySchema, result.state.get("insights"))]
+
+
+@register_check("caption_length")
+def check_caption_length(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    results = []
+    for label, text, platform in creator_outputs(case, result):
+        limit = platform.caption_max_length if platform else DEFAULT_CAPTION_MAX_LENGTH
+        caption = parse_creator_output(text)["caption"]
+        if not caption:
+            results.append(CheckResult(name=f"caption_length[{label}]", passed=False, message="no caption found"))
+        else:
+            results.append(CheckResult(
+                name=f"caption_length[{label}]",
+                passed=len(caption) <= limit,
+                message=f"{len(caption)}/{limit} characters",
+            ))
+    return results
+
+
+@register_check("hashtag_count")
+def check_hashtag_count(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    results = []
+    for label, text, platform in creator_outputs(case, result):
+        expected = platform.hashtag_count if platform else DEFAULT_HASHTAG_COUNT
+        hashtags = parse_creator_output(text)["hashtags"]
+        results.append(CheckResult(
+            name=f"hashtag_count[{label}]",
+            passed=len(hashtags) == expected,
+            message=f"{len(hashtags)} hashtag(s), expected {expected}",
+        ))
+    return results
+
+
+def resolve_path(state: Dict[str, Any], path: str) -> Any:
+    """Resolves a dotted state path like 'video_analysis.schema_extraction.hook_type'."""
+    value: Any = state
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+@register_check("expected_fields")
+def check_expected_fields(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    """Every path in `expected_fields` is non-empty and, if a value is given, contains it (case-insensitive)."""
+    results = []
+    for path, expected in (case.get("expected_fields") or {}).items():
+        value = resolve_path(result.state, path)
+        if not value:
+            results.append(CheckResult(name=f"field[{path}]", passed=False, message="missing or empty"))
+        elif expected is not None and expected.lower() not in str(value).lower():
+            results.append(CheckResult(name=f"field[{path}]", passed=False, message=f"expected '{expected}', got '{str(value)[:80]}'"))
+        else:
+            results.append(CheckResult(name=f"field[{path}]", passed=True))
+    return results
+
+
+@register_check("approved")
+def check_approved(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    """The Evaluator approved the final draft, per platform in multi-platform runs (optional, not in DEFAULT_CHECKS)."""
+    platform_results = result.state.get("platform_results") or {}
+    evaluations = [(f"approved[{key}]", entry.get("evaluation_result")) for key, entry in platform_results.items()]
+    results = []
+    for name, evaluation in evaluations or [("approved", result.state.get("evaluation_result"))]:
+        evaluation = str(evaluation or "").upper()
+        results.append(CheckResult(name=name, passed="APPROVED" in evaluation and "NEEDS_REVISION" not in evaluation))
+    return results
+
+
+@register_check("speculation")
+def check_speculation(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    """
+    Speculative loops (optional, not in DEFAULT_CHECKS): every loop recorded its decisions, they match
+    `expected_speculation` if given, and the loop ended with a final draft in creative_output.
+    """
+    platform_results = result.state.get("platform_results") or {}
+    loops = [(key, entry.get("speculation"), entry.get("creative_output")) for key, entry in platform_results.items()]
+    if not loops:
+        loops = [("loop", result.state.get("speculation"), result.state.get("creative_output"))]
+    expected = case.get("expected_speculation")
+    results = []
+    for label, decisions, creative_output in loops:
+        statuses = [decision.get("status") for decision in decisions or []]
+        if not statuses:
+            message = "no speculation decisions recorded"
+        elif expected is not None and statuses != expected:
+            message = f"expected {expected}, got {statuses}"
+        elif not creative_output:
+            message = "no final draft in creative_output"
+        else:
+            message = ""
+        results.append(CheckResult(name=f"speculation[{label}]", passed=not message, message=message or " → ".join(statuses)))
+    return results
+
+
+def run_checks(case: Dict[str, Any], result: RunResult) -> List[CheckResult]:
+    """Runs the checks selected by the scenario."""
+    results: List[CheckResult] = []
+    for name in case.get("checks", DEFAULT_CHECKS):
+        check = CHECKS.get(name)
+        if check is None:
+            results.append(CheckResult(name=name, passed=False, message="unknown check"))
+            continue
+        results.extend(check(case, result))
+    return results
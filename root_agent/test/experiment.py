@@ -0,0 +1,398 @@
+"""
+A/B experiment harness: runs registered pipeline variants (variants.py) over the same scenarios.
+
+Every scenario runs once per variant (× --repeats) through one shared worker pool; the runs are
+interleaved per scenario with a rotating variant order, so load and rate limits during the
+experiment hit all variants alike. Before measuring, every variant runs the first scenario
+untimed (--warmup), so lazy initialization is not charged to the first variant. Per run the metrics come from the run's event log (the
+recording for the replay backend):
+
+  iterations   Creator calls until the loop ended (approval or max_iterations)
+  approval     share of approved drafts (per platform in multi-platform runs)
+  rating       Evaluator score (1-10), also reported as a distribution
+  checks       share of passed scenario checks (checks.py)
+  tokens       prompt + output tokens, model_calls
+  latency      run duration and stage durations (video analysis, insight extraction, creation), p50/p95
+
+Each variant is compared with the first one (normally baseline). Mean metrics use a paired
+sign-flip permutation test over the per-scenario differences (p-value) plus a bootstrap 95% CI;
+p50/p95 latencies get a bootstrap CI, and a bootstrap p-value over scenarios only from
+MIN_PERCENTILE_SCENARIOS scenarios on (below that it is too coarse to test). A report tests many
+metrics for every variant, so significance is only marked after a Holm correction over all
+p-values of the experiment (p_adjusted). No extra dependencies – these are plain resampling
+estimates, with few scenarios they are wide.
+
+Replay needs a recording per variant: baseline uses test/recordings/ (the same as msg.py), other
+variants test/recordings/variants/<variant>/ (record them with --backend live --record).
+
+    uv run python root_agent/test/experiment.py --backend stub --variants baseline max_iterations_2
+    uv run python root_agent/test/experiment.py --backend live --suite ci --variants baseline creator_no_slang --repeats 2 --record
+    uv run python root_agent/test/experiment.py --backend replay --suite ci --variants baseline creator_no_slang --json reports/ab.json
+    uv run python root_agent/test/experiment.py --list
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+if sys.platform == "win32":
+    sys.stdout.reconfigure(encoding='utf-8')
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+sys.path.append(root_dir)
+
+load_dotenv(os.path.join(root_dir, "root_agent", ".env"))
+
+from pydantic import BaseModel
+from root_agent.services.run_export import RunSummary, flatten_run, summary_from_run_log
+from root_agent.services.run_log import read_log_file, read_run_log, run_log_path
+from root_agent.test.backends import BACKENDS, RECORDINGS_DIR, create_backend, recording_path
+from root_agent.test.checks import RunResult, run_checks
+from root_agent.test.msg import DEFAULT_SCENARIOS
+from root_agent.test.scenario_generator import DEFAULT_PER_STRATUM, DEFAULT_SEED, SUITES, build_suite
+from root_agent.test.variants import BASELINE, VARIANTS, build_variant
+
+
+MEAN_METRICS = ("iterations", "approval", "rating", "checks", "tokens", "model_calls")
+LATENCY_METRICS = ("duration_ms", "video_analysis_ms", "insight_extraction_ms", "creation_ms")
+PERCENTILES = (50, 95)
+# Fewer scenarios give too few distinct bootstrap percentiles for a p-value (the CI is still reported).
+MIN_PERCENTILE_SCENARIOS = 10
+
+
+class RunMetrics(BaseModel):
+    """Metrics of one run of one variant."""
+    variant: str
+    test_case_id: str
+    repeat: int
+    error: Optional[str] = None
+    session_id: Optional[str] = None
+    iterations: Optional[float] = None
+    approval: Optional[float] = None
+    rating: Optional[float] = None
+    ratings: List[int] = []
+    checks: Optional[float] = None
+    tokens: Optional[int] = None
+    model_calls: Optional[int] = None
+    duration_ms: Optional[float] = None
+    video_analysis_ms: Optional[float] = None
+    insight_extraction_ms: Optional[float] = None
+    creation_ms: Optional[float] = None
+
+
+def variant_recordings_dir(variant: str) -> str:
+    return RECORDINGS_DIR if variant == BASELINE else os.path.join(RECORDINGS_DIR, "variants", variant)
+
+
+def _mean(values: Sequence[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return statistics.fmean(values) if values else None
+
+
+def run_metrics(variant: str, case: Dict[str, Any], repeat: int, result: RunResult,
+                records: List[Dict[str, Any]], wall_ms: float) -> RunMetrics:
+    """Metrics of a finished run (from its event log; without one only from the result state)."""
+    summary = summary_from_run_log(records) if records else None
+    if summary is None:
+        summary = RunSummary(session_id=result.session_id or "", started_at=time.time(), duration_ms=wall_ms, state=result.state)
+    rows = flatten_run(summary)
+    checks = run_checks(case, result)
+    ratings = [row["rating"] for row in rows if row["rating"] is not None]
+    return RunMetrics(
+        variant=variant,
+        test_case_id=case["test_case_id"],
+        repeat=repeat,
+        session_id=result.session_id,
+        iterations=_mean([row["creator_calls"] for row in rows]),
+        approval=_mean([1.0 if row["approved"] else 0.0 for row in rows]),
+        rating=_mean(ratings),
+        ratings=ratings,
+        checks=_mean([1.0 if check.passed else 0.0 for check in checks]),
+        tokens=summary.prompt_tokens + summary.output_tokens,
+        model_calls=summary.model_calls,
+        duration_ms=summary.duration_ms if summary.duration_ms is not None else wall_ms,
+        **{column: _mean([row[column] for row in rows]) for column in LATENCY_METRICS[1:]},
+    )
+
+
+async def run_variant_case(variant: str, backend, case: Dict[str, Any], repeat: int,
+                           semaphore: asyncio.Semaphore, timeout: float) -> RunMetrics:
+    async with semaphore:
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(backend.run(case), timeout=timeout)
+        except asyncio.TimeoutError:
+            return RunMetrics(variant=variant, test_case_id=case["test_case_id"], repeat=repeat, error=f"Timeout after {timeout:.0f}s")
+        except Exception as e:
+            return RunMetrics(variant=variant, test_case_id=case["test_case_id"], repeat=repeat, error=f"{type(e).__name__}: {e}")
+        wall_ms = round((time.monotonic() - started) * 1000, 1)
+
+    if backend.name == "replay":
+        records = read_log_file(recording_path(case, backend.recordings_dir))
+    elif result.session_id and os.path.exists(run_log_path(result.session_id)):
+        records = read_run_log(result.session_id)
+    else:
+        records = []
+    return run_metrics(variant, case, repeat, result, records, wall_ms)
+
+
+# ----------------------------------------------------------------------------
+# Statistics
+# ----------------------------------------------------------------------------
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """q-th percentile with linear interpolation (None for no values)."""
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def permutation_p_value(diffs: Sequence[float], resamples: int, rng: random.Random) -> Optional[float]:
+    """Two-sided paired sign-flip permutation test of mean(diffs) = 0."""
+    if not diffs:
+        return None
+    observed = abs(statistics.fmean(diffs))
+    if observed == 0:
+        return 1.0
+    extreme = sum(
+        abs(statistics.fmean([d if rng.random() < 0.5 else -d for d in diffs])) >= observed - 1e-12
+        for _ in range(resamples)
+    )
+    return (extreme + 1) / (resamples + 1)
+
+
+def bootstrap(statistic, samples: Sequence[Any], resamples: int, rng: random.Random) -> List[float]:
+    """statistic(resampled samples) for `resamples` bootstrap resamples (None results dropped)."""
+    if not samples:
+        return []
+    return [value for value in (statistic(rng.choices(samples, k=len(samples))) for _ in range(resamples)) if value is not None]
+
+
+def bootstrap_ci(statistic, samples: Sequence[Any], resamples: int, rng: random.Random) -> Tuple[Optional[float], Optional[float]]:
+    """95% percentile bootstrap interval of statistic(resampled samples)."""
+    estimates = bootstrap(statistic, samples, resamples, rng)
+    return percentile(estimates, 2.5), percentile(estimates, 97.5)
+
+
+def bootstrap_p_value(estimates: Sequence[float]) -> Optional[float]:
+    """Two-sided bootstrap p-value of a difference being 0 (share of estimates on the other side of 0)."""
+    if not estimates:
+        return None
+    other_side = min(sum(value <= 0 for value in estimates), sum(value >= 0 for value in estimates))
+    return min(1.0, (2 * other_side + 1) / (len(estimates) + 1))
+
+
+def holm_adjust(entries: Sequence[Dict[str, Any]]) -> None:
+    """Sets `p_adjusted` (Holm step-down, family = all given entries with a p-value) on every entry."""
+    tested = sorted((entry for entry in entries if entry["p_value"] is not None), key=lambda entry: entry["p_value"])
+    running_max = 0.0
+    for rank, entry in enumerate(tested):
+        running_max = max(running_max, min(1.0, (len(tested) - rank) * entry["p_value"]))
+        entry["p_adjusted"] = running_max
+    for entry in entries:
+        entry.setdefault("p_adjusted", None)
+
+
+def summarize_variant(runs: List[RunMetrics]) -> Dict[str, Any]:
+    """Means, latency percentiles and the score distribution of one variant's successful runs."""
+    ok = [run for run in runs if run.error is None]
+    summary: Dict[str, Any] = {"runs": len(runs), "errors": len(runs) - len(ok)}
+    for metric in MEAN_METRICS:
+        summary[metric] = _mean([getattr(run, metric) for run in ok])
+    for metric in LATENCY_METRICS:
+        values = [getattr(run, metric) for run in ok if getattr(run, metric) is not None]
+        summary[metric] = _mean(values)
+        for q in PERCENTILES:
+            summary[f"{metric}_p{q}"] = percentile(values, q)
+    summary["rating_distribution"] = dict(sorted(Counter(rating for run in ok for rating in run.ratings).items()))
+    return summary
+
+
+def _by_case(runs: List[RunMetrics]) -> Dict[str, List[RunMetrics]]:
+    cases: Dict[str, List[RunMetrics]] = defaultdict(list)
+    for run in runs:
+        if run.error is None:
+            cases[run.test_case_id].append(run)
+    return cases
+
+
+def compare_variants(baseline: List[RunMetrics], variant: List[RunMetrics], resamples: int, seed: int) -> Dict[str, Dict[str, Any]]:
+    """Difference variant − baseline per metric, paired by scenario, with p-value / 95% CI."""
+    rng = random.Random(seed)
+    base_cases, variant_cases = _by_case(baseline), _by_case(variant)
+    shared = sorted(set(base_cases) & set(variant_cases))
+    comparison: Dict[str, Dict[str, Any]] = {}
+
+    for metric in MEAN_METRICS + LATENCY_METRICS:
+        pairs = [
+            (_mean([getattr(run, metric) for run in base_cases[case]]), _mean([getattr(run, metric) for run in variant_cases[case]]))
+            for case in shared
+        ]
+        diffs = [new - old for old, new in pairs if old is not None and new is not None]
+        low, high = bootstrap_ci(statistics.fmean, diffs, resamples, rng)
+        comparison[metric] = {
+            "pairs": len(diffs),
+            "diff": statistics.fmean(diffs) if diffs else None,
+            "ci_low": low,
+            "ci_high": high,
+            "p_value": permutation_p_value(diffs, resamples, rng),
+        }
+
+    for metric in LATENCY_METRICS:
+        for q in PERCENTILES:
+            def diff_of_percentiles(cases: List[str], metric=metric, q=q) -> Optional[float]:
+                old = percentile([getattr(run, metric) for case in cases for run in base_cases[case] if getattr(run, metric) is not None], q)
+                new = percentile([getattr(run, metric) for case in cases for run in variant_cases[case] if getattr(run, metric) is not None], q)
+                return new - old if old is not None and new is not None else None
+
+            estimates = bootstrap(diff_of_percentiles, shared, resamples, rng)
+            comparison[f"{metric}_p{q}"] = {"pairs": len(shared), "diff": diff_of_percentiles(shared) if shared else None,
+                                             "ci_low": percentile(estimates, 2.5), "ci_high": percentile(estimates, 97.5),
+                                             "p_value": bootstrap_p_value(estimates) if len(shared) >= MIN_PERCENTILE_SCENARIOS else None}
+    return comparison
+
+
+def is_significant(entry: Dict[str, Any], alpha: float) -> bool:
+    """Significant after the Holm correction (see holm_adjust)."""
+    return entry.get("p_adjusted") is not None and entry["p_adjusted"] < alpha
+
+
+# ----------------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------------
+
+def _fmt(value: Optional[float], signed: bool = False) -> str:
+    if value is None:
+        return "-"
+    return f"{value:+.2f}" if signed else f"{value:.2f}"
+
+
+def print_report(variants: List[str], summaries: Dict[str, Dict[str, Any]],
+                 comparisons: Dict[str, Dict[str, Dict[str, Any]]], alpha: float) -> None:
+    reference = variants[0]
+    for variant in variants:
+        summary = summaries[variant]
+        print(f"\n[{variant}] {summary['runs']} runs, {summary['errors']} errors – {VARIANTS[variant].description}")
+        distribution = " ".join(f"{rating}×{count}" for rating, count in summary["rating_distribution"].items()) or "-"
+        print(f"    rating distribution: {distribution}")
+        if variant == reference:
+            continue
+        print(f"    {'metric':<26} {reference:>12} {variant[:12]:>12} {'diff':>10} {'95% CI':>22} {'p':>7} {'p_holm':>7}")
+        for metric, entry in comparisons[variant].items():
+            base_value = summaries[reference].get(metric)
+            marker = "  *" if is_significant(entry, alpha) else ""
+            ci = f"[{_fmt(entry['ci_low'], True)}, {_fmt(entry['ci_high'], True)}]"
+            print(f"    {metric:<26} {_fmt(base_value):>12} {_fmt(summary.get(metric)):>12} {_fmt(entry['diff'], True):>10} "
+                  f"{ci:>22} {_fmt(entry['p_value']):>7} {_fmt(entry['p_adjusted']):>7}{marker}")
+    print(f"\n* significant at alpha={alpha} after a Holm correction over all {sum(len(c) for c in comparisons.values())} "
+          f"comparisons (p_holm)")
+
+
+async def main(args: argparse.Namespace) -> int:
+    if args.list:
+        for name, variant in VARIANTS.items():
+            print(f"{name:<24} {variant.description}")
+        return 0
+    unknown = [name for name in args.variants if name not in VARIANTS]
+    if unknown or len(args.variants) < 2:
+        print(f"[ERR] Need at least 2 registered variants (unknown: {unknown}); see --list.")
+        return 2
+
+    if args.suite:
+        test_cases = build_suite(args.suite, per_stratum=args.per_stratum, seed=args.seed)
+    else:
+        with open(args.scenarios, 'r', encoding='utf-8') as f:
+            test_cases = json.load(f)
+    if args.filter:
+        test_cases = [case for case in test_cases if args.filter in case["test_case_id"]]
+    print(f"[START] Experiment (Backend: {args.backend}, Variants: {', '.join(args.variants)}, "
+          f"{len(test_cases)} scenarios × {args.repeats}, Worker: {args.workers})")
+
+    backends = {
+        name: create_backend(
+            args.backend,
+            record=args.record,
+            agent=build_variant(name, prompt_cache=args.prompt_cache) if args.backend != "replay" else None,
+            recordings_dir=variant_recordings_dir(name),
+        )
+        for name in args.variants
+    }
+    semaphore = asyncio.Semaphore(args.workers)
+    if args.warmup and test_cases:
+        # Untimed: imports, model clients and indexes are initialized lazily on the first run.
+        warmups = await asyncio.gather(*(
+            run_variant_case(name, backends[name], test_cases[0], -1, semaphore, args.timeout)
+            for name in args.variants for _ in range(args.warmup)
+        ))
+        print(f"[INFO] {len(warmups)} warm-up runs ({sum(1 for run in warmups if run.error)} errors), not measured")
+    jobs = []
+    for repeat in range(args.repeats):
+        for index, case in enumerate(test_cases):
+            shift = (index + repeat) % len(args.variants)
+            for name in args.variants[shift:] + args.variants[:shift]:
+                jobs.append(run_variant_case(name, backends[name], case, repeat, semaphore, args.timeout))
+    started = time.monotonic()
+    runs: List[RunMetrics] = await asyncio.gather(*jobs)
+    print(f"[INFO] {len(runs)} runs in {time.monotonic() - started:.1f}s")
+    for run in runs:
+        if run.error:
+            print(f"[ERR]  {run.variant} {run.test_case_id}#{run.repeat}: {run.error}")
+
+    by_variant = {name: [run for run in runs if run.variant == name] for name in args.variants}
+    summaries = {name: summarize_variant(by_variant[name]) for name in args.variants}
+    comparisons = {
+        name: compare_variants(by_variant[args.variants[0]], by_variant[name], args.resamples, args.seed)
+        for name in args.variants[1:]
+    }
+    holm_adjust([entry for comparison in comparisons.values() for entry in comparison.values()])
+    print_report(args.variants, summaries, comparisons, args.alpha)
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "backend": args.backend,
+                "variants": summaries,
+                "comparisons": comparisons,
+                "runs": [run.model_dump() for run in runs],
+            }, f, ensure_ascii=False, indent=2)
+    return 1 if any(run.error for run in runs) else 0
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="A/B experiment harness for pipeline variants.")
+    parser.add_argument("--backend", choices=BACKENDS, default="stub")
+    parser.add_argument("--variants", nargs="+", default=[BASELINE, "max_iterations_2"], help="Registered variants; the first is the reference.")
+    parser.add_argument("--list", action="store_true", help="List the registered variants.")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS, help="Scenario JSON file.")
+    parser.add_argument("--suite", choices=SUITES, help="Use generated scenarios instead of --scenarios.")
+    parser.add_argument("--per-stratum", type=int, default=DEFAULT_PER_STRATUM, help="CI suite: scenarios per niche × detail stratum.")
+    parser.add_argument("--filter", help="Only run scenarios whose id contains this string.")
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per scenario and variant.")
+    parser.add_argument("--workers", type=int, default=4, help="Runs executed concurrently (across all variants).")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per variant before measuring (0 = none).")
+    parser.add_argument("--timeout", type=float, default=300, help="Timeout per run in seconds.")
+    parser.add_argument("--record", action="store_true", help="Live backend: save each run to the variant's recordings for replay.")
+    parser.add_argument("--prompt-cache", action="store_true", help="Keep the Gemini context cache (shared per agent name across variants).")
+    parser.add_argument("--resamples", type=int, default=2000, help="Permutation / bootstrap resamples.")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Family-wise significance level (Holm-corrected).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the CI sample and the resampling.")
+    parser.add_argument("--json", help="Write summaries, comparisons and all runs to this path.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
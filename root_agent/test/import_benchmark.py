@@ -0,0 +1,92 @@
+"""
+Import-time benchmark (cold start per stage).
+
+Imports each target in a fresh interpreter, several times, and reports the median wall time,
+the number of loaded modules and whether ADK was pulled in. With --max-seconds the run fails
+if a target that should stay light exceeds its budget.
+
+    uv run python root_agent/test/import_benchmark.py
+    uv run python root_agent/test/import_benchmark.py --repeat 5 --json reports/imports.json
+    uv run python root_agent/test/import_benchmark.py --target root_agent.tools.engagement --max-seconds 0.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+DEFAULT_TARGETS = [
+    "root_agent",
+    "root_agent.tools.engagement",
+    "root_agent.services.hashtag_store",
+    "root_agent.test.backends",
+    "root_agent.subagents.video_analyst_agent",
+    "root_agent.agent",
+]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {target}
+print(json.dumps({{"seconds": time.perf_counter() - started, "modules": len(sys.modules), "adk": "google.adk" in sys.modules}}))
+"""
+
+
+def measure(target: str, repeat: int) -> Dict[str, Any]:
+    """Imports `target` `repeat` times in fresh interpreters."""
+    samples: List[Dict[str, Any]] = []
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT_DIR, os.environ.get("PYTHONPATH")]))}
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", _PROBE.format(target=target)],
+            capture_output=True, text=True, cwd=ROOT_DIR, env=env,
+        )
+        if completed.returncode != 0:
+            return {"target": target, "error": completed.stderr.strip().splitlines()[-1]}
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return {
+        "target": target,
+        "median_s": round(statistics.median(s["seconds"] for s in samples), 3),
+        "min_s": round(min(s["seconds"] for s in samples), 3),
+        "modules": samples[-1]["modules"],
+        "adk": samples[-1]["adk"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark for the root_agent package.")
+    parser.add_argument("--target", action="append", help="Module to import (repeatable, default: all stages).")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per target.")
+    parser.add_argument("--max-seconds", type=float, help="Fail if any target's median exceeds this budget.")
+    parser.add_argument("--json", help="Write the results to this path.")
+    args = parser.parse_args(argv)
+
+    results = [measure(target, args.repeat) for target in args.target or DEFAULT_TARGETS]
+
+    print(f"{'target':<45} {'median':>8} {'min':>8} {'modules':>8}  adk")
+    failed = False
+    for result in results:
+        if "error" in result:
+            failed = True
+            print(f"{result['target']:<45} ERROR {result['error']}")
+            continue
+        over_budget = args.max_seconds is not None and result["median_s"] > args.max_seconds
+        failed |= over_budget
+        print(f"{result['target']:<45} {result['median_s']:>7.3f}s {result['min_s']:>7.3f}s {result['modules']:>8}  "
+              f"{'yes' if result['adk'] else 'no'}{'  OVER BUDGET' if over_budget else ''}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Memory profile report (MEMORY_PROFILE=true output, see services/memory_profile.py).
+
+Summarizes one or more profile files per stage – runs, median/max traced delta, median retained
+size, median RSS delta – plus the largest allocation sites. With --baseline the same is computed
+for the baseline files (e.g. the previous release) and every stage and site shows its growth.
+With --max-growth-kb the run fails if a stage's median traced delta grew by more than the budget.
+
+    uv run python root_agent/test/memory_report.py .data/memory/v1.3-*.jsonl
+    uv run python root_agent/test/memory_report.py .data/memory/v1.4-*.jsonl --baseline .data/memory/v1.3-*.jsonl
+    uv run python root_agent/test/memory_report.py new.jsonl --baseline old.jsonl --max-growth-kb 512 --json reports/memory.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+
+def load_records(paths: List[str]) -> List[Dict[str, Any]]:
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # truncated tail of a running process
+    return records
+
+
+def _median(values: List[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return statistics.median(values) if values else None
+
+
+def summarize(records: List[Dict[str, Any]], top: int = 10) -> Dict[str, Dict[str, Any]]:
+    """Per stage: run count, median/max traced delta, median retained and RSS delta, top sites (mean bytes per run)."""
+    by_stage: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for record in records:
+        by_stage[record["stage"]].append(record)
+
+    summary = {}
+    for stage, runs in sorted(by_stage.items()):
+        sites: Dict[str, int] = defaultdict(int)
+        for run in runs:
+            for entry in run.get("top") or []:
+                sites[f"{entry['site']} ← {entry['caller']}" if entry.get("caller") else entry["site"]] += entry["size_diff"]
+        summary[stage] = {
+            "runs": len(runs),
+            "traced_delta": _median([run.get("traced_delta") for run in runs]),
+            "traced_delta_max": max(run.get("traced_delta") or 0 for run in runs),
+            "retained": _median([run.get("retained") for run in runs]),
+            "rss_delta": _median([run.get("rss_delta") for run in runs]),
+            "sites": {site: size // len(runs) for site, size in sorted(sites.items(), key=lambda item: item[1], reverse=True)[:top]},
+        }
+    return summary
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Growth of every stage metric and site against the baseline (None where one side is missing)."""
+    growth = {}
+    for stage in sorted(set(current) | set(baseline)):
+        new, old = current.get(stage) or {}, baseline.get(stage) or {}
+        growth[stage] = {
+            metric: (new[metric] - old[metric]) if new.get(metric) is not None and old.get(metric) is not None else None
+            for metric in ("traced_delta", "retained", "rss_delta")
+        }
+        sites = set(new.get("sites") or {}) | set(old.get("sites") or {})
+        growth[stage]["sites"] = dict(sorted(
+            ((site, (new.get("sites") or {}).get(site, 0) - (old.get("sites") or {}).get(site, 0)) for site in sites),
+            key=lambda item: abs(item[1]), reverse=True,
+        ))
+    return growth
+
+
+def _kb(value: Optional[float], signed: bool = False) -> str:
+    if value is None:
+        return "-"
+    return f"{value / 1024:+.1f}" if signed else f"{value / 1024:.1f}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize and diff memory profiles per pipeline stage.")
+    parser.add_argument("files", nargs="+", help="Profile JSONL files of the current build.")
+    parser.add_argument("--baseline", nargs="+", help="Profile JSONL files to compare against (e.g. the previous release).")
+    parser.add_argument("--top", type=int, default=5, help="Allocation sites per stage.")
+    parser.add_argument("--max-growth-kb", type=float, help="Fail if a stage's median traced delta grew by more than this.")
+    parser.add_argument("--json", help="Write the summary (and growth) to this path.")
+    args = parser.parse_args(argv)
+
+    current = summarize(load_records(args.files), top=args.top)
+    baseline = summarize(load_records(args.baseline), top=args.top) if args.baseline else None
+    growth = compare(current, baseline) if baseline is not None else None
+
+    print(f"{'stage':<40} {'runs':>5} {'delta KB':>10} {'max KB':>10} {'retained KB':>12} {'rss KB':>10}" + ("  growth KB" if growth else ""))
+    failed = False
+    for stage in sorted(set(current) | set(baseline or {})):
+        row = current.get(stage)
+        if row is None:
+            print(f"{stage:<40} {'(only in baseline)':>50}")
+            continue
+        line = (f"{stage:<40} {row['runs']:>5} {_kb(row['traced_delta']):>10} {_kb(row['traced_delta_max']):>10} "
+                f"{_kb(row['retained']):>12} {_kb(row['rss_delta']):>10}")
+        if growth:
+            delta = growth[stage]["traced_delta"]
+            over_budget = args.max_growth_kb is not None and delta is not None and delta / 1024 > args.max_growth_kb
+            failed |= over_budget
+            line += f"  {_kb(delta, signed=True):>9}{'  OVER BUDGET' if over_budget else ''}"
+        print(line)
+        sites = growth[stage]["sites"] if growth else row["sites"]
+        for site, size in list(sites.items())[:args.top]:
+            print(f"    {_kb(size, signed=bool(growth)):>10} KB  {site}")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": current, "baseline": baseline, "growth": growth}, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,165 +1,163 @@
-import sys
-import os
+"""
+Scenario-Runner für die Agenten-Pipeline (einziger Einstiegspunkt für alle Tests).
+
+Führt die Szenarien parallel aus (Worker Pool + Timeout pro Fall), bewertet sie mit
+den Checks aus checks.py und schreibt die Ergebnisse inkl. Latenz als JSON und JUnit XML.
+
+    uv run python root_agent/test/msg.py                                # live gegen Gemini
+    uv run python root_agent/test/msg.py --backend stub                 # offline, deterministisches Modell
+    uv run python root_agent/test/msg.py --backend live --record        # live + Aufnahme für Replay
+    uv run python root_agent/test/msg.py --backend replay --junit reports/junit.xml
+    uv run python root_agent/test/msg.py --suite ci --backend stub         # generierte Szenarien (ci / nightly)
+"""
+
+import argparse
 import asyncio
 import json
-from google.genai import types
-from dotenv import load_dotenv
+import os
 import sys
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
 
 # Windows Fix: Force UTF-8 output
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8')
 
-load_dotenv()
-
-# 1. Pfad Setup: 2 Ebenen hoch gehen (../../)
+# Pfad Setup: 2 Ebenen hoch gehen (../../)
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
 sys.path.append(root_dir)
 
-# 2. Importiere deinen ECHTEN Runner
-try:
-    from root_agent.agent import root_agent
-    from google.adk import Runner
-    from google.adk.sessions import InMemorySessionService
-    from google.adk.apps import App
-    
-    # Wrap agent in App
-    app = App(root_agent=root_agent, name="social_media_analytics_app")
-
-    # Instantiate the runner with the app and session service
-    runner = Runner(app=app, session_service=InMemorySessionService())
-    print("[OK] Modul 'root_agent' erfolgreich geladen.")
-except ImportError as e:
-    print(f"[FAIL] FEHLER: Konnte 'root_agent' nicht importieren. Pfad: {root_dir}")
-    print(f"Detail: {e}")
-    sys.exit(1)
-
-async def run_single_test(test_case):
-    """Führt einen einzelnen Testfall aus."""
-    user_input = test_case['user_input']
-    print(f"\n[TEST] Test: {test_case['test_case_id']}")
-    print(f"   Input: '{user_input}'")
-
-    # --- WICHTIGE KORREKTUR HIER ---
-    # Wir lesen den korrekten App-Namen direkt aus dem Runner aus.
-    # In deiner agent.py ist das "root_agent".
-    correct_app_name = getattr(runner, "app_name", "root_agent")
-
-    # Session starten mit dem KORREKTEN App-Namen
-    session = await runner.session_service.create_session(
-        user_id='eval_bot', 
-        app_name=correct_app_name
-    )
+load_dotenv(os.path.join(root_dir, "root_agent", ".env"))
 
-    parts = [types.Part(text=user_input)]
-    
-    # Check for video file
-    video_file = test_case.get('video_file')
-    if video_file:
-        video_path = os.path.join(os.path.dirname(__file__), video_file)
-        # Fallback: check root dir if not found in test dir
-        if not os.path.exists(video_path):
-             video_path = os.path.join(root_dir, video_file)
-             
-        if os.path.exists(video_path):
-            print(f"   [INFO] Loading video: {video_file}")
-            try:
-                with open(video_path, "rb") as f:
-                    video_data = f.read()
-                parts.append(types.Part.from_bytes(data=video_data, mime_type="video/mp4"))
-            except Exception as e:
-                print(f"   [FAIL] Could not load video: {e}")
-        else:
-            print(f"   [WARN] Video file not found: {video_file}")
+from root_agent.test.backends import BACKENDS, create_backend
+from root_agent.test.checks import run_checks
+from root_agent.test.scenario_generator import DEFAULT_PER_STRATUM, DEFAULT_SEED, SUITES, build_suite
 
-    content = types.Content(role='user', parts=parts)
 
-    # Agent ausführen
-    print("   [WAIT] Agent arbeitet (Google Search )...")
-    try:
-        events = runner.run_async(
-            user_id='eval_bot',
-            session_id=session.id,
-            new_message=content
-        )
-    except Exception as e:
-        print(f"   [FAIL] START-FEHLER: {e}")
-        return False
-
-    all_texts = []  # Sammle ALLE Text-Parts aus ALLEN Events
-    
-    # Antwort Stream verarbeiten
-    try:
-        async for event in events:
-            # Agent-Name loggen (falls vorhanden)
-            agent_name = getattr(event, 'author', '')
-            if event.content and event.content.parts:
-                for part in event.content.parts:
-                    text = part.text
-                    if text:
-                        # Prefix mit Agent-Name fuer bessere Zuordnung
-                        if agent_name:
-                            all_texts.append(f"[{agent_name}]: {text}")
-                        else:
-                            all_texts.append(text)
-    except Exception as e:
-        print(f"   [FAIL] CRITICAL ERROR während der Ausführung: {e}")
-        return False
-
-    # Alles zusammenfuegen
-    final_text = "\n".join(all_texts)
-    
-    if not final_text.strip():
-        print("   [WARN] Warnung: Keine Textantwort erhalten.")
-    
-    # Überprüfung (Simple String Matching)
-    expected_keywords = test_case.get('expected_output_contains', [])
-    passed = True
-    missing = []
-
-    for keyword in expected_keywords:
-        if keyword.lower() not in final_text.lower():
-            passed = False
-            missing.append(keyword)
-
-    # Ergebnis Ausgabe
-    print(f"   [INFO] Antwort-Vorschau: {final_text.replace(chr(10), ' ')[:300]}...")
-    
-    if passed:
-        print("   [OK] STATUS: PASS")
-    else:
-        print("   [FAIL] STATUS: FAIL")
-        print(f"      Fehlende Keywords: {missing}")
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCENARIOS = os.path.join(TEST_DIR, "scenarios_debug.json")
+if not os.path.exists(DEFAULT_SCENARIOS):
+    DEFAULT_SCENARIOS = os.path.join(TEST_DIR, "scenarios_test.json")
 
-    return passed
 
-async def main():
-    print("[START] Starte Manuellen Evaluierungs-Loop (Direct Runner Mode)")
+async def run_case(backend, case: Dict[str, Any], semaphore: asyncio.Semaphore, timeout: float) -> Dict[str, Any]:
+    """Führt einen Testfall aus und bewertet ihn."""
+    async with semaphore:
+        started = time.monotonic()
+        report: Dict[str, Any] = {"test_case_id": case["test_case_id"], "status": "error", "checks": [], "error": None}
+        try:
+            result = await asyncio.wait_for(backend.run(case), timeout=timeout)
+        except asyncio.TimeoutError:
+            report["error"] = f"Timeout nach {timeout:.0f}s"
+        except Exception as e:
+            report["error"] = f"{type(e).__name__}: {e}"
+        else:
+            checks = run_checks(case, result)
+            report["session_id"] = result.session_id
+            report["checks"] = [check.model_dump() for check in checks]
+            report["status"] = "pass" if all(check.passed for check in checks) else "fail"
+        report["latency_s"] = round(time.monotonic() - started, 3)
+
+    failed = [check["name"] for check in report["checks"] if not check["passed"]]
+    label = {"pass": "[OK]  ", "fail": "[FAIL]", "error": "[ERR] "}[report["status"]]
+    detail = report["error"] or (f"Fehlgeschlagen: {failed}" if failed else "")
+    print(f"{label} {case['test_case_id']} ({report['latency_s']:.1f}s) {detail}")
+    return report
+
+
+def write_junit(path: str, reports: List[Dict[str, Any]], backend: str, duration: float) -> None:
+    """Schreibt die Ergebnisse als JUnit XML (ein testcase pro Szenario)."""
+    suite = ET.Element(
+        "testsuite",
+        name=f"scenarios[{backend}]",
+        tests=str(len(reports)),
+        failures=str(sum(r["status"] == "fail" for r in reports)),
+        errors=str(sum(r["status"] == "error" for r in reports)),
+        time=f"{duration:.3f}",
+    )
+    for report in reports:
+        testcase = ET.SubElement(suite, "testcase", classname=f"scenarios.{backend}", name=report["test_case_id"], time=f"{report['latency_s']:.3f}")
+        if report["status"] == "error":
+            ET.SubElement(testcase, "error", message=report["error"] or "")
+        elif report["status"] == "fail":
+            failed = [c for c in report["checks"] if not c["passed"]]
+            failure = ET.SubElement(testcase, "failure", message=", ".join(c["name"] for c in failed))
+            failure.text = "\n".join(f"{c['name']}: {c['message']}" for c in failed)
+        ET.SubElement(testcase, "system-out").text = "\n".join(
+            f"{'PASS' if c['passed'] else 'FAIL'} {c['name']} {c['message']}" for c in report["checks"]
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def write_json(path: str, reports: List[Dict[str, Any]], backend: str, duration: float) -> None:
+    latencies = sorted(r["latency_s"] for r in reports)
+    summary = {
+        "backend": backend,
+        "total": len(reports),
+        "passed": sum(r["status"] == "pass" for r in reports),
+        "failed": sum(r["status"] == "fail" for r in reports),
+        "errors": sum(r["status"] == "error" for r in reports),
+        "duration_s": round(duration, 3),
+        "latency_p50_s": latencies[len(latencies) // 2] if latencies else None,
+        "latency_max_s": latencies[-1] if latencies else None,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "cases": reports}, f, ensure_ascii=False, indent=2)
+
+
+async def main(args: argparse.Namespace) -> int:
+    print(f"[START] Scenario-Runner (Backend: {args.backend}, Worker: {args.workers}, Timeout: {args.timeout:.0f}s)")
     print("---------------------------------------------------------")
-    
-    # Lade die Testfälle
-    # Lade die Testfälle
-    json_path = os.path.join(os.path.dirname(__file__), "scenarios_debug.json")
-    if not os.path.exists(json_path):
-        json_path = os.path.join(os.path.dirname(__file__), "scenarios_test.json")
-    
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
+
+    if args.suite:
+        test_cases = build_suite(args.suite, per_stratum=args.per_stratum, seed=args.seed)
+        source = f"Generator (Suite: {args.suite})"
+    else:
+        with open(args.scenarios, 'r', encoding='utf-8') as f:
             test_cases = json.load(f)
-            print(f"[INFO] Loaded scenarios from: {os.path.basename(json_path)}")
-    except FileNotFoundError:
-        print(f"[FAIL] Konnte Testdatei nicht finden: {json_path}")
-        return
-
-    # Loop durch alle Tests
-    passed_count = 0
-    for case in test_cases:
-        if await run_single_test(case):
-            passed_count += 1
-            
+        source = os.path.basename(args.scenarios)
+    if args.filter:
+        test_cases = [case for case in test_cases if args.filter in case["test_case_id"]]
+    print(f"[INFO] {len(test_cases)} Szenarien aus {source}")
+
+    backend = create_backend(args.backend, record=args.record)
+    semaphore = asyncio.Semaphore(args.workers)
+    started = time.monotonic()
+    reports = await asyncio.gather(*(run_case(backend, case, semaphore, args.timeout) for case in test_cases))
+    duration = time.monotonic() - started
+
+    if args.junit:
+        write_junit(args.junit, reports, args.backend, duration)
+    if args.json:
+        write_json(args.json, reports, args.backend, duration)
+
+    passed_count = sum(r["status"] == "pass" for r in reports)
     print("\n=========================================================")
-    print(f"[RESULT] GESAMTERGEBNIS: {passed_count}/{len(test_cases)} Tests bestanden.")
+    print(f"[RESULT] GESAMTERGEBNIS: {passed_count}/{len(reports)} Tests bestanden ({duration:.1f}s).")
     print("=========================================================")
+    return 0 if passed_count == len(reports) else 1
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parallel scenario runner for the agent pipeline.")
+    parser.add_argument("--backend", choices=BACKENDS, default="live")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS, help="Scenario JSON file.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of scenarios run concurrently.")
+    parser.add_argument("--timeout", type=float, default=300, help="Timeout per scenario in seconds.")
+    parser.add_argument("--suite", choices=SUITES, help="Use generated scenarios instead of --scenarios (ci = stratified subset, nightly = full set).")
+    parser.add_argument("--per-stratum", type=int, default=DEFAULT_PER_STRATUM, help="CI suite: scenarios per niche × detail stratum.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the stratified CI sample.")
+    parser.add_argument("--filter", help="Only run scenarios whose id contains this string.")
+    parser.add_argument("--record", action="store_true", help="Live backend: save each run to test/recordings/ for replay.")
+    parser.add_argument("--junit", help="Write a JUnit XML report to this path.")
+    parser.add_argument("--json", help="Write a JSON report to this path.")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,196 @@
+"""
+Offline tests for services/resilience.py and the job queue's failure handling (no API calls).
+
+    uv run python root_agent/test/resilience_test.py
+    uv run pytest root_agent/test/resilience_test.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+sys.path.append(root_dir)
+
+import aiohttp
+import httpx
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.models.google_llm import Gemini
+from google.genai import types
+from root_agent.services import resilience
+from root_agent.services.job_queue import JobStore, WorkerPool
+from root_agent.services.resilience import ResilientGemini, get_circuit_breaker, is_transient_error
+
+
+@contextmanager
+def patched(target, name: str, value):
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+def _request(model: str) -> LlmRequest:
+    return LlmRequest(model=model, contents=[types.Content(role="user", parts=[types.Part(text="hi")])],
+                      config=types.GenerateContentConfig())
+
+
+def _answer(text: str = "ok") -> LlmResponse:
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+# --- is_transient_error ---
+
+def test_httpx_connect_error_is_transient():
+    assert is_transient_error(httpx.ConnectError("connection refused"))
+
+
+def test_httpx_read_timeout_is_transient():
+    assert is_transient_error(httpx.ReadTimeout("read timed out"))
+
+
+def test_httpx_remote_protocol_error_is_transient():
+    assert is_transient_error(httpx.RemoteProtocolError("server disconnected without sending a response"))
+
+
+def test_aiohttp_client_errors_are_transient():
+    assert is_transient_error(aiohttp.ClientConnectionError("connection reset"))
+    assert is_transient_error(aiohttp.ServerDisconnectedError())
+    assert is_transient_error(aiohttp.ClientPayloadError("response payload is not completed"))
+
+
+def test_client_side_errors_are_not_transient():
+    assert not is_transient_error(ValueError("invalid request"))
+    assert not is_transient_error(httpx.UnsupportedProtocol("unsupported protocol"))
+
+
+# --- Retry of network errors ---
+
+def test_model_call_retries_network_error():
+    calls = []
+
+    async def flaky(self, llm_request, stream=False):
+        calls.append(llm_request.model)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused")
+        yield _answer()
+
+    async def run():
+        model = ResilientGemini(model="test-retry-model")
+        return [response async for response in model.generate_content_async(_request("test-retry-model"))]
+
+    with patched(Gemini, "generate_content_async", flaky), patched(resilience, "backoff_delay", lambda attempt: 0.0):
+        responses = asyncio.run(run())
+    assert len(calls) == 2
+    assert responses[0].content.parts[0].text == "ok"
+    assert get_circuit_breaker("test-retry-model").state == "closed"
+
+
+def test_job_with_network_error_is_requeued():
+    async def handler(payload):
+        raise httpx.ReadTimeout("read timed out")
+
+    store = JobStore(os.path.join(tempfile.mkdtemp(prefix="agent-test-"), "jobs.sqlite3"))
+    job = store.enqueue({"parts": []}, max_attempts=3)
+    pool = WorkerPool(store, handler, workers=1, retry_base_delay=0.0)
+    asyncio.run(pool._run(store.claim_next()))
+    job = store.get(job.id)
+    assert job.status == "queued", job.status
+    assert "ReadTimeout" in job.error
+
+
+def test_job_with_unserializable_result_fails():
+    async def handler(payload):
+        return {"events": object()}
+
+    store = JobStore(os.path.join(tempfile.mkdtemp(prefix="agent-test-"), "jobs.sqlite3"))
+    job = store.enqueue({"parts": []}, max_attempts=3)
+    pool = WorkerPool(store, handler, workers=1, retry_base_delay=0.0)
+    asyncio.run(pool._run(store.claim_next()))
+    job = store.get(job.id)
+    assert job.status == "failed", job.status
+    assert "TypeError" in job.error
+
+
+def test_shutdown_does_not_use_up_attempts():
+    async def handler(payload):
+        await asyncio.sleep(60)
+
+    async def run(store):
+        pool = WorkerPool(store, handler, workers=1)
+        await pool.start()
+        await asyncio.sleep(0.2)
+        await pool.stop()
+
+    store = JobStore(os.path.join(tempfile.mkdtemp(prefix="agent-test-"), "jobs.sqlite3"))
+    job = store.enqueue({"parts": []}, max_attempts=1)
+    for _ in range(3):
+        asyncio.run(run(store))
+    job = store.get(job.id)
+    assert job.status == "queued", job.status
+    assert job.attempts == 0, job.attempts
+
+
+# --- Hedging ---
+
+def test_hedged_call_cancels_requests_when_caller_is_cancelled():
+    calls = {"started": 0, "cancelled": 0}
+
+    class SlowGemini(ResilientGemini):
+        async def _single_call(self, llm_request):
+            calls["started"] += 1
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                calls["cancelled"] += 1
+                raise
+            return [_answer()]
+
+    async def run(cancel_after: float):
+        model = SlowGemini(model="test-hedge-model", hedge_delay=0.05)
+        task = asyncio.create_task(model._hedged_call(_request("test-hedge-model")))
+        await asyncio.sleep(cancel_after)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # Checked before asyncio.run cancels leftover tasks on exit.
+        return dict(calls)
+
+    # Cancelled during the hedge delay (primary only), then while both requests are running.
+    assert asyncio.run(run(0.01)) == {"started": 1, "cancelled": 1}, calls
+    assert asyncio.run(run(0.2)) == {"started": 3, "cancelled": 3}, calls
+
+
+def test_hedged_call_returns_first_success():
+    class HedgedGemini(ResilientGemini):
+        async def _single_call(self, llm_request):
+            primary = not hasattr(self, "_primary_started")
+            object.__setattr__(self, "_primary_started", True)
+            await asyncio.sleep(60 if primary else 0.01)
+            return [_answer("primary" if primary else "hedge")]
+
+    model = HedgedGemini(model="test-hedge-model", hedge_delay=0.01)
+    responses = asyncio.run(model._hedged_call(_request("test-hedge-model")))
+    assert responses[0].content.parts[0].text == "hedge"
+
+
+def main() -> int:
+    tests = [(name, test) for name, test in globals().items() if name.startswith("test_") and callable(test)]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+        else:
+            print(f"[OK]   {name}")
+    print(f"\n[RESULT] {len(tests) - failed}/{len(tests)} Tests bestanden.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Synthetic scenario generator for the regression suite.
+
+Builds parameterized scenarios from the cross product of niche × hook type × video length ×
+input detail (vague vs. detailed) and attaches expected-field assertions to each one:
+
+  nightly – the full set (every combination)
+  ci      – a stratified subset (per_stratum scenarios for every niche × detail combination)
+
+Scenario ids are derived from the parameters, so they stay stable across runs and releases –
+recordings for the replay backend (test/recordings/<id>.jsonl.gz) remain valid.
+
+    uv run python root_agent/test/scenario_generator.py --suite ci --out root_agent/test/scenarios_ci.json
+    uv run python root_agent/test/msg.py --suite ci --backend stub
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+
+# Hook types as named in SchemaExtraction.hook_type.
+HOOK_TYPES = ["Question", "Shock", "Curiosity", "Statement", "Visual stimulus"]
+VIDEO_LENGTHS = [15, 30, 60, 90]
+DETAIL_LEVELS = ["vague", "detailed"]
+
+SUITES = ("ci", "nightly")
+DEFAULT_SEED = 7
+DEFAULT_PER_STRATUM = 1
+STRATA_KEYS = ("niche", "detail")
+
+GENERATED_CHECKS = ["keywords", "video_analysis_schema", "insights_schema", "caption_length", "hashtag_count", "expected_fields"]
+
+
+class Niche(BaseModel):
+    """Content building blocks for one niche."""
+    key: str
+    subject: str
+    vague: str
+    question: str
+    shock: str
+    teaser: str
+    claim: str
+    visual: str
+    middle: str
+    ending: str
+
+
+NICHES: List[Niche] = [
+    Niche(key="cooking", subject="showing a quick pasta recipe", vague="A cooking video with pasta.",
+          question="Are you still cooking pasta wrong?", shock="a pot boiling over onto the stove",
+          teaser="a covered plate with steam rising", claim="This is the only pasta sauce you will ever need",
+          visual="parmesan melting over steaming noodles in slow motion",
+          middle="The chef adds garlic, chili and pasta water in rapid cuts", ending="The video ends with a 'Save this recipe' text overlay"),
+    Niche(key="tech", subject="reviewing a new smartphone", vague="A video about a new phone.",
+          question="Is this phone really worth 1000 euros?", shock="the phone being dropped onto concrete",
+          teaser="a sealed box being slowly unwrapped", claim="This camera beats every DSLR I own",
+          visual="a macro shot of the camera lens rotating",
+          middle="The host compares photos side by side in front of a desk setup", ending="The video ends with a verdict card and a rating"),
+    Niche(key="travel", subject="about a weekend in Lisbon", vague="A travel vlog about Lisbon.",
+          question="Why does nobody talk about this viewpoint?", shock="a tram missing the creator by inches",
+          teaser="a hidden door in an alley", claim="Lisbon is the most underrated city in Europe",
+          visual="a drone shot rising over orange rooftops at sunset",
+          middle="Quick clips of pastries, tiled facades and a rooftop bar follow", ending="The video ends with a map of all locations"),
+    Niche(key="fitness", subject="demonstrating a 10-minute home workout", vague="A workout video.",
+          question="Can you hold this plank for 60 seconds?", shock="a kettlebell slipping out of a hand",
+          teaser="a before/after photo that is blurred out", claim="You do not need a gym to build muscle",
+          visual="a slow-motion jump squat with chalk dust",
+          middle="Each exercise is shown with a countdown timer", ending="The video ends with 'Follow for day 2'"),
+    Niche(key="comedy", subject="a comedy skit about working from home", vague="A funny skit.",
+          question="Who else does this in every meeting?", shock="a laptop falling off a stack of books mid-call",
+          teaser="a person about to unmute with a mischievous look", claim="Every video call has exactly these five people",
+          visual="a suit jacket worn over pajama pants",
+          middle="The creator plays all meeting participants with quick costume changes", ending="The video ends on a freeze frame of the boss's face"),
+    Niche(key="beauty", subject="showing a five-minute makeup routine", vague="A makeup tutorial.",
+          question="Is this the easiest winged liner hack?", shock="a mascara wand snapping in half",
+          teaser="half a face finished, the other half covered", claim="Drugstore foundation beats luxury brands",
+          visual="a glitter eyeshadow swatch catching the light",
+          middle="Every product is shown close up with its price on screen", ending="The video ends with the finished look and a product list"),
+    Niche(key="finance", subject="explaining how to start investing with 50 euros", vague="A video about money.",
+          question="What happens if you invest 50 euros every month?", shock="a chart crashing in red",
+          teaser="a bank app balance that is blurred out", claim="Saving accounts are losing you money",
+          visual="coins stacking up in a time-lapse",
+          middle="The creator explains compound interest with a whiteboard", ending="The video ends with a disclaimer and a 'Part 2' teaser"),
+    Niche(key="gaming", subject="showing a speedrun trick in a platformer", vague="A gaming clip.",
+          question="Did you know you can skip this entire level?", shock="the character falling into lava at full speed",
+          teaser="a timer at 00:59 with the finish line hidden", claim="This glitch saves four minutes",
+          visual="a frame-perfect jump highlighted in slow motion",
+          middle="The input sequence is shown as an overlay", ending="The video ends with the final time and a leaderboard"),
+    Niche(key="pets", subject="about a puppy's first day at home", vague="A video of a dog.",
+          question="Guess what he did when he saw the cat?", shock="a puppy sliding across the floor into a wall",
+          teaser="a wagging tail behind a closed door", claim="Golden retrievers are the best first dogs",
+          visual="a close-up of puppy paws on a fluffy rug",
+          middle="The puppy explores each room while captions narrate its thoughts", ending="The video ends with the puppy asleep in a shoe"),
+    Niche(key="diy", subject="building a floating shelf from scrap wood", vague="A DIY video.",
+          question="Can you build this with only three tools?", shock="a drill slipping and cracking the wood",
+          teaser="a covered wall with a sheet about to be pulled", claim="You do not need wall anchors for this shelf",
+          visual="sawdust flying in slow motion",
+          middle="Measuring, cutting and mounting are shown in fast time-lapse", ending="The video ends with the styled shelf and a material list"),
+    Niche(key="education", subject="explaining why the sky is blue", vague="A science explainer.",
+          question="Why is the sky not purple?", shock="a glass of water turning blue instantly",
+          teaser="a flashlight pointed at a milky glass, result hidden", claim="Everything you learned about this in school is wrong",
+          visual="a laser beam scattering through a fog tank",
+          middle="An animated diagram explains light scattering", ending="The video ends with a quiz question for the comments"),
+    Niche(key="fashion", subject="styling one white shirt five ways", vague="An outfit video.",
+          question="How many outfits can one shirt make?", shock="a shirt being cut with scissors",
+          teaser="a closet door slowly opening", claim="This is the only shirt you need this summer",
+          visual="a fabric twirl transition between outfits",
+          middle="Each outfit is revealed with a snap transition", ending="The video ends with all five looks on a split screen"),
+]
+
+_HOOK_SENTENCES = {
+    "Question": "It opens with the on-screen question '{niche.question}' (Question hook).",
+    "Shock": "The first second shows {niche.shock} (Shock hook).",
+    "Curiosity": "It opens with {niche.teaser}, without revealing the result (Curiosity hook).",
+    "Statement": "The creator opens with the bold claim '{niche.claim}' (Statement hook).",
+    "Visual stimulus": "The first 3 seconds show {niche.visual} (Visual stimulus).",
+}
+
+_FORMATS = {15: "TikTok", 30: "Instagram Reel", 60: "YouTube Short", 90: "TikTok"}
+
+_PACING = {
+    15: "Cuts happen every second.",
+    30: "Scenes change every 2-3 seconds.",
+    60: "The middle section is a static talking head and retention usually drops there.",
+    90: "Long takes dominate and the pacing slows down after the first 30 seconds.",
+}
+
+# State paths every run has to fill (None = present and non-empty).
+_BASE_EXPECTED_FIELDS: Dict[str, Optional[str]] = {
+    "video_analysis.schema_extraction.hook_type": None,
+    "video_analysis.root_questions": None,
+    "insights.hook_strategy": None,
+    "insights.root_question_analyses": None,
+    "insights.prescriptive_summary": None,
+}
+
+
+def build_scenario(niche: Niche, hook: str, length_s: int, detail: str) -> Dict[str, Any]:
+    """Builds one scenario in the scenarios_test.json format plus strata and expected fields."""
+    expected_fields = dict(_BASE_EXPECTED_FIELDS)
+    if detail == "detailed":
+        user_input = (
+            f"Analyze this video: A {length_s}-second {_FORMATS[length_s]} {niche.subject}. "
+            + _HOOK_SENTENCES[hook].format(niche=niche)
+            + f" {niche.middle}. {_PACING[length_s]} {niche.ending}."
+        )
+        # The hook is named explicitly, so the Video Analyst has to pick it up.
+        expected_fields["video_analysis.schema_extraction.hook_type"] = hook
+    else:
+        user_input = f"Analyze this video: {niche.vague} It is about {length_s} seconds long."
+
+    hook_id = hook.split()[0].upper()
+    return {
+        "test_case_id": f"GEN_{niche.key.upper()}_{hook_id}_{length_s}S_{detail.upper()}",
+        "description": f"Generated: {niche.key} niche, {hook} hook, {length_s}s, {detail} input.",
+        "strata": {"niche": niche.key, "hook": hook, "length_s": length_s, "detail": detail},
+        "user_input": user_input,
+        "expected_output_contains": ["hook", "caption", "hashtag"],
+        "expected_fields": expected_fields,
+        "checks": list(GENERATED_CHECKS),
+    }
+
+
+def generate_scenarios() -> List[Dict[str, Any]]:
+    """The full set: every niche × hook type × length × detail combination."""
+    scenarios = []
+    for niche, hook, length_s, detail in itertools.product(NICHES, HOOK_TYPES, VIDEO_LENGTHS, DETAIL_LEVELS):
+        if detail == "vague" and hook != HOOK_TYPES[0]:
+            # Vague inputs do not mention a hook – one variant per niche and length is enough.
+            continue
+        scenarios.append(build_scenario(niche, hook, length_s, detail))
+    return scenarios
+
+
+def stratified_subset(
+    scenarios: List[Dict[str, Any]],
+    keys: Sequence[str] = STRATA_KEYS,
+    per_stratum: int = DEFAULT_PER_STRATUM,
+    seed: int = DEFAULT_SEED,
+) -> List[Dict[str, Any]]:
+    """Samples `per_stratum` scenarios from every stratum (deterministic for a given seed)."""
+    strata: Dict[tuple, List[Dict[str, Any]]] = {}
+    for scenario in scenarios:
+        strata.setdefault(tuple(scenario["strata"][key] for key in keys), []).append(scenario)
+
+    rng = random.Random(seed)
+    subset = []
+    for stratum in sorted(strata):
+        members = strata[stratum]
+        subset.extend(rng.sample(members, min(per_stratum, len(members))))
+    return subset
+
+
+def build_suite(suite: str, per_stratum: int = DEFAULT_PER_STRATUM, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """Builds the 'ci' or 'nightly' suite."""
+    if suite not in SUITES:
+        raise ValueError(f"Unknown suite: {suite}. Available: {', '.join(SUITES)}")
+    scenarios = generate_scenarios()
+    return stratified_subset(scenarios, per_stratum=per_stratum, seed=seed) if suite == "ci" else scenarios
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic regression scenarios.")
+    parser.add_argument("--suite", choices=SUITES, default="ci")
+    parser.add_argument("--per-stratum", type=int, default=DEFAULT_PER_STRATUM, help="CI suite: scenarios per niche × detail stratum.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", help="Output JSON file (default: stdout).")
+    args = parser.parse_args(argv)
+
+    scenarios = build_suite(args.suite, per_stratum=args.per_stratum, seed=args.seed)
+    payload = json.dumps(scenarios, ensure_ascii=False, indent=4)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+        print(f"{len(scenarios)} scenarios written to {args.out}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
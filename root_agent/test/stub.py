@@ -0,0 +1,157 @@
+"""
+Stub backend for the scenario runner: the real agent graph with a deterministic offline model.
+"""
+
+import json
+import re
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from root_agent.platforms import PLATFORMS
+from root_agent.services.runner import create_runner, run_pipeline
+from root_agent.test.backends import PipelineBackend, build_parts_offloaded, use_offline_data_dir
+from root_agent.test.checks import DEFAULT_CAPTION_MAX_LENGTH, DEFAULT_HASHTAG_COUNT, RunResult
+from root_agent.test.variants import without_prompt_cache
+
+
+# Hook types named in the input, e.g. "(Shock hook)" or "(Visual stimulus)".
+_HOOK_PATTERN = re.compile(r"\((Question|Shock|Curiosity|Statement|Visual stimulus)\b", re.IGNORECASE)
+
+# Scenario of the running case; scenario options that steer the stub model are read from it.
+_current_case: ContextVar[Dict[str, Any]] = ContextVar("stub_case", default={})
+_REJECTION = "The hook is too generic – open with the strongest visual."
+
+
+class StubLlm(BaseLlm):
+    """Deterministic offline model that answers like the pipeline's agents would."""
+
+    agent_name: str
+    caption_max_length: int = DEFAULT_CAPTION_MAX_LENGTH
+    hashtag_count: int = DEFAULT_HASHTAG_COUNT
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        name = self.agent_name
+        if name == "video_analyst_agent":
+            hook = _HOOK_PATTERN.search(self._topic(llm_request))
+            yield self._text(json.dumps({
+                "schema_extraction": {
+                    "scene_length": "Fast cuts, 1-2 seconds per scene",
+                    "hook_type": hook.group(1) if hook else "Visual stimulus",
+                    "visual_frequency": "High – a new visual element every second",
+                    "unique_visual_elements": self._topic(llm_request)[:80],
+                },
+                "root_questions": [
+                    "Why does the hook keep viewers past the first 3 seconds?",
+                    "Which current trends does this content relate to?",
+                    "How can retention in the middle section be optimized?",
+                ],
+            }))
+        elif name.startswith("drill_down_agent"):
+            yield self._text(json.dumps({
+                "root_question": f"Root Question {name.rsplit('_', 1)[-1]}",
+                "answer": "The opening visual creates curiosity before the viewer can scroll.",
+                "follow_up_questions": [{"question": f"Follow-up {i}?", "answer": f"Answer {i}."} for i in range(1, 5)],
+                "analysis_levels": {
+                    "descriptive": "The hook shows the key visual within the first second.",
+                    "diagnostic": "Visual curiosity interrupts the scroll reflex.",
+                    "predictive": "Expected 3-second retention above 70%.",
+                    "prescriptive": "Open with the strongest visual and cut the intro.",
+                },
+            }))
+        elif name == "insight_extractor_agent":
+            yield self._text(json.dumps({
+                "most_engaging_element": "The opening visual",
+                "hook_strategy": "Lead with the strongest visual in the first second.",
+                "psychological_angle": "Curiosity and relatability",
+                "prescriptive_summary": "Front-load the hook, keep cuts fast, end with a call-to-action.",
+            }))
+        elif name.endswith("creator_agent"):
+            caption = f"Wait for it 👀 {self._topic(llm_request)}"[:self.caption_max_length]
+            hashtags = "\n".join(f"{i}. #stubtag{i} – Strategy: niche reach {i}" for i in range(1, self.hashtag_count + 1))
+            yield self._text(
+                "## Trend Research\n- Trend: fast visual hooks\n"
+                f"## Caption\n{caption}\n"
+                f"## Strategic Hashtags\n{hashtags}\n"
+                "## Strategic Justification\nThe caption mirrors the visual hook."
+            )
+        elif name.endswith("evaluator_agent"):
+            last = llm_request.contents[-1] if llm_request.contents else None
+            if _current_case.get().get("evaluator_rejects_first_draft") and not self._mentions(llm_request, _REJECTION):
+                # Scenario option: the first draft of a loop is rejected, the next one approved.
+                yield self._text(f"### Rating: 5/10\n### STATUS: NEEDS_REVISION\n{_REJECTION}")
+            elif last and last.parts and last.parts[0].function_response:
+                yield self._text("### Rating: 8/10\n### STATUS: APPROVED – content finalized.")
+            else:
+                cached = " (knowledge base)" if self._mentions(llm_request, "<hashtag_verifications>") else ""
+                yield LlmResponse(content=types.Content(role="model", parts=[
+                    types.Part(text=f'- Hashtag checked: "#stubtag1" → Result: TRENDING{cached}\n'
+                                    "### Rating: 8/10\n### STATUS: APPROVED\n**Factual Accuracy:** 8/10 – score based on the video analysis."),
+                    types.Part(function_call=types.FunctionCall(name="exit_loop", args={})),
+                ]))
+        else:
+            yield self._text("{}")
+
+    @staticmethod
+    def _text(text: str) -> LlmResponse:
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+    @staticmethod
+    def _mentions(llm_request: LlmRequest, marker: str) -> bool:
+        return any(marker in (part.text or "") for content in llm_request.contents for part in content.parts or [])
+
+    @staticmethod
+    def _topic(llm_request: LlmRequest) -> str:
+        """The scenario's user input (skips the injected <input> blocks and 'For context' history)."""
+        for content in llm_request.contents:
+            for part in content.parts or []:
+                text = (part.text or "").strip()
+                if content.role == "user" and text and not text.startswith(("<input>", "For context:")):
+                    return text.split(":", 1)[-1].strip()
+        return ""
+
+
+class StubBackend(PipelineBackend):
+    """
+    Runs a clone of the agent graph (or of `agent`) in which every LlmAgent uses StubLlm.
+
+    Scenario option: "evaluator_rejects_first_draft": true makes every loop revise once.
+    """
+    name = "stub"
+
+    def __init__(self, agent: Optional[BaseAgent] = None):
+        use_offline_data_dir()
+        super().__init__(agent)
+
+    def create_runner(self, agent: Optional[BaseAgent]):
+        if agent is None:
+            from root_agent.agent import root_agent
+
+            agent = root_agent
+        agent = agent.clone()
+        self._stub_models(agent)
+        # No context caches for a model that never reaches the API.
+        without_prompt_cache(agent)
+        return create_runner(agent=agent)
+
+    @staticmethod
+    def _stub_models(agent: BaseAgent) -> None:
+        if isinstance(agent, LlmAgent):
+            platform = next((p for key, p in PLATFORMS.items() if agent.name.startswith(f"{key}_")), None)
+            agent.model = StubLlm(
+                model=agent.canonical_model.model,
+                agent_name=agent.name,
+                caption_max_length=platform.caption_max_length if platform else DEFAULT_CAPTION_MAX_LENGTH,
+                hashtag_count=platform.hashtag_count if platform else DEFAULT_HASHTAG_COUNT,
+            )
+        for sub_agent in agent.sub_agents:
+            StubBackend._stub_models(sub_agent)
+
+    async def run(self, case: Dict[str, Any]) -> RunResult:
+        token = _current_case.set(case)
+        try:
+            return RunResult(**await run_pipeline(self.runner_for(case), await build_parts_offloaded(case), user_id="eval_bot"))
+        finally:
+            _current_case.reset(token)
@@ -0,0 +1,162 @@
+"""
+Registered pipeline variants for the A/B experiment harness (experiment.py).
+
+A variant is a named transform that edits a clone of the agent graph in place – a changed prompt,
+a different loop limit, ... Register new variants with @register_variant("name", "description");
+the helpers below cover the usual edits:
+
+    @register_variant("creator_short_hook", "Creator: hook within the first 5 words")
+    def creator_short_hook(root):
+        replace_in_prompt(root, "creator_agent", "Combine Input Data + Google Trends to write the Hook and Caption.",
+                          "Combine Input Data + Google Trends; the hook must land within the first 5 words.")
+
+Agents are matched by name suffix, so an edit of "creator_agent" also reaches the platform Creators
+(tiktok_creator_agent, ...) and the speculative Creator. Edits that match nothing raise, so a variant
+does not silently turn into a copy of the baseline after a prompt was reworded.
+
+ADK is only imported when a variant is built (live and stub backends), not for replay runs.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+
+BASELINE = "baseline"
+
+Transform = Callable[[Any], None]
+
+
+class Variant(BaseModel):
+    """A registered variant."""
+    name: str
+    description: str = ""
+    transform: Optional[Transform] = None
+
+
+VARIANTS: Dict[str, Variant] = {}
+
+
+def register_variant(name: str, description: str = ""):
+    """Decorator that registers a transform of the agent graph as variant `name`."""
+    def decorator(transform: Transform) -> Transform:
+        VARIANTS[name] = Variant(name=name, description=description, transform=transform)
+        return transform
+    return decorator
+
+
+def walk(agent) -> Iterator[Any]:
+    """The agent and all its descendants."""
+    yield agent
+    for sub_agent in agent.sub_agents:
+        yield from walk(sub_agent)
+
+
+def agents_named(root, suffix: str) -> List[Any]:
+    """All agents whose name ends with `suffix` (raises if there is none)."""
+    agents = [agent for agent in walk(root) if agent.name.endswith(suffix)]
+    if not agents:
+        raise ValueError(f"No agent named '*{suffix}' in the pipeline.")
+    return agents
+
+
+def replace_in_prompt(root, agent_suffix: str, old: str, new: str) -> None:
+    """Replaces `old` with `new` in the static and dynamic instruction of the matching agents."""
+    from root_agent.callbacks.context_cache import as_static_instruction
+
+    replaced = False
+    for agent in agents_named(root, agent_suffix):
+        static = agent.static_instruction
+        if static is None or isinstance(static, str):
+            static_text = static or ""
+        else:
+            static_text = "".join(part.text or "" for part in static.parts or [])
+        if old in static_text:
+            agent.static_instruction = as_static_instruction(static_text.replace(old, new))
+            replaced = True
+        if isinstance(agent.instruction, str) and old in agent.instruction:
+            agent.instruction = agent.instruction.replace(old, new)
+            replaced = True
+    if not replaced:
+        raise ValueError(f"'{old[:60]}' not found in the prompt of '*{agent_suffix}'.")
+
+
+def set_max_iterations(root, max_iterations: int) -> None:
+    """Sets the iteration limit of every Creator + Evaluator loop."""
+    for loop in agents_named(root, "creation_evaluation_loop"):
+        loop.max_iterations = max_iterations
+
+
+def use_speculative_drafts(root) -> None:
+    """Turns every plain Creator + Evaluator loop into a SpeculativeCreationLoop (as SPECULATIVE_DRAFTS=true does)."""
+    from google.adk.agents import LoopAgent
+    from root_agent.subagents.creation_evaluation_loop import speculative_loop
+
+    for parent in list(walk(root)):
+        for index, agent in enumerate(parent.sub_agents):
+            if isinstance(agent, LoopAgent) and agent.name.endswith("creation_evaluation_loop"):
+                agent = speculative_loop(agent)
+                agent.parent_agent = parent
+                parent.sub_agents[index] = agent
+
+
+def without_prompt_cache(root) -> None:
+    """Removes use_prompt_cache from every agent (for models that never reach the API, or A/B runs)."""
+    from root_agent.callbacks.context_cache import use_prompt_cache
+
+    for agent in walk(root):
+        callbacks = getattr(agent, "before_model_callback", None)
+        if isinstance(callbacks, list):
+            agent.before_model_callback = [c for c in callbacks if c is not use_prompt_cache]
+        elif callbacks is use_prompt_cache:
+            agent.before_model_callback = None
+
+
+def build_variant(name: str, prompt_cache: bool = False):
+    """
+    A clone of the pipeline with variant `name` applied.
+
+    Args:
+        name: Registered variant.
+        prompt_cache: Keep the Gemini context cache. Caches are keyed by agent name, so variants with
+            different static prompts evict each other's caches – by default all variants run without.
+    """
+    if name not in VARIANTS:
+        raise ValueError(f"Unknown variant: {name}. Available: {', '.join(VARIANTS)}")
+    from root_agent.agent import root_agent
+
+    agent = root_agent.clone()
+    if VARIANTS[name].transform is not None:
+        VARIANTS[name].transform(agent)
+    if not prompt_cache:
+        without_prompt_cache(agent)
+    return agent
+
+
+VARIANTS[BASELINE] = Variant(name=BASELINE, description="The pipeline as configured.")
+
+
+@register_variant("max_iterations_2", "Creator + Evaluator loop stops after 2 iterations")
+def max_iterations_2(root) -> None:
+    set_max_iterations(root, 2)
+
+
+@register_variant("max_iterations_5", "Creator + Evaluator loop stops after 5 iterations")
+def max_iterations_5(root) -> None:
+    set_max_iterations(root, 5)
+
+
+@register_variant("speculative_drafts", "Speculative Creator writes the next draft while the Evaluator runs")
+def speculative_drafts(root) -> None:
+    use_speculative_drafts(root)
+
+
+@register_variant("strict_evaluator", "Evaluator approves from a score of 8 instead of 7")
+def strict_evaluator(root) -> None:
+    replace_in_prompt(root, "evaluator_agent", "If score >= 7:", "If score >= 8:")
+    replace_in_prompt(root, "evaluator_agent", "If score < 7:", "If score < 8:")
+
+
+@register_variant("creator_no_slang", "Creator writes without slang")
+def creator_no_slang(root) -> None:
+    replace_in_prompt(root, "creator_agent", "Use slang naturally.", "Avoid slang – keep the language clear for a broad audience.")
@@ -1,8 +1,14 @@
 """
 Tools package for the InsightBench Multi-Agent System.
+Exports are resolved lazily – a submodule is only imported when one of its names is used.
 """
 
-from .exit_loop import exit_loop
-from .engagement import calculate_engagement
+from root_agent.lazy import install_lazy_exports
+
 
 __all__ = ["exit_loop", "calculate_engagement"]
+
+install_lazy_exports(__name__, {
+    "exit_loop": ".exit_loop",
+    "calculate_engagement": ".engagement",
+})
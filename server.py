@@ -0,0 +1,47 @@
+"""
+ADK API server extended with the job queue.
+
+Serves the regular ADK endpoints (/run_sse, sessions, web UI) plus /jobs, which queues
+pipeline runs and executes them in a bounded worker pool instead of inline, /runs,
+which serves the event logs of past runs for replay, /stream, a compact (optionally
+gzipped) event stream with only the fields the Streamlit client renders, and /engagement,
+which feeds real post outcomes into the local engagement model and ranks captions with it.
+
+    uv run uvicorn server:app --port 8000
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+from google.adk.cli.fast_api import get_fast_api_app
+
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "root_agent", ".env"))
+
+from root_agent.services.engagement_api import create_engagement_router
+from root_agent.services.event_log_api import create_event_log_router
+from root_agent.services.job_api import create_job_router
+from root_agent.services.job_queue import JobStore, WorkerPool, pipeline_job_handler
+from root_agent.services.run_export import close_run_exporter
+from root_agent.services.stream_api import create_stream_router
+
+
+AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+job_pool = WorkerPool(JobStore(), pipeline_job_handler())
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await job_pool.start()
+    yield
+    await job_pool.stop()
+    await asyncio.to_thread(close_run_exporter)
+
+
+app = get_fast_api_app(agents_dir=AGENTS_DIR, web=True, lifespan=lifespan)
+app.include_router(create_job_router(job_pool))
+app.include_router(create_event_log_router())
+app.include_router(create_stream_router())
+app.include_router(create_engagement_router())